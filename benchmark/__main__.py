@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from itertools import chain
+from pathlib import Path
+
+import click
+
+
+@click.group()
+def main() -> None: ...
+
+
+@main.command()
+@click.option("-n", "--number", type=int, default=10000)
+@click.option("-r", "--repeat", type=int, default=5)
+def call(number: int, repeat: int) -> None:
+    from .call import measure_call
+
+    click.echo(f"{'function':<28}{'evaluate':>12}{'call':>12}{'overhead':>12}")
+    for result in measure_call(number=number, repeat=repeat):
+        click.echo(
+            f"{result.name:<28}"
+            f"{result.evaluate * 1e6:>10.2f}us"
+            f"{result.call * 1e6:>10.2f}us"
+            f"{result.overhead * 1e6:>10.2f}us"
+        )
+
+
+@main.command()
+@click.option("-r", "--repeat", type=int, default=5)
+def importtime(repeat: int) -> None:
+    from .importtime import measure_importtime
+
+    click.echo(
+        f"{'version':<12}{'omc4py':>12}{'package':>12}{'scripting':>12}"
+    )
+    for result in measure_importtime(repeat=repeat):
+        click.echo(
+            f"{result.name:<12}"
+            f"{result.omc4py * 1e3:>10.2f}ms"
+            f"{result.package * 1e3:>10.2f}ms"
+            f"{result.scripting * 1e3:>10.2f}ms"
+        )
+
+
+@main.command()
+@click.argument("capture", type=click.Path(exists=True, dir_okay=False))
+@click.option("-r", "--repeat", type=int, default=5)
+def transport(capture: str, repeat: int) -> None:
+    from .transport import measure_transport
+
+    click.echo(f"{'calling':<16}{'calls':>8}{'total':>12}{'per call':>12}")
+    for result in measure_transport(capture, repeat=repeat):
+        click.echo(
+            f"{result.name:<16}{result.calls:>8}"
+            f"{result.seconds * 1e3:>10.2f}ms"
+            f"{result.per_call * 1e6:>10.2f}us"
+        )
+
+
+@main.command()
+@click.option("--max-size", type=int, default=1_000_000)
+@click.option("-r", "--repeat", type=int, default=3)
+@click.option("--importtime/--no-importtime", default=True)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Baseline to compare with, written by --save",
+)
+@click.option("--threshold", type=float, default=0.2)
+@click.option(
+    "--save",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write timings as a baseline",
+)
+def hotpath(  # noqa: PLR0913
+    max_size: int,
+    repeat: int,
+    importtime: bool,  # noqa: FBT001
+    baseline: Path | None,
+    threshold: float,
+    save: Path | None,
+) -> None:
+    """Measure parse/unparse/names, failing on regressions of --baseline"""
+    from .hotpath import (
+        Timing,
+        compare,
+        load_baseline,
+        measure_hotpath,
+        measure_importtime_cases,
+        save_baseline,
+    )
+
+    timings = chain(
+        measure_hotpath(max_size=max_size, repeat=repeat),
+        measure_importtime_cases(repeat=repeat) if importtime else (),
+    )
+    measured = []
+    regressions = []
+    click.echo(f"{'case':<40}{'time':>12}{'baseline':>12}{'ratio':>8}")
+    for result in compare(
+        timings, {} if baseline is None else load_baseline(baseline)
+    ):
+        measured.append(Timing(result.name, result.seconds))
+        regressed = result.regressed(threshold)
+        if regressed:
+            regressions.append(result.name)
+        click.echo(
+            f"{result.name:<40}{result.seconds * 1e6:>10.2f}us"
+            + (
+                ""
+                if result.baseline is None
+                else f"{result.baseline * 1e6:>10.2f}us{result.ratio:>8.2f}"
+            )
+            + (" REGRESSED" if regressed else "")
+        )
+
+    if save is not None:
+        save_baseline(save, measured)
+    if regressions:
+        click.echo(
+            f"{len(regressions)} cases slower than baseline"
+            f" by more than {threshold:.0%}: {', '.join(regressions)}",
+            err=True,
+        )
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
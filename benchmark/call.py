@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import timeit
+from collections.abc import Callable, Generator
+from functools import partial
+from typing import Any, NamedTuple
+
+from omc4py.protocol import Calling
+
+from .stub import StubInteractive
+
+
+class CallCase(NamedTuple):
+    name: str
+    reply: str
+    call: Callable[[Any], Any]
+
+
+class CallResult(NamedTuple):
+    name: str
+    evaluate: float
+    call: float
+
+    @property
+    def overhead(self) -> float:
+        return self.call - self.evaluate
+
+
+def iter_call_cases() -> Generator[CallCase, None, None]:
+    yield CallCase(
+        "isPackage",
+        "true",
+        lambda session: session.isPackage("Modelica"),
+    )
+    yield CallCase(
+        "getClassRestriction",
+        '"package"',
+        lambda session: session.getClassRestriction("Modelica.Blocks"),
+    )
+    yield CallCase(
+        "getClassNames",
+        "{Blocks,ComplexBlocks,Clocked,StateGraph,Electrical}",
+        lambda session: session.getClassNames(
+            "Modelica", recursive=False, sort=True
+        ),
+    )
+    yield CallCase(
+        "readSimulationResultSize",
+        "501",
+        lambda session: session.readSimulationResultSize("model_res.mat"),
+    )
+
+
+def measure_call(
+    number: int, repeat: int
+) -> Generator[CallResult, None, None]:
+    """
+    Measure per-call python overhead of `external` functions
+
+    `evaluate` is the cost of the stub alone,
+    `call` is the cost of the whole session method on top of it.
+    """
+    from omc4py.v_1_24 import Session  # NOTE: update to latest
+
+    for case in iter_call_cases():
+        interactive = StubInteractive(
+            partial(_constant, case.reply),
+            Calling.synchronous,
+        )
+        session = Session(interactive)
+        case.call(session)  # warm up
+
+        evaluate = min(
+            timeit.repeat(
+                partial(interactive.evaluate, ""),
+                number=number,
+                repeat=repeat,
+            )
+        )
+        call = min(
+            timeit.repeat(
+                partial(case.call, session),
+                number=number,
+                repeat=repeat,
+            )
+        )
+        yield CallResult(case.name, evaluate / number, call / number)
+
+
+def _constant(reply: str, expression: str) -> str:  # noqa: ARG001
+    return reply
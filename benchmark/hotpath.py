@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import json
+import platform
+import sys
+import timeit
+from collections.abc import Callable, Generator, Iterable
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple
+
+from omc4py import TypeName, VariableName
+from omc4py.modelica import enumeration, record
+from omc4py.parser import _ParametrizedSyntax, parse, unparse
+
+SIZES = (1, 1_000, 1_000_000)
+
+
+class OneTwo(enumeration):
+    __omc_class__ = TypeName("OneTwo")
+
+    One = 1
+    Two = 2
+
+
+@dataclass
+class ScalarRecord(record):
+    __omc_class__ = TypeName("ScalarRecord")
+
+    real: float
+    integer: int
+    boolean: bool
+    string: str
+    variable: VariableName
+    type_: TypeName
+    enumeration_: OneTwo
+
+
+class Case(NamedTuple):
+    name: str
+    call: Callable[[], Any]
+
+
+class Timing(NamedTuple):
+    name: str
+    seconds: float  # per call
+
+
+class Comparison(NamedTuple):
+    name: str
+    seconds: float
+    baseline: float | None
+
+    @property
+    def ratio(self) -> float | None:
+        if self.baseline is None:
+            return None
+        return self.seconds / self.baseline
+
+    def regressed(self, threshold: float) -> bool:
+        return self.ratio is not None and 1 + threshold < self.ratio
+
+
+# omc literal and python value of each scalar type
+SCALARS: Dict[str, tuple[Any, str, Any]] = {
+    "Real": (float, "1.25", 1.25),
+    "Integer": (int, "42", 42),
+    "Boolean": (bool, "true", True),
+    "String": (str, '"Modelica.Blocks"', "Modelica.Blocks"),
+    # e.g. a line of `list()`, with quotes and a backslash to escape
+    "String/escaped": (
+        str,
+        r'"model M \"M\" Real x(unit=\"m\") \"\\x\"; end M;\n"',
+        'model M "M" Real x(unit="m") "\\x"; end M;\n',
+    ),
+    "TypeName": (
+        TypeName,
+        "Modelica.Blocks.Continuous.PID",
+        TypeName("Modelica.Blocks.Continuous.PID"),
+    ),
+    "VariableName": (VariableName, "x", VariableName("x")),
+    "enumeration": (OneTwo, "OneTwo.Two", OneTwo.Two),
+    "record": (
+        ScalarRecord,
+        "record ScalarRecord real=1.0, integer=1, boolean=true,"
+        ' string="one", variable=one, type_=One,'
+        " enumeration_=OneTwo.One end ScalarRecord;",
+        ScalarRecord(
+            1.0,
+            1,
+            True,
+            "one",
+            VariableName("one"),
+            TypeName("One"),
+            OneTwo.One,
+        ),
+    ),
+}
+
+
+def iter_hotpath_cases(max_size: int) -> Generator[Case, None, None]:
+    sizes = [size for size in SIZES if size <= max_size]
+
+    for name, (typ, literal, _) in SCALARS.items():
+        sequence = List[typ]  # type: ignore[valid-type]
+        yield Case(f"parse/{name}", partial(parse, typ, literal))
+        for size in sizes:
+            text = "{" + ",".join([literal] * size) + "}"
+            yield Case(
+                f"parse/{name}[:]/{size}", partial(parse, sequence, text)
+            )
+    for size in sizes:
+        side = max(int(size**0.5), 1)
+        row = "{" + ",".join(["1.25"] * side) + "}"
+        text = "{" + ",".join([row] * side) + "}"
+        yield Case(
+            f"parse/Real[:,:]/{side * side}",
+            partial(parse, List[List[float]], text),
+        )
+
+    # a single string of `size` lines, e.g. `list()` of a large package
+    _, line, value = SCALARS["String/escaped"]
+    for size in sizes:
+        text = '"' + line[1:-1] * size + '"'
+        yield Case(f"parse/String/long/{size}", partial(parse, str, text))
+        yield Case(
+            f"unparse/String/long/{size}", partial(unparse, str, value * size)
+        )
+
+    for name, (typ, _, value) in SCALARS.items():
+        list_type = List[typ]  # type: ignore[valid-type]
+        yield Case(f"unparse/{name}", partial(unparse, typ, value))
+        for size in sizes:
+            yield Case(
+                f"unparse/{name}[:]/{size}",
+                partial(unparse, list_type, [value] * size),
+            )
+    for size in sizes:
+        side = max(int(size**0.5), 1)
+        matrix = [[1.25] * side for _ in range(side)]
+        yield Case(
+            f"unparse/Real[:,:]/{side * side}",
+            partial(unparse, List[List[float]], matrix),
+        )
+
+    yield Case("TypeName", partial(TypeName, "Modelica.Blocks.Continuous.PID"))
+    yield Case("TypeName/quoted", partial(TypeName, "Modelica.'Blocks 1'.PID"))
+    yield Case(
+        "TypeName/parts", partial(TypeName, "Modelica", "Blocks", "PID")
+    )
+    yield Case("VariableName", partial(VariableName, "x"))
+    yield Case("VariableName/quoted", partial(VariableName, "'x y'"))
+
+    for name, typ, ndim in [
+        ("Real[:]", float, 1),
+        ("TypeName[:]", TypeName, 1),
+        ("record", ScalarRecord, 0),
+    ]:
+        yield Case(f"get_parser/{name}", partial(_cold_get_parser, typ, ndim))
+
+
+def measure_hotpath(
+    max_size: int, repeat: int
+) -> Generator[Timing, None, None]:
+    """
+    Measure decoding results, encoding arguments and names of calls
+
+    Cold start of the PEG parser as well.
+    Each case runs as many times as it takes 0.2 seconds.
+    """
+    for case in iter_hotpath_cases(max_size):
+        timer = timeit.Timer(case.call)
+        number, _ = timer.autorange()
+        seconds = min(timer.repeat(repeat=repeat, number=number))
+        yield Timing(case.name, seconds / number)
+
+
+def measure_importtime_cases(repeat: int) -> Generator[Timing, None, None]:
+    from .importtime import measure_importtime
+
+    for result in measure_importtime(repeat=repeat):
+        yield Timing(f"import/{result.name}", result.package)
+        yield Timing(f"import/{result.name}/scripting", result.scripting)
+
+
+def compare(
+    timings: Iterable[Timing], baseline: Dict[str, float]
+) -> Generator[Comparison, None, None]:
+    for timing in timings:
+        yield Comparison(
+            timing.name, timing.seconds, baseline.get(timing.name)
+        )
+
+
+def load_baseline(path: Path) -> Dict[str, float]:
+    return dict(json.loads(path.read_text())["seconds"])
+
+
+def save_baseline(path: Path, timings: Iterable[Timing]) -> None:
+    path.write_text(
+        json.dumps(
+            {
+                "python": sys.version,
+                "platform": platform.platform(),
+                "seconds": {timing.name: timing.seconds for timing in timings},
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+
+
+def _cold_get_parser(typ: Any, ndim: int) -> None:
+    vars(_ParametrizedSyntax)["get_parser"].__func__.cache_clear()
+    with _ParametrizedSyntax:
+        _ParametrizedSyntax.get_parser(typ, ndim)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+from collections.abc import Generator
+from pathlib import Path
+from typing import NamedTuple
+
+import omc4py
+
+VERSIONS = tuple(
+    sorted(
+        path.name
+        for path in Path(omc4py.__file__).parent.glob("v_*_*")
+        if path.is_dir()
+    )
+)
+
+
+class ImportTimeResult(NamedTuple):
+    name: str
+    omc4py: float
+    package: float
+    scripting: float
+
+
+def measure_importtime(
+    repeat: int,
+) -> Generator[ImportTimeResult, None, None]:
+    """
+    Measure cumulative import time by `python -X importtime`
+
+    `package` is `import omc4py.v_1_XX` including `omc4py`,
+    `scripting` is `OpenModelica.Scripting` loaded on the first call.
+    """
+    for version in VERSIONS:
+        package = f"omc4py.{version}"
+        scripting = f"{package}.OpenModelica.Scripting"
+        times = [
+            _importtime(f"import {package}; import {scripting}")
+            for _ in range(repeat)
+        ]
+        yield ImportTimeResult(
+            version,
+            min(time.get("omc4py", 0.0) for time in times),
+            min(time.get(package, 0.0) for time in times),
+            min(time.get(scripting, 0.0) for time in times),
+        )
+
+
+def _importtime(statement: str) -> dict[str, float]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        encoding="utf-8",
+    )
+    pattern = re.compile(r"import time:\s*\d+ \|\s*(\d+) \|(\s*)(\S+)")
+    result: dict[str, float] = {}
+    for matched in map(pattern.match, completed.stderr.splitlines()):
+        if matched is not None:
+            result[matched.group(3)] = int(matched.group(1)) * 1e-6
+    return result
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from contextlib import closing
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Generic, overload
+
+from omc4py.protocol import Asynchronous, Calling, Synchronous, T_Calling
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+
+@dataclass(frozen=True)
+class StubInteractive(Generic[T_Calling]):
+    """
+    `SupportsInteractive` answering every expression without omc
+
+    `reply` maps the evaluated expression to the literal omc would return.
+    """
+
+    reply: Callable[[str], str]
+    calling: T_Calling
+
+    def __enter__(self) -> Self:
+        return closing(self).__enter__()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return closing(self).__exit__(*exc_info)
+
+    def close(self) -> None:
+        pass
+
+    @property
+    def synchronous(self) -> StubInteractive[Synchronous]:
+        if TYPE_CHECKING:
+            synchronous: StubInteractive[Synchronous]
+        else:
+            synchronous = self
+        return replace(synchronous, calling=Calling.synchronous)
+
+    @property
+    def asynchronous(self) -> StubInteractive[Asynchronous]:
+        if TYPE_CHECKING:
+            asynchronous: StubInteractive[Asynchronous]
+        else:
+            asynchronous = self
+        return replace(asynchronous, calling=Calling.asynchronous)
+
+    @overload
+    def evaluate(
+        self: StubInteractive[Synchronous],
+        expression: str,
+    ) -> str: ...
+
+    @overload
+    async def evaluate(
+        self: StubInteractive[Asynchronous],
+        expression: str,
+    ) -> str: ...
+
+    def evaluate(self, expression: str) -> str | Coroutine[None, None, str]:
+        if self.calling is Calling.synchronous:
+            return self.reply(expression)
+        else:
+            return self.__asynchronous_evaluate(expression)
+
+    async def __asynchronous_evaluate(self, expression: str) -> str:
+        return self.reply(expression)
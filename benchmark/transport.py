@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+from collections.abc import Callable, Generator
+from typing import NamedTuple
+
+from omc4py.interactive import Interactive
+from omc4py.protocol import Calling
+from omc4py.replay import executable
+from omc4py.trace import REQUEST, read_capture
+
+
+class TransportResult(NamedTuple):
+    name: str
+    calls: int
+    seconds: float
+
+    @property
+    def per_call(self) -> float:
+        return self.seconds / self.calls
+
+
+def measure_transport(
+    capture: str, repeat: int
+) -> Generator[TransportResult, None, None]:
+    """
+    Measure round trips of captured expressions to a stand-in of omc
+
+    `synchronous` sends them one after another,
+    `asynchronous` sends them all at once over the pipeline.
+    """
+    expressions = [
+        message.payload
+        for message in read_capture(capture)
+        if message.direction == REQUEST and message.payload != "quit()"
+    ]
+    with tempfile.TemporaryDirectory() as directory, Interactive.open(
+        executable(capture, directory), Calling.synchronous
+    ) as interactive:
+        synchronous = interactive.synchronous
+        asynchronous = interactive.asynchronous
+
+        def evaluate() -> None:
+            for expression in expressions:
+                synchronous.evaluate(expression)
+
+        async def aevaluate() -> float:
+            # one event loop, the pipeline is bound to it
+            seconds = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await asyncio.gather(
+                    *(asynchronous.evaluate(expr) for expr in expressions)
+                )
+                seconds.append(time.perf_counter() - start)
+            return min(seconds)
+
+        yield TransportResult(
+            "synchronous",
+            len(expressions),
+            min(_seconds(evaluate) for _ in range(repeat)),
+        )
+        yield TransportResult(
+            "asynchronous", len(expressions), asyncio.run(aevaluate())
+        )
+
+
+def _seconds(f: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    f()
+    return time.perf_counter() - start
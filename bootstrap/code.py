@@ -190,24 +190,59 @@ class PackageFactory(HasTypeName):
             imports.add(
                 ImportFrom(module="omc4py.session", name="BasicSession")
             )
-        for child in self.children.values():
-            if isinstance(child, PackageFactory) and child.children:
-                imports.add(
-                    ImportFrom(
-                        name=child.name,
-                        asname=_to_camel_case(child.name),
-                        level=1,
-                    )
-                )
+        if self._lazy_imports:
+            imports.add(ImportFrom(module="typing", name="TYPE_CHECKING"))
+            imports.add(
+                ImportFrom(module="omc4py.modelica", name="lazy_import")
+            )
 
         yield from imports
 
+    @property
+    def _lazy_imports(self) -> list[ImportFrom]:
+        return [
+            ImportFrom(
+                name=child.name,
+                asname=_to_camel_case(child.name),
+                level=1,
+            )
+            for child in self.children.values()
+            if isinstance(child, PackageFactory) and child.children
+        ]
+
+    def _iter_lazy_import_stmts(self) -> Generator[ast.stmt, None, None]:
+        """Import sub-packages on first use, except for type checkers"""
+        imports = self._lazy_imports
+        if not imports:
+            return
+        yield ast.If(
+            test=ast.Name(id="TYPE_CHECKING", ctx=ast.Load()),
+            body=[i.stmt for i in imports],
+            orelse=[
+                ast.Assign(
+                    targets=[ast.Name(id=i.asname or i.name, ctx=ast.Store())],
+                    value=ast.Call(
+                        func=ast.Name(id="lazy_import", ctx=ast.Load()),
+                        args=[
+                            ast.Constant(value=f".{i.name}"),
+                            ast.Name(id="__name__", ctx=ast.Load()),
+                        ],
+                        keywords=[],
+                    ),
+                    lineno=0,  # unparsed, never compiled
+                )
+                for i in imports
+            ],
+        )
+
     def iter_imports(self) -> Generator[ImportFrom, None, None]:
         yield ImportFrom(module="omc4py.modelica", name="package")
         yield ImportFrom(module="omc4py.openmodelica", name="TypeName")
         yield ImportFrom(module="omc4py.protocol", name="T_Calling")
 
     def _iter_module_stmts(self) -> Generator[ast.stmt, None, None]:
+        yield from self._iter_lazy_import_stmts()
+
         for child in self.children.values():
             yield from child.iter_stmts()
 
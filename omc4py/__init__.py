@@ -173,6 +173,9 @@ def open_session(
     *,
     version: _1_24 | _1_25 | _1_26,
     asyncio: Literal[False] = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_24.Session: ...
 
 
@@ -182,6 +185,9 @@ def open_session(
     *,
     version: _1_24 | _1_25 | _1_26,
     asyncio: Literal[True],
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_24.AsyncSession: ...
 
 
@@ -200,6 +206,9 @@ def open_session(
     *,
     version: _1_23,
     asyncio: Literal[False] = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_23.Session: ...
 
 
@@ -209,6 +218,9 @@ def open_session(
     *,
     version: _1_23,
     asyncio: Literal[True],
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_23.AsyncSession: ...
 
 
@@ -227,6 +239,9 @@ def open_session(
     *,
     version: _1_22,
     asyncio: Literal[False] = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_22.Session: ...
 
 
@@ -236,6 +251,9 @@ def open_session(
     *,
     version: _1_22,
     asyncio: Literal[True],
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_22.AsyncSession: ...
 
 
@@ -254,6 +272,9 @@ def open_session(
     *,
     version: _1_21,
     asyncio: Literal[False] = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_21.Session: ...
 
 
@@ -263,6 +284,9 @@ def open_session(
     *,
     version: _1_21,
     asyncio: Literal[True],
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_21.AsyncSession: ...
 
 
@@ -281,6 +305,9 @@ def open_session(
     *,
     version: _1_20,
     asyncio: Literal[False] = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_20.Session: ...
 
 
@@ -290,6 +317,9 @@ def open_session(
     *,
     version: _1_20,
     asyncio: Literal[True],
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_20.AsyncSession: ...
 
 
@@ -308,6 +338,9 @@ def open_session(
     *,
     version: _1_19,
     asyncio: Literal[False] = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_19.Session: ...
 
 
@@ -317,6 +350,9 @@ def open_session(
     *,
     version: _1_19,
     asyncio: Literal[True],
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_19.AsyncSession: ...
 
 
@@ -335,6 +371,9 @@ def open_session(
     *,
     version: _1_18,
     asyncio: Literal[False] = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_18.Session: ...
 
 
@@ -344,6 +383,9 @@ def open_session(
     *,
     version: _1_18,
     asyncio: Literal[True],
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_18.AsyncSession: ...
 
 
@@ -362,6 +404,9 @@ def open_session(
     *,
     version: _1_17,
     asyncio: Literal[False] = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_17.Session: ...
 
 
@@ -371,6 +416,9 @@ def open_session(
     *,
     version: _1_17,
     asyncio: Literal[True],
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_17.AsyncSession: ...
 
 
@@ -389,6 +437,9 @@ def open_session(
     *,
     version: _1_16,
     asyncio: Literal[False] = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_16.Session: ...
 
 
@@ -398,6 +449,9 @@ def open_session(
     *,
     version: _1_16,
     asyncio: Literal[True],
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_16.AsyncSession: ...
 
 
@@ -416,6 +470,9 @@ def open_session(
     *,
     version: _1_15,
     asyncio: Literal[False] = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_15.Session: ...
 
 
@@ -425,6 +482,9 @@ def open_session(
     *,
     version: _1_15,
     asyncio: Literal[True],
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_15.AsyncSession: ...
 
 
@@ -443,6 +503,9 @@ def open_session(
     *,
     version: _1_14,
     asyncio: Literal[False] = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_14.Session: ...
 
 
@@ -452,6 +515,9 @@ def open_session(
     *,
     version: _1_14,
     asyncio: Literal[True],
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_14.AsyncSession: ...
 
 
@@ -470,6 +536,9 @@ def open_session(
     *,
     version: _1_13,
     asyncio: Literal[False] = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_13.Session: ...
 
 
@@ -479,6 +548,9 @@ def open_session(
     *,
     version: _1_13,
     asyncio: Literal[True],
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> v_1_13.AsyncSession: ...
 
 
@@ -497,6 +569,9 @@ def open_session(
     *,
     version: None = None,
     asyncio: Literal[False] = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> Session: ...
 
 
@@ -506,6 +581,9 @@ def open_session(
     *,
     version: None = None,
     asyncio: Literal[True],
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> AsyncSession: ...
 
 
@@ -517,12 +595,15 @@ def open_session(
 ) -> GenericSession[T_Calling]: ...
 
 
-def open_session(
+def open_session(  # noqa: PLR0913
     omc: str | PathLike[str] | SupportsInteractive[T_Calling] | None = None,
     *,
     # >  Argument for type-hint
     version: Tuple[int, int] | None = None,  # noqa: ARG001
     asyncio: bool = False,
+    timeout: float | None = None,
+    supervised: bool = False,
+    capture: str | PathLike[str] | None = None,
 ) -> Any:
     interactive: (
         SupportsInteractive[Synchronous] | SupportsInteractive[Asynchronous]
@@ -530,9 +611,21 @@ def open_session(
     if isinstance(omc, SupportsInteractive):
         interactive = omc
     elif not asyncio:
-        interactive = Interactive.open(omc, Calling.synchronous)
+        interactive = Interactive.open(
+            omc,
+            Calling.synchronous,
+            timeout=timeout,
+            supervised=supervised,
+            capture=capture,
+        )
     else:
-        interactive = Interactive.open(omc, Calling.asynchronous)
+        interactive = Interactive.open(
+            omc,
+            Calling.asynchronous,
+            timeout=timeout,
+            supervised=supervised,
+            capture=capture,
+        )
 
     try:
         session_type, async_session_type = _select_session_type(
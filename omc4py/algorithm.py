@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Coroutine
+from concurrent.futures import Future
 from typing import TypeVar
 
 T_a = TypeVar("T_a")
@@ -12,9 +13,28 @@ def fmap(
 ) -> T_b | Coroutine[None, None, T_b]:
     if isinstance(a, Coroutine):
         return _fmap(f, a)
+    elif isinstance(a, Future):
+        # Calls of `Batch`, typed as the calls they collect
+        return _fmap_future(f, a)  # type: ignore
     else:
         return f(a)
 
 
 async def _fmap(f: Callable[[T_a], T_b], a: Coroutine[None, None, T_a]) -> T_b:
     return f(await a)
+
+
+def _fmap_future(f: Callable[[T_a], T_b], a: Future[T_a]) -> Future[T_b]:
+    b: Future[T_b] = Future()
+
+    def callback(a: Future[T_a]) -> None:
+        if a.cancelled():
+            b.cancel()
+            return
+        try:
+            b.set_result(f(a.result()))
+        except BaseException as error:  # noqa: BLE001
+            b.set_exception(error)
+
+    a.add_done_callback(callback)
+    return b
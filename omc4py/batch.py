@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+__all__ = (
+    "Batch",
+    "Batched",
+)
+
+import re
+import uuid
+from concurrent.futures import Future
+from contextlib import closing
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Generic,
+    List,
+    Protocol,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from .exception import OMCRuntimeError
+from .protocol import Calling, HasInteractive
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+T_Session = TypeVar("T_Session", bound="HasInteractive[Any]")
+
+
+class Batched(Protocol):
+    """
+    Session of a `Batch`, as typed by the calls on it
+
+    Its functions, and those of its packages, return `Future`
+    of their results instead of the results.
+    """
+
+    def __getattr__(self, name: str) -> BatchedFunction: ...
+
+
+class BatchedFunction(Batched, Protocol):
+    def __call__(self, *args: Any, **kwargs: Any) -> Future[Any]: ...
+
+
+@dataclass(frozen=True, eq=False)
+class Batch(Generic[T_Session]):
+    """
+    Calls collected into one omc script, sent in a single round trip
+
+    Calls on the session of `with session.batch() as b:` return
+    `concurrent.futures.Future` of their results instead,
+    which are set when the block exits.
+    `async with` sends the script without blocking the event loop.
+    """
+
+    session: T_Session
+    batched: Batched = field(repr=False)
+    _collector: _Collector = field(repr=False)
+
+    @classmethod
+    def open(cls, session: T_Session) -> Self:
+        collector = _Collector(session.__omc_interactive__.calling)
+        batched = type(session)(collector)  # type: ignore[arg-type]
+        return cls(session, cast(Batched, batched), collector)
+
+    def __enter__(self) -> Batched:
+        return self.batched
+
+    def __exit__(self, *exc_info: Any) -> None:
+        calls = self._take(send=exc_info[0] is None)
+        if calls.futures:
+            interactive = self.session.__omc_interactive__.synchronous
+            try:
+                reply = interactive.evaluate(calls.expression)
+            except BaseException as error:
+                calls.fail(error)
+                raise
+            calls.resolve(reply)
+
+    async def __aenter__(self) -> Batched:
+        return self.batched
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        calls = self._take(send=exc_info[0] is None)
+        if calls.futures:
+            interactive = self.session.__omc_interactive__.asynchronous
+            try:
+                reply = await interactive.evaluate(calls.expression)
+            except BaseException as error:
+                calls.fail(error)
+                raise
+            calls.resolve(reply)
+
+    def _take(self, *, send: bool) -> _Calls:
+        collector = self._collector
+        calls = _Calls(collector.calls[:], collector.separator)
+        collector.calls.clear()
+        if not send:
+            for _, future in calls.calls:
+                future.cancel()
+            return _Calls([], collector.separator)
+        return calls
+
+
+@dataclass(frozen=True)
+class _Calls:
+    calls: List[Tuple[str, Future[str]]]
+    separator: str
+
+    @property
+    def futures(self) -> list[Future[str]]:
+        return [future for _, future in self.calls]
+
+    @property
+    def expression(self) -> str:
+        # `"separator"` is a statement of its own after each call,
+        # the last one tells a complete reply from a truncated one
+        separator = f'"{self.separator}"'
+        return ";".join(
+            f"{expression};{separator}" for expression, _ in self.calls
+        )
+
+    def resolve(self, reply: str) -> None:
+        # Each statement prints its value followed by a newline,
+        # or nothing for functions without outputs
+        *results, rest = re.split(
+            rf'\n"{re.escape(self.separator)}"(?=\n)', f"\n{reply}"
+        )
+        if len(results) != len(self.calls) or rest.strip():
+            error = OMCRuntimeError(
+                f"Expected {len(self.calls)} results of batch, got {reply!r}"
+            )
+            self.fail(error)
+            raise error
+        for future, result in zip(self.futures, results):
+            future.set_result(result)
+
+    def fail(self, error: BaseException) -> None:
+        for future in self.futures:
+            future.set_exception(error)
+
+
+@dataclass(frozen=True, eq=False)
+class _Collector:
+    calling: Calling
+    calls: List[Tuple[str, Future[str]]] = field(default_factory=list)
+    separator: str = field(default_factory=lambda: f"omc4py-{uuid.uuid4()}")
+
+    def __enter__(self) -> Self:
+        return closing(self).__enter__()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return closing(self).__exit__(*exc_info)
+
+    def close(self) -> None:
+        pass  # the session is closed by its owner
+
+    @property
+    def synchronous(self) -> Self:
+        return self
+
+    @property
+    def asynchronous(self) -> Self:
+        return self
+
+    def evaluate(self, expression: str) -> Future[str]:
+        future: Future[str] = Future()
+        self.calls.append((expression, future))
+        return future
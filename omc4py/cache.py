@@ -0,0 +1,467 @@
+from __future__ import annotations
+
+__all__ = (
+    "CACHED_FUNCTIONS",
+    "INVALIDATING_FUNCTIONS",
+    "INVALIDATING_PREFIXES",
+    "CacheInfo",
+    "CachedInteractive",
+    "DiskCache",
+    "aprogram_fingerprint",
+    "program_fingerprint",
+)
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from contextlib import closing
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Coroutine,
+    Deque,
+    Dict,
+    FrozenSet,
+    Generic,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    cast,
+)
+
+from .algorithm import fmap
+from .protocol import Asynchronous, Calling, Synchronous, T_Calling
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from .interactive import Restart
+    from .offload import Offload
+    from .openmodelica import TypeName
+    from .protocol import PathLike, SupportsInteractive
+
+#: Functions answering the same until the loaded program changes
+CACHED_FUNCTIONS: FrozenSet[str] = frozenset(
+    (
+        "existClass",
+        "getClassComment",
+        "getClassInformation",
+        "getClassNames",
+        "getClassRestriction",
+        "getComponents",
+        "getInheritedClasses",
+        "isBlock",
+        "isClass",
+        "isConnector",
+        "isFunction",
+        "isModel",
+        "isPackage",
+        "isRecord",
+        "isType",
+        "list",
+    )
+)
+
+#: Functions changing the loaded program, besides `INVALIDATING_PREFIXES`
+INVALIDATING_FUNCTIONS: FrozenSet[str] = frozenset(
+    (
+        "clear",
+        "clearProgram",
+        "importFMU",
+        "reloadClass",
+        "runScript",
+    )
+)
+INVALIDATING_PREFIXES: Tuple[str, ...] = (
+    "add",
+    "copy",
+    "delete",
+    "load",
+    "move",
+    "remove",
+    "rename",
+    "set",
+    "update",
+)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+@dataclass(frozen=True, eq=False)
+class CachedInteractive(Generic[T_Calling]):
+    """
+    Interactive answering `CACHED_FUNCTIONS` from a LRU cache of replies
+
+    Replies are keyed on the evaluated expression,
+    i.e. function name and unparsed arguments.
+    Any function in `INVALIDATING_FUNCTIONS` (or starting with one of
+    `INVALIDATING_PREFIXES`), as well as a script of many statements,
+    empties the cache before it is evaluated.
+    So does a restart of the underlying `Interactive`, recycled or not.
+
+    Misses are looked up in `store` if any, which outlives the session.
+    """
+
+    interactive: SupportsInteractive[T_Calling]
+    maxsize: int | None = 1024
+    store: DiskCache | None = None
+    _replies: OrderedDict[str, str] = field(
+        default_factory=OrderedDict, repr=False
+    )
+    _counts: Counter[str] = field(default_factory=Counter, repr=False)
+    _generation: List[int] = field(default_factory=lambda: [0], repr=False)
+    _fingerprints: Dict[int, Optional[str]] = field(
+        default_factory=dict, repr=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _restarts: Optional[Deque[Restart]] = field(
+        default=None, init=False, repr=False
+    )
+    _last_restart: List[Optional[Restart]] = field(
+        default_factory=list, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        from .interactive import _owner
+
+        try:
+            restarts = _owner(self.interactive).restarts
+        except TypeError:
+            return  # e.g. a stub
+        object.__setattr__(self, "_restarts", restarts)
+        if not self._last_restart:
+            self._last_restart.append(restarts[-1] if restarts else None)
+
+    def __enter__(self) -> Self:
+        return closing(self).__enter__()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return closing(self).__exit__(*exc_info)
+
+    def close(self) -> None:
+        self.interactive.close()
+
+    @property
+    def calling(self) -> T_Calling:
+        return self.interactive.calling
+
+    @property
+    def synchronous(self) -> CachedInteractive[Synchronous]:
+        if TYPE_CHECKING:
+            synchronous: CachedInteractive[Synchronous]
+        else:
+            synchronous = self
+        return replace(synchronous, interactive=self.interactive.synchronous)
+
+    @property
+    def asynchronous(self) -> CachedInteractive[Asynchronous]:
+        if TYPE_CHECKING:
+            asynchronous: CachedInteractive[Asynchronous]
+        else:
+            asynchronous = self
+        return replace(asynchronous, interactive=self.interactive.asynchronous)
+
+    @property
+    def __omc_offload__(self) -> Optional[Offload]:
+        """Forwarded, see `omc4py.offload.OffloadingInteractive`"""
+        return getattr(self.interactive, "__omc_offload__", None)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._counts["hits"],
+                misses=self._counts["misses"],
+                maxsize=self.maxsize,
+                currsize=len(self._replies),
+            )
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._replies.clear()
+            self._fingerprints.clear()
+            self._generation[0] += 1
+
+    def evaluate(self, expression: str) -> str | Coroutine[None, None, str]:
+        if self._restarts:
+            self._check_restarts(self._restarts[-1])
+        funcname, _, arguments = expression.partition("(")
+        script = ";" in arguments  # e.g. `Batch`, may change anything
+
+        if funcname in CACHED_FUNCTIONS and not script:
+            with self._lock:
+                reply = self._replies.get(expression)
+                if reply is not None:
+                    self._counts["hits"] += 1
+                    self._replies.move_to_end(expression)
+                    return self._reply(reply)
+                generation = self._generation[0]
+
+            if self.store is not None:
+                if self.calling is Calling.synchronous:
+                    return self._evaluate_stored(generation, expression)
+                return self._aevaluate_stored(generation, expression)
+            self._count("misses")
+
+            def keep(reply: str) -> str:
+                self._store(generation, expression, reply)
+                return reply
+
+            return fmap(keep, self.interactive.evaluate(expression))
+
+        if (
+            script
+            or funcname in INVALIDATING_FUNCTIONS
+            or funcname.startswith(INVALIDATING_PREFIXES)
+        ):
+            self.cache_clear()
+
+        return self.interactive.evaluate(expression)
+
+    def _check_restarts(self, restart: Restart) -> None:
+        # A restarted (or recycled) omc has only its setup loaded
+        if restart is not self._last_restart[0]:
+            with self._lock:
+                self._last_restart[0] = restart
+            self.cache_clear()
+
+    def _reply(self, reply: str) -> str | Coroutine[None, None, str]:
+        if self.calling is Calling.synchronous:
+            return reply
+        return _return(reply)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] += 1
+
+    def _store(self, generation: int, expression: str, reply: str) -> bool:
+        with self._lock:
+            # The program may have changed while waiting for the reply
+            if generation != self._generation[0]:
+                return False
+            if self.maxsize != 0:
+                self._replies[expression] = reply
+            if self.maxsize is not None and self.maxsize < len(self._replies):
+                self._replies.popitem(last=False)
+            return True
+
+    def _evaluate_stored(self, generation: int, expression: str) -> str:
+        assert self.store is not None
+        fingerprint = self._fingerprint(generation)
+        if fingerprint == "":  # once per change of the program
+            fingerprint = program_fingerprint(self.interactive.synchronous)
+            self._keep_fingerprint(generation, fingerprint)
+
+        if fingerprint is not None:
+            reply = self.store.get(fingerprint, expression)
+            if reply is not None:
+                self._count("hits")
+                self._store(generation, expression, reply)
+                return reply
+        self._count("misses")
+
+        reply = self.interactive.synchronous.evaluate(expression)
+        stored = self._store(generation, expression, reply)
+        if stored and fingerprint is not None:
+            self.store.put(fingerprint, expression, reply)
+        return reply
+
+    async def _aevaluate_stored(self, generation: int, expression: str) -> str:
+        # Same as `_evaluate_stored`, file and SQLite I/O off the loop
+        assert self.store is not None
+        loop = asyncio.get_running_loop()
+        fingerprint = self._fingerprint(generation)
+        if fingerprint == "":
+            fingerprint = await aprogram_fingerprint(
+                self.interactive.asynchronous
+            )
+            self._keep_fingerprint(generation, fingerprint)
+
+        if fingerprint is not None:
+            reply = await loop.run_in_executor(
+                None, self.store.get, fingerprint, expression
+            )
+            if reply is not None:
+                self._count("hits")
+                self._store(generation, expression, reply)
+                return reply
+        self._count("misses")
+
+        reply = await self.interactive.asynchronous.evaluate(expression)
+        stored = self._store(generation, expression, reply)
+        if stored and fingerprint is not None:
+            await loop.run_in_executor(
+                None, self.store.put, fingerprint, expression, reply
+            )
+        return reply
+
+    def _fingerprint(self, generation: int) -> str | None:
+        """Fingerprint of the program, `""` if not known yet"""
+        with self._lock:
+            return self._fingerprints.get(generation, "")
+
+    def _keep_fingerprint(
+        self, generation: int, fingerprint: str | None
+    ) -> None:
+        with self._lock:
+            if generation == self._generation[0]:
+                self._fingerprints[generation] = fingerprint
+
+
+@dataclass(frozen=True)
+class DiskCache:
+    """
+    SQLite file of omc replies, shared across sessions and processes
+
+    Entries are keyed on `program_fingerprint` and the expression.
+    Writes are committed every `COMMIT_INTERVAL` entries and on `close`.
+    """
+
+    COMMIT_INTERVAL: ClassVar[int] = 256
+
+    path: Path
+    _connection: sqlite3.Connection = field(repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _writes: List[int] = field(default_factory=lambda: [0], repr=False)
+
+    @classmethod
+    def open(cls, path: str | PathLike[str]) -> Self:
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, check_same_thread=False)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS replies ("
+                " fingerprint TEXT NOT NULL,"
+                " expression TEXT NOT NULL,"
+                " reply TEXT NOT NULL,"
+                " PRIMARY KEY (fingerprint, expression)"
+                ") WITHOUT ROWID"
+            )
+            connection.commit()
+        except BaseException:
+            connection.close()
+            raise
+        return cls(path, connection)
+
+    def __enter__(self) -> Self:
+        return closing(self).__enter__()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return closing(self).__exit__(*exc_info)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
+
+    def get(self, fingerprint: str, expression: str) -> str | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT reply FROM replies"
+                " WHERE fingerprint = ? AND expression = ?",
+                (fingerprint, expression),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, fingerprint: str, expression: str, reply: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO replies VALUES (?, ?, ?)",
+                (fingerprint, expression, reply),
+            )
+            self._writes[0] += 1
+            if self._writes[0] % self.COMMIT_INTERVAL == 0:
+                self._connection.commit()
+
+
+#: Queries of the loaded program, the last of them its classes
+_PROGRAM_QUERIES = (
+    "getVersion()",
+    "getLoadedLibraries()",
+    "getClassNames()",
+)
+
+
+def program_fingerprint(
+    interactive: SupportsInteractive[Synchronous],
+) -> str | None:
+    """
+    Digest of omc version, loaded classes and their source files
+
+    Source files are identified by path, modification time and size.
+    `None` if a top-level class is not loaded from a file,
+    e.g. by `loadString`, since it can't be told from another.
+    """
+    replies = [interactive.evaluate(query) for query in _PROGRAM_QUERIES]
+    sources = [
+        interactive.evaluate(f"getSourceFile({name})")
+        for name in _class_names(replies[-1])
+    ]
+    return _digest(replies, sources)
+
+
+async def aprogram_fingerprint(
+    interactive: SupportsInteractive[Asynchronous],
+) -> str | None:
+    """`program_fingerprint` of asynchronous omc, files read off the loop"""
+    replies = [await interactive.evaluate(query) for query in _PROGRAM_QUERIES]
+    sources = await asyncio.gather(
+        *(
+            interactive.evaluate(f"getSourceFile({name})")
+            for name in _class_names(replies[-1])
+        )
+    )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _digest, replies, sources)
+
+
+def _class_names(reply: str) -> List[TypeName]:
+    from .openmodelica import TypeName
+    from .parser import parse
+
+    return cast("List[TypeName]", parse(List[TypeName], reply))
+
+
+def _digest(replies: List[str], sources: List[str]) -> str | None:
+    from .parser import parse
+
+    digest = hashlib.sha256()
+    for query, reply in zip(_PROGRAM_QUERIES, replies):
+        digest.update(f"{query}\0{reply}\0".encode())
+
+    for source in sources:
+        path = Path(parse(str, source))
+        if not path.is_file():
+            return None
+        if path.name == "package.mo":  # directory of a package
+            files = sorted(
+                file
+                for file in path.parent.rglob("*")
+                if file.suffix == ".mo" or file.name == "package.order"
+            )
+        else:
+            files = [path]
+        for file in files:
+            stat = file.stat()
+            digest.update(
+                f"{file}\0{stat.st_mtime_ns}\0{stat.st_size}\0".encode()
+            )
+
+    return digest.hexdigest()
+
+
+async def _return(reply: str) -> str:
+    return reply
@@ -4,6 +4,7 @@ __all__ = (
     "OMCError",
     "OMCException",
     "OMCRuntimeError",
+    "OMCTimeoutError",
     "OMCWarning",
 )
 
@@ -50,3 +51,10 @@ class OMCRuntimeError(
     RuntimeError,
 ):
     pass
+
+
+class OMCTimeoutError(
+    OMCRuntimeError,
+    TimeoutError,
+):
+    pass
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+__all__ = (
+    "CallRecord",
+    "LatencyHistogram",
+    "LatencyStats",
+    "instrument",
+)
+
+import logging
+import threading
+from collections.abc import Callable, Coroutine, Generator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, ClassVar, Dict, List, NamedTuple, Tuple, TypeVar
+
+from .algorithm import fmap
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class CallRecord(NamedTuple):
+    """Times in seconds and sizes in bytes (UTF-8) of an API call"""
+
+    funcname: str
+    unparse: float
+    sent: int
+    omc: float  # until the reply, including transport and wrappers
+    received: int
+    parse: float
+    error: BaseException | None
+
+    @property
+    def total(self) -> float:
+        return self.unparse + self.omc + self.parse
+
+
+Callback = Callable[[CallRecord], object]
+
+
+@contextmanager
+def instrument(*callbacks: Callback) -> Generator[None, None, None]:
+    """
+    Pass a `CallRecord` of each API call to `callbacks`
+
+    Effective in the current context (thread or asyncio task),
+    in addition to callbacks of enclosing blocks.
+    Exceptions of callbacks are logged, not raised.
+    """
+    token = _callbacks.set((*_callbacks.get(), *callbacks))
+    try:
+        yield
+    finally:
+        _callbacks.reset(token)
+
+
+class LatencyStats(NamedTuple):
+    calls: int
+    errors: int
+    unparse: float
+    omc: float
+    parse: float
+    sent: int
+    received: int
+    # calls by total latency, `buckets[k]` in [2**(k-1), 2**k) microseconds
+    buckets: Tuple[int, ...]
+
+    @property
+    def total(self) -> float:
+        return self.unparse + self.omc + self.parse
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket of the `q`-quantile, in seconds"""
+        rank = q * self.calls
+        count = 0
+        for k, n in enumerate(self.buckets):
+            count += n
+            if rank <= count:
+                return (1 << k) * 1e-6
+        return (1 << len(self.buckets)) * 1e-6
+
+
+@dataclass(frozen=True)
+class LatencyHistogram:
+    """
+    Callback of `instrument` aggregating calls per API function
+
+    `print(histogram)` shows their latencies, slowest in total first.
+    """
+
+    WIDTH: ClassVar[int] = 40
+
+    _stats: Dict[str, _Stats] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __call__(self, record: CallRecord) -> None:
+        bucket = int(record.total * 1e6).bit_length()
+        with self._lock:
+            stats = self._stats.get(record.funcname)
+            if stats is None:
+                stats = self._stats[record.funcname] = _Stats()
+            stats.add(record, bucket)
+
+    def __str__(self) -> str:
+        return self.report()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def stats(self) -> Dict[str, LatencyStats]:
+        with self._lock:
+            return {
+                funcname: stats.snapshot()
+                for funcname, stats in self._stats.items()
+            }
+
+    def report(self) -> str:
+        lines = [
+            f"{'function':<32}{'calls':>7}{'errors':>7}{'total':>10}"
+            f"{'mean':>10}{'p50':>10}{'p99':>10}{'omc':>6}"
+            f"{'sent':>10}{'received':>10}"
+        ]
+        for funcname, stats in sorted(
+            self.stats().items(), key=lambda item: -item[1].total
+        ):
+            lines.append(
+                f"{funcname:<32}{stats.calls:>7}{stats.errors:>7}"
+                f"{_duration(stats.total):>10}"
+                f"{_duration(stats.total / stats.calls):>10}"
+                f"{_duration(stats.quantile(0.5)):>10}"
+                f"{_duration(stats.quantile(0.99)):>10}"
+                f"{stats.omc / (stats.total or 1):>6.0%}"
+                f"{stats.sent:>10}{stats.received:>10}"
+            )
+            lines.extend(self._bars(stats.buckets))
+        return "\n".join(lines)
+
+    def _bars(self, buckets: Tuple[int, ...]) -> List[str]:
+        first = next(k for k, n in enumerate(buckets) if n)
+        most = max(buckets)
+        return [
+            f"  < {_duration(2**k * 1e-6):>8} "
+            f"{'#' * -(-n * self.WIDTH // most):<{self.WIDTH}} {n}"
+            for k, n in enumerate(buckets[first:], first)
+        ]
+
+
+@dataclass
+class _Stats:
+    calls: int = 0
+    errors: int = 0
+    unparse: float = 0.0
+    omc: float = 0.0
+    parse: float = 0.0
+    sent: int = 0
+    received: int = 0
+    buckets: List[int] = field(default_factory=list)
+
+    def add(self, record: CallRecord, bucket: int) -> None:
+        self.calls += 1
+        self.errors += record.error is not None
+        self.unparse += record.unparse
+        self.omc += record.omc
+        self.parse += record.parse
+        self.sent += record.sent
+        self.received += record.received
+        if len(self.buckets) <= bucket:
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+
+    def snapshot(self) -> LatencyStats:
+        return LatencyStats(
+            calls=self.calls,
+            errors=self.errors,
+            unparse=self.unparse,
+            omc=self.omc,
+            parse=self.parse,
+            sent=self.sent,
+            received=self.received,
+            buckets=tuple(self.buckets),
+        )
+
+
+def _duration(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+_callbacks: ContextVar[Tuple[Callback, ...]] = ContextVar(
+    "_callbacks", default=()
+)
+
+
+def _emit(callbacks: Tuple[Callback, ...], record: CallRecord) -> None:
+    for callback in callbacks:
+        try:
+            callback(record)
+        except Exception:  # noqa: PERF203, each callback on its own
+            logger.exception(f"Instrumentation of {record.funcname} failed")
+
+
+def _instrumented(
+    callbacks: Tuple[Callback, ...],
+    funcname: str,
+    unparse: Callable[[], str],
+    evaluate: Callable[[str], Any],
+    parse: Callable[[str], T],
+) -> T | Coroutine[None, None, T] | Future[T]:
+    """`parse(evaluate(unparse()))`, timed into a `CallRecord`"""
+    record = CallRecord(funcname, 0.0, 0, 0.0, 0, 0.0, None)
+    start = perf_counter()
+    try:
+        expression = unparse()
+    except BaseException as error:
+        _emit(
+            callbacks,
+            record._replace(unparse=perf_counter() - start, error=error),
+        )
+        raise
+    sending = perf_counter()
+    record = record._replace(
+        unparse=sending - start, sent=len(expression.encode())
+    )
+
+    def failed(error: BaseException) -> None:
+        _emit(
+            callbacks,
+            record._replace(omc=perf_counter() - sending, error=error),
+        )
+
+    def received(reply: str) -> T:
+        parsing = perf_counter()
+        done = record._replace(
+            omc=parsing - sending, received=len(reply.encode())
+        )
+        try:
+            result = parse(reply)
+        except BaseException as error:
+            _emit(
+                callbacks,
+                done._replace(parse=perf_counter() - parsing, error=error),
+            )
+            raise
+        _emit(callbacks, done._replace(parse=perf_counter() - parsing))
+        return result
+
+    try:
+        reply = evaluate(expression)
+    except BaseException as error:
+        failed(error)
+        raise
+
+    if isinstance(reply, Coroutine):
+        return _received(reply, received, failed)
+    if isinstance(reply, Future):
+        # Calls of `Batch` wait for the end of the batch
+        reply.add_done_callback(lambda future: _failed(future, failed))
+    return fmap(received, reply)
+
+
+async def _received(
+    reply: Coroutine[None, None, str],
+    received: Callable[[str], T],
+    failed: Callable[[BaseException], None],
+) -> T:
+    try:
+        value = await reply
+    except BaseException as error:
+        failed(error)
+        raise
+    return received(value)
+
+
+def _failed(
+    future: Future[str], failed: Callable[[BaseException], None]
+) -> None:
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        failed(error)
@@ -1,57 +1,144 @@
 from __future__ import annotations
 
+import asyncio
 import atexit
+import itertools
 import logging
 import platform
 import re
 import shutil
 import tempfile
+import threading
+import time
 import uuid
 from asyncio import Lock
-from collections.abc import Coroutine, Generator
+from collections import deque
+from collections.abc import Callable, Coroutine, Generator
 from contextlib import ExitStack, closing, contextmanager, suppress
-from dataclasses import dataclass, replace
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from functools import partial
 from glob import glob
 from os import PathLike
 from pathlib import Path
 from subprocess import DEVNULL, PIPE, Popen
-from typing import TYPE_CHECKING, Any, AnyStr, Generic, NewType, overload
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AnyStr,
+    ContextManager,
+    Deque,
+    Dict,
+    FrozenSet,
+    Generic,
+    List,
+    NamedTuple,
+    NewType,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+    overload,
+)
 from weakref import WeakKeyDictionary
 
 import zmq.asyncio
 
+from . import trace
+from .exception import OMCRuntimeError, OMCTimeoutError
 from .protocol import Asynchronous, Calling, Synchronous, T_Calling
 
 if TYPE_CHECKING:
     from typing_extensions import Self
 
+    from .protocol import SupportsInteractive
+
 Port = NewType("Port", str)
 
 logger = logging.getLogger(__name__)
 
 
+#: Calls recorded by a supervised `Interactive`, replayed on restart
+SETUP_FUNCTIONS: FrozenSet[str] = frozenset(
+    (
+        "cd",
+        "loadFile",
+        "loadFiles",
+        "loadModel",
+        "loadString",
+        "setCommandLineOptions",
+        "setModelicaPath",
+    )
+)
+
+#: Seconds between checks that omc is alive while waiting for its reply
+CHECK_INTERVAL = 1.0
+
+
+class Restart(NamedTuple):
+    """Why omc was restarted, and seconds to start it and to replay setup"""
+
+    pid: int
+    reason: str
+    process: float
+    setup: float
+
+    @property
+    def total(self) -> float:
+        return self.process + self.setup
+
+
 @dataclass(frozen=True)
 class Interactive(Generic[T_Calling]):
+    """
+    omc process talked to over zmq
+
+    A call without reply within `timeout` seconds (or those of the
+    enclosing `call_timeout`) restarts omc and raises `OMCTimeoutError`.
+    If omc exits, calls raise `OMCRuntimeError`.
+
+    A `supervised` omc is restarted when it exits as well,
+    and `SETUP_FUNCTIONS` called before are replayed on the new one.
+    Restarts are recorded in `restarts`.
+
+    Messages to omc and its replies are written to `capture` if any.
+    """
+
     _exit_stack: ExitStack
-    _resource: _Resource
+    _slot: _Slot
     calling: T_Calling
+    timeout: float | None = None
+    capture: Optional[trace.Capture] = None
 
     @classmethod
-    def open(
+    def open(  # noqa: PLR0913
         cls,
         omc: str | PathLike[str] | None,
         calling: T_Calling,
+        *,
+        timeout: float | None = None,
+        supervised: bool = False,
+        capture: str | PathLike[str] | None = None,
     ) -> Self:
         exit_stack = ExitStack()
         atexit.register(exit_stack.close)
 
         try:
-            resource = exit_stack.enter_context(_Resource.open(omc))
+            capture_file = None
+            if capture is not None:
+                capture_file = exit_stack.enter_context(
+                    trace.Capture.open(capture)
+                )
+            slot = exit_stack.enter_context(
+                _Slot.open(partial(_Resource.open, omc), supervised=supervised)
+            )
 
             return cls(
                 exit_stack,
-                resource,
+                slot,
                 calling,
+                timeout,
+                capture_file,
             )
 
         except Exception:
@@ -67,6 +154,18 @@ class Interactive(Generic[T_Calling]):
     def close(self) -> None:
         self._exit_stack.close()
 
+    @property
+    def restarts(self) -> Deque[Restart]:
+        return self._slot.restarts
+
+    @property
+    def supervised(self) -> bool:
+        return self._slot.script is not None
+
+    @property
+    def _resource(self) -> _Resource:
+        return self._slot.resource
+
     @property
     def synchronous(self) -> Interactive[Synchronous]:
         if TYPE_CHECKING:
@@ -101,27 +200,332 @@ class Interactive(Generic[T_Calling]):
         else:
             return self.__asynchronous_evaluate(expression)
 
+    @overload
+    def recycle(self: Interactive[Synchronous], reason: str) -> None: ...
+
+    @overload
+    async def recycle(
+        self: Interactive[Asynchronous], reason: str
+    ) -> None: ...
+
+    def recycle(self, reason: str) -> None | Coroutine[None, None, None]:
+        """
+        Replace omc by a new one set up alike, without failing any call
+
+        The new omc is started and set up while the old one still works,
+        which is closed when calls in flight on it have returned.
+        """
+        if self.calling is Calling.synchronous:
+            stack = self._slot.succeed(self._slot.successor(), reason)
+            if stack is not None:
+                stack.close()
+            return None
+        else:
+            return self.__asynchronous_recycle(reason)
+
+    async def __asynchronous_recycle(self, reason: str) -> None:
+        loop = asyncio.get_running_loop()
+        successor = await loop.run_in_executor(None, self._slot.successor)
+        stack = self._slot.succeed(successor, reason)
+        if stack is not None:
+            # No pipeline, no asynchronous call in flight
+            pipeline = _resource_pipelines.get(successor.predecessor)
+            if pipeline is not None:
+                await pipeline.drained.wait()
+            await loop.run_in_executor(None, stack.close)
+
     def __synchronous_evaluate(self, expression: str) -> str:
-        process = self._resource.process
-        socket = self._resource.sockets.synchronous
-        logger.debug(f"(pid={process.pid}) >>> {expression}")
-        socket.send_string(expression)
-        result = socket.recv_string()
-        logger.debug(f"(pid={process.pid}) {result}")
+        resource = self._slot.alive()
+        process = resource.process
+        timeout = _call_timeout.get(self.timeout)
+        traced = trace.enabled(logger, self.capture)
+        if traced:
+            trace.message(
+                logger, process.pid, trace.REQUEST, expression, self.capture
+            )
+        try:
+            result = _request(resource, expression, timeout)
+        except _Lost as lost:
+            raise self._slot.recover(resource, lost) from None
+        self._slot.record(expression)
+        if traced:
+            trace.message(
+                logger, process.pid, trace.REPLY, result, self.capture
+            )
         return result
 
     async def __asynchronous_evaluate(self, expression: str) -> str:
-        process = self._resource.process
-        socket = self._resource.sockets.asynchronous
-        async with self._resource.lock:
-            logger.debug(f"(pid={process.pid}) >>> {expression}")
-            await socket.send_string(expression)
-            result = await socket.recv_string()
-            logger.debug(f"(pid={process.pid}) {result}")
-        return result
+        loop = asyncio.get_running_loop()
+        resource = self._slot.resource
+        if resource.process.poll() is not None:
+            resource = await loop.run_in_executor(None, self._slot.alive)
+        process = resource.process
+        timeout = _call_timeout.get(self.timeout)
+        traced = trace.enabled(logger, self.capture)
+        if traced:
+            trace.message(
+                logger, process.pid, trace.REQUEST, expression, self.capture
+            )
+        try:
+            result = await asyncio.wait_for(
+                resource.pipeline.evaluate(expression), timeout
+            )
+        except asyncio.TimeoutError:
+            lost: _Lost = _Stalled(timeout)
+        except _Lost as error:
+            lost = error
+        else:
+            self._slot.record(expression)
+            if traced:
+                trace.message(
+                    logger, process.pid, trace.REPLY, result, self.capture
+                )
+            return result
+
+        # Other calls waiting for the lost omc fail alike
+        resource.pipeline.fail(lost)
+        raise (
+            await loop.run_in_executor(
+                None, self._slot.recover, resource, lost
+            )
+        ) from None
+
+
+def _owner(interactive: SupportsInteractive[T_Calling]) -> Interactive[Any]:
+    """`Interactive` under wrappers like `CachedInteractive`"""
+    while not isinstance(interactive, Interactive):
+        inner = getattr(interactive, "interactive", None)
+        if inner is None:
+            raise TypeError(f"{interactive!r} doesn't talk to an omc process")
+        interactive = inner
+    return interactive
+
+
+@contextmanager
+def call_timeout(seconds: float | None) -> Generator[None, None, None]:
+    """
+    Timeout of omc calls, overriding that of the session
+
+    Effective in the current context (thread or asyncio task),
+    `None` waits as long as omc takes.
+    """
+    token = _call_timeout.set(seconds)
+    try:
+        yield
+    finally:
+        _call_timeout.reset(token)
+
+
+_call_timeout: ContextVar[float | None] = ContextVar("_call_timeout")
+
+_request_ids = itertools.count()
+
+
+def _new_request_id() -> bytes:
+    return next(_request_ids).to_bytes(8, "little")
+
+
+class _Lost(Exception):
+    """omc will never reply"""
+
+
+class _Stalled(_Lost):
+    def __init__(self, timeout: float | None) -> None:
+        super().__init__(f"didn't reply in {timeout}s")
+
 
+class _Exited(_Lost):
+    def __init__(self, returncode: int) -> None:
+        super().__init__(f"exited with {returncode}")
 
-_resource_locks: WeakKeyDictionary[_Resource, Lock] = WeakKeyDictionary()
+
+def _request(
+    resource: _Resource, expression: str, timeout: float | None
+) -> str:
+    socket = resource.sockets.synchronous
+    request_id = _new_request_id()
+    socket.send_multipart([request_id, b"", expression.encode()])
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        wait = CHECK_INTERVAL
+        if deadline is not None:
+            wait = min(wait, deadline - time.monotonic())
+        if socket.poll(max(int(wait * 1000), 0)):
+            reply_id, _, reply = socket.recv_multipart()
+            # Replies of calls interrupted before are dropped
+            if reply_id == request_id:
+                return reply.decode()
+        elif resource.process.poll() is not None:
+            raise _Exited(resource.process.returncode)
+        elif deadline is not None and deadline <= time.monotonic():
+            raise _Stalled(timeout)
+
+
+@dataclass(frozen=True, eq=False)
+class _Slot:
+    """Current `_Resource` of an `Interactive`, replaced by `restart`"""
+
+    _open: Callable[[], ContextManager[_Resource]]
+    _stacks: List[ExitStack]
+    _resources: List[_Resource]
+    script: Optional[List[str]] = None  # recorded setup, if supervised
+    restarts: Deque[Restart] = field(default_factory=lambda: deque(maxlen=100))
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @classmethod
+    @contextmanager
+    def open(
+        cls,
+        open_: Callable[[], ContextManager[_Resource]],
+        *,
+        supervised: bool = False,
+    ) -> Generator[Self, None, None]:
+        stack = ExitStack()
+        resource = stack.enter_context(open_())
+        slot = cls(open_, [stack], [resource], [] if supervised else None)
+        try:
+            yield slot
+        finally:
+            with slot._lock:
+                slot._stacks[0].close()
+
+    @property
+    def resource(self) -> _Resource:
+        return self._resources[0]
+
+    def alive(self) -> _Resource:
+        """Return omc, restarted first if it has exited and is supervised"""
+        resource = self._resources[0]
+        if resource.process.poll() is None:
+            return resource
+        error = self.recover(resource, _Exited(resource.process.returncode))
+        if self.script is None:
+            raise error
+        return self._resources[0]
+
+    def record(self, expression: str) -> None:
+        if self.script is None:
+            return
+        funcname, _, arguments = expression.partition("(")
+        if funcname in SETUP_FUNCTIONS and arguments != ")":
+            with self._lock:
+                self.script.append(expression)
+        elif funcname in ("clear", "clearProgram"):
+            with self._lock:
+                self.script[:] = [
+                    recorded
+                    for recorded in self.script
+                    if not recorded.startswith("load")
+                ]
+
+    def recover(self, lost: _Resource, reason: _Lost) -> OMCRuntimeError:
+        """Restart `lost` omc if need be, and tell the caller what happened"""
+        supervised = self.script is not None
+        restart = supervised or isinstance(reason, _Stalled)
+        with self._lock:
+            if restart and self._resources[0] is lost:
+                self._restart(lost, f"{reason}")
+
+        message = f"omc (pid={lost.process.pid}) {reason}"
+        if supervised:
+            message += ", and is restarted and set up again"
+        elif restart:
+            message += ", and is restarted, losing its state"
+        if isinstance(reason, _Stalled):
+            return OMCTimeoutError(message)
+        return OMCRuntimeError(message)
+
+    def successor(self) -> _Successor:
+        """Start and set up a new omc, to replace the current one"""
+        with self._lock:
+            predecessor = self._resources[0]
+            script = list(self.script or ())
+        return _Successor(predecessor, len(script), *self._start(script))
+
+    def succeed(self, successor: _Successor, reason: str) -> ExitStack | None:
+        """Replace omc by `successor`, returning what closes the old one"""
+        with self._lock:
+            if self._resources[0] is not successor.predecessor:
+                successor.stack.close()  # restarted in the meantime
+                return None
+            # Setup called while `successor` was started
+            _replay(
+                successor.resource, (self.script or [])[successor.replayed :]
+            )
+            stack = self._stacks[0]
+            self._install(
+                successor.predecessor,
+                reason,
+                successor.stack,
+                successor.resource,
+                successor.process,
+                successor.setup,
+            )
+            return stack
+
+    def _restart(self, lost: _Resource, reason: str) -> None:
+        logger.warning(f"(pid={lost.process.pid}) omc {reason}, restart omc")
+        self._stacks[0].close()
+        self._install(lost, reason, *self._start(self.script or ()))
+
+    def _start(
+        self, script: Sequence[str]
+    ) -> tuple[ExitStack, _Resource, float, float]:
+        start = time.perf_counter()
+        stack = ExitStack()
+        resource = stack.enter_context(self._open())
+        started = time.perf_counter()
+        try:
+            _replay(resource, script)
+        except BaseException:
+            stack.close()
+            raise
+        return stack, resource, started - start, time.perf_counter() - started
+
+    def _install(  # noqa: PLR0913
+        self,
+        previous: _Resource,
+        reason: str,
+        stack: ExitStack,
+        resource: _Resource,
+        process: float,
+        setup: float,
+    ) -> None:
+        self._stacks[0] = stack
+        self._resources[0] = resource
+        restart = Restart(previous.process.pid, reason, process, setup)
+        self.restarts.append(restart)
+        logger.info(
+            f"(pid={previous.process.pid}) omc is restarted "
+            f"as (pid={resource.process.pid}) in {restart.total:.3f}s "
+            f"(process={restart.process:.3f}s, setup={restart.setup:.3f}s)"
+        )
+
+
+class _Successor(NamedTuple):
+    predecessor: _Resource
+    replayed: int
+    stack: ExitStack
+    resource: _Resource
+    process: float
+    setup: float
+
+
+def _replay(resource: _Resource, script: Sequence[str]) -> None:
+    expression = ""
+    try:
+        for expression in script:
+            _request(resource, expression, None)
+    except _Lost as error:
+        raise OMCRuntimeError(
+            f"omc (pid={resource.process.pid}) {error} "
+            f"while set up again by {expression}"
+        ) from None
+
+
+_resource_pipelines: WeakKeyDictionary[_Resource, _Pipeline] = (
+    WeakKeyDictionary()
+)
 
 
 @dataclass(frozen=True)
@@ -136,6 +540,7 @@ class _Resource:
         omc: str | PathLike[str] | None,
     ) -> Generator[Self, None, None]:
         with ExitStack() as stack:
+            start = time.perf_counter()
             suffix = str(uuid.uuid4())
 
             command = [
@@ -167,15 +572,93 @@ class _Resource:
 
             sockets = stack.enter_context(_Sockets.open(port))
             logger.info(f"{header} Connect zmq sokcet via {port}")
+            logger.info(
+                f"{header} Started in {time.perf_counter() - start:.3f}s"
+            )
             stack.callback(lambda: logger.info(f"{header} Close zmq sokcet"))
 
             yield cls(process=process, sockets=sockets)
 
     @property
-    def lock(self) -> Lock:
-        if self not in _resource_locks:
-            _resource_locks[self] = Lock()
-        return _resource_locks[self]
+    def pipeline(self) -> _Pipeline:
+        if self not in _resource_pipelines:
+            _resource_pipelines[self] = _Pipeline(
+                self.sockets.asynchronous, self.process
+            )
+        return _resource_pipelines[self]
+
+
+@dataclass(frozen=True)
+class _Pipeline:
+    """
+    Requests in flight on a DEALER socket to the REP socket of omc
+
+    Each request is sent at once, prefixed by an id frame that omc returns
+    as the envelope of its reply.
+    Waiting coroutines take turns to receive one reply at a time
+    and hand it over to its caller by id, so no request waits for
+    the round trip of another to be sent.
+    `drained` is set while no request is pending.
+    """
+
+    socket: zmq.asyncio.Socket
+    process: Optional[Popen[str]] = None
+    pending: Dict[bytes, asyncio.Future[str]] = field(default_factory=dict)
+    receiving: Lock = field(default_factory=Lock)
+    failure: List[BaseException] = field(default_factory=list)
+    drained: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def __post_init__(self) -> None:
+        self.drained.set()
+
+    async def evaluate(self, expression: str) -> str:
+        request_id = _new_request_id()
+        reply: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = reply
+        self.drained.clear()
+        try:
+            await self.socket.send_multipart(
+                [request_id, b"", expression.encode()]
+            )
+            while not reply.done():
+                async with self.receiving:
+                    if not reply.done():
+                        await self._receive()
+            return reply.result()
+        finally:
+            # Reply to a cancelled request is dropped on arrival
+            self._forget(request_id)
+
+    def fail(self, error: BaseException) -> None:
+        """Fail calls in flight, before the socket is closed under them"""
+        self.failure.append(error)
+        for waiting in self.pending.values():
+            if not waiting.done():
+                waiting.set_exception(error)
+
+    async def _receive(self) -> None:
+        try:
+            while not await self.socket.poll(int(CHECK_INTERVAL * 1000)):
+                if (
+                    self.process is not None
+                    and self.process.poll() is not None
+                ):
+                    self.fail(_Exited(self.process.returncode))
+                    return
+            request_id, _, reply = await self.socket.recv_multipart()
+        except asyncio.CancelledError:
+            if self.failure:  # closed socket, waiting calls have failed
+                return
+            raise
+        waiting = self._forget(request_id)
+        if waiting is not None and not waiting.done():
+            waiting.set_result(reply.decode())
+
+    def _forget(self, request_id: bytes) -> asyncio.Future[str] | None:
+        waiting = self.pending.pop(request_id, None)
+        if not self.pending:
+            self.drained.set()
+        return waiting
 
 
 def _resolve_omc(
@@ -239,20 +722,125 @@ def _find_openmodelica_zmq_port_filepath(suffix: str | None) -> Path:
     return candidates[0]
 
 
-@dataclass(frozen=True)
+@contextmanager
+def zmq_context(
+    io_threads: int = 1,
+) -> Generator[zmq.Context, None, None]:
+    """
+    Keep the zmq context shared by sessions, of `io_threads` IO threads
+
+    Sessions of the process share one context, made on first use
+    with one IO thread and terminated once all of them are closed.
+    Within the block, it is kept even without sessions, and made with
+    `io_threads` unless in use already.
+    """
+    with _shared_context.use(io_threads) as shared:
+        yield shared.synchronous
+
+
+@dataclass(eq=False)
+class _SharedContext:
+    """zmq context made on first use, terminated after the last one"""
+
+    io_threads: int = 1
+    users: int = 0
+    _contexts: Optional[tuple[zmq.Context, zmq.asyncio.Context]] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def synchronous(self) -> zmq.Context:
+        assert self._contexts is not None
+        return self._contexts[0]
+
+    @property
+    def asynchronous(self) -> zmq.asyncio.Context:
+        assert self._contexts is not None
+        return self._contexts[1]
+
+    @contextmanager
+    def use(
+        self, io_threads: int | None = None
+    ) -> Generator[Self, None, None]:
+        with self._lock:
+            if self._contexts is None:
+                self.io_threads = 1 if io_threads is None else io_threads
+                context = zmq.Context(io_threads=self.io_threads)
+                # Same IO threads, for asyncio sockets
+                shadow = zmq.asyncio.Context.shadow(context.underlying)
+                self._contexts = (context, shadow)
+            elif io_threads not in (None, self.io_threads):
+                raise ValueError(
+                    f"zmq context of {self.io_threads} IO threads "
+                    "is in use already"
+                )
+            self.users += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self.users -= 1
+                if not self.users:
+                    context, _ = self._contexts
+                    self._contexts = None
+                    context.term()
+
+
+_shared_context = _SharedContext()
+
+_Socket = Union[zmq.Socket, zmq.asyncio.Socket]
+
+
+@dataclass(frozen=True, eq=False)
 class _Sockets:
-    synchronous: zmq.Socket
-    asynchronous: zmq.asyncio.Socket
+    """DEALER sockets to omc, each connected on first use"""
+
+    port: Port
+    context: _SharedContext
+    _connected: Dict[Calling, _Socket] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
 
     @classmethod
     @contextmanager
     def open(cls, port: Port) -> Generator[Self, None, None]:
-        synchronous = zmq.Context().socket(zmq.REQ)
-        asynchronous = zmq.asyncio.Context().socket(zmq.REQ)
-        with synchronous, asynchronous:
-            synchronous.connect(port)
-            asynchronous.connect(port)
-            yield cls(synchronous=synchronous, asynchronous=asynchronous)
+        with _shared_context.use() as context:
+            sockets = cls(port, context)
+            try:
+                yield sockets
+            finally:
+                sockets.close()
+
+    @property
+    def synchronous(self) -> zmq.Socket:
+        socket = self._connected.get(Calling.synchronous)
+        if socket is None:
+            socket = self._connect(Calling.synchronous)
+        return cast(zmq.Socket, socket)
+
+    @property
+    def asynchronous(self) -> zmq.asyncio.Socket:
+        socket = self._connected.get(Calling.asynchronous)
+        if socket is None:
+            socket = self._connect(Calling.asynchronous)
+        return cast(zmq.asyncio.Socket, socket)
+
+    def close(self) -> None:
+        with self._lock:
+            for socket in self._connected.values():
+                # Unsent requests to omc gone would hold the context
+                socket.close(linger=0)
+            self._connected.clear()
+
+    def _connect(self, calling: Calling) -> _Socket:
+        with self._lock:
+            socket = self._connected.get(calling)
+            if socket is None:
+                if calling is Calling.synchronous:
+                    socket = self.context.synchronous.socket(zmq.DEALER)
+                else:
+                    socket = self.context.asynchronous.socket(zmq.DEALER)
+                socket.connect(self.port)
+                self._connected[calling] = socket
+            return socket
 
 
 @contextmanager
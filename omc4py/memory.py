@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+__all__ = (
+    "MemoryBoundedInteractive",
+    "MemorySample",
+)
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import closing
+from dataclasses import dataclass, field, replace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Coroutine,
+    Deque,
+    Dict,
+    Generic,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from .exception import OMCRuntimeError
+from .interactive import _owner
+from .protocol import Asynchronous, Calling, Synchronous, T_Calling
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from .offload import Offload
+    from .protocol import SupportsInteractive
+
+logger = logging.getLogger(__name__)
+
+
+class MemorySample(NamedTuple):
+    """GC heap of omc in bytes, and what was done about it"""
+
+    time: float
+    pid: int
+    heap: int  # mapped, i.e. `heapsize_full - unmapped_bytes`
+    free: int  # mapped but free
+    collections: int
+    action: str  # "", "collect" or "recycle"
+
+
+@dataclass(frozen=True, eq=False)
+class MemoryBoundedInteractive(Generic[T_Calling]):
+    """
+    Interactive keeping the GC heap of omc under `max_heap` bytes
+
+    `GC_get_prof_stats()` is sampled after every `every` calls.
+    Over `max_heap`, `GC_gcollect_and_unmap()` is tried first,
+    then omc is recycled: replaced by a new one set up alike,
+    which needs the underlying `Interactive` to be supervised.
+    Samples are kept in `samples`.
+    """
+
+    interactive: SupportsInteractive[T_Calling]
+    max_heap: int
+    every: int = 100
+    samples: Deque[MemorySample] = field(
+        default_factory=lambda: deque(maxlen=1000), repr=False
+    )
+    _calls: List[int] = field(default_factory=lambda: [0], repr=False)
+    _checking: threading.Lock = field(
+        default_factory=threading.Lock, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if not _owner(self.interactive).supervised:
+            raise ValueError(
+                "Memory bounded omc must be supervised to be recycled"
+            )
+
+    def __enter__(self) -> Self:
+        return closing(self).__enter__()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return closing(self).__exit__(*exc_info)
+
+    def close(self) -> None:
+        self.interactive.close()
+
+    @property
+    def calling(self) -> T_Calling:
+        return self.interactive.calling
+
+    @property
+    def synchronous(self) -> MemoryBoundedInteractive[Synchronous]:
+        if TYPE_CHECKING:
+            synchronous: MemoryBoundedInteractive[Synchronous]
+        else:
+            synchronous = self
+        return replace(synchronous, interactive=self.interactive.synchronous)
+
+    @property
+    def asynchronous(self) -> MemoryBoundedInteractive[Asynchronous]:
+        if TYPE_CHECKING:
+            asynchronous: MemoryBoundedInteractive[Asynchronous]
+        else:
+            asynchronous = self
+        return replace(asynchronous, interactive=self.interactive.asynchronous)
+
+    @property
+    def __omc_offload__(self) -> Optional[Offload]:
+        """Forwarded, see `omc4py.offload.OffloadingInteractive`"""
+        return getattr(self.interactive, "__omc_offload__", None)
+
+    def evaluate(self, expression: str) -> str | Coroutine[None, None, str]:
+        reply = self.interactive.evaluate(expression)
+        self._calls[0] += 1
+        if self._calls[0] % self.every:
+            return reply
+        if self.calling is Calling.synchronous:
+            self._check()
+            return reply
+        return self._acheck(reply)
+
+    def _check(self) -> None:
+        # Once at a time, others calls go on meanwhile
+        if not self._checking.acquire(blocking=False):
+            return
+        try:
+            interactive = self.interactive.synchronous
+            sample = self._sample(interactive.evaluate("GC_get_prof_stats()"))
+            if self.max_heap < sample.heap:
+                self._record(sample, "collect")
+                interactive.evaluate("GC_gcollect_and_unmap()")
+                sample = self._sample(
+                    interactive.evaluate("GC_get_prof_stats()")
+                )
+            if self.max_heap < sample.heap:
+                self._record(sample, "recycle")
+                _owner(interactive).synchronous.recycle(self._reason(sample))
+            else:
+                self._record(sample, "")
+        finally:
+            self._checking.release()
+
+    async def _acheck(self, reply: Coroutine[None, None, str]) -> str:
+        result = await reply
+        if not self._checking.acquire(blocking=False):
+            return result
+        try:
+            interactive = self.interactive.asynchronous
+            sample = self._sample(
+                await interactive.evaluate("GC_get_prof_stats()")
+            )
+            if self.max_heap < sample.heap:
+                self._record(sample, "collect")
+                await interactive.evaluate("GC_gcollect_and_unmap()")
+                sample = self._sample(
+                    await interactive.evaluate("GC_get_prof_stats()")
+                )
+            if self.max_heap < sample.heap:
+                self._record(sample, "recycle")
+                await _owner(interactive).asynchronous.recycle(
+                    self._reason(sample)
+                )
+            else:
+                self._record(sample, "")
+        finally:
+            self._checking.release()
+        return result
+
+    def _sample(self, reply: str) -> MemorySample:
+        stats: Dict[str, int] = {
+            key: int(value)
+            for key, value in re.findall(r"(\w+)\s*=\s*(-?\d+)", reply)
+        }
+        try:
+            unmapped = stats["unmapped_bytes"]
+            return MemorySample(
+                time=time.time(),
+                pid=_owner(self.interactive)._resource.process.pid,
+                heap=stats["heapsize_full"] - unmapped,
+                free=stats["free_bytes_full"] - unmapped,
+                collections=stats["gc_no"],
+                action="",
+            )
+        except KeyError:
+            raise OMCRuntimeError(
+                f"Unexpected GC_get_prof_stats() {reply!r}"
+            ) from None
+
+    def _record(self, sample: MemorySample, action: str) -> None:
+        sample = sample._replace(action=action)
+        self.samples.append(sample)
+        if action:
+            logger.info(
+                f"(pid={sample.pid}) GC heap of {sample.heap} bytes "
+                f"over {self.max_heap}, {action}"
+            )
+
+    def _reason(self, sample: MemorySample) -> str:
+        return f"has GC heap of {sample.heap} bytes over {self.max_heap}"
@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import enum
 import inspect
-from collections.abc import Callable, Coroutine, Generator
-from functools import lru_cache, wraps
+import sys
+import types
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from functools import lru_cache, partial, wraps
+from importlib import import_module
 from itertools import islice
 from typing import (
     TYPE_CHECKING,
@@ -15,11 +19,13 @@ from typing import (
     get_origin,
     get_type_hints,
 )
+from weakref import WeakKeyDictionary
 
 if TYPE_CHECKING:
     from typing_extensions import Concatenate, ParamSpec
 
 from .algorithm import fmap
+from .instrument import _callbacks, _instrumented
 from .openmodelica import TypeName
 from .protocol import (
     Asynchronous,
@@ -75,6 +81,78 @@ def external(
     return decorator  # type: ignore
 
 
+def lazy_import(name: str, package: str | None = None) -> Any:
+    """
+    Refer to module `name` lazily, it is imported on first use
+
+    Attributes of the reference are references too. They are resolved
+    when called, or when looked up as attributes of the class
+    they are assigned to, where they are replaced by the resolved value.
+    """
+    if package is not None:
+        module = sys.modules[package]
+        if module.__class__ is types.ModuleType:
+            module.__class__ = _LazyPackage
+    return _LazyReference(name, package, ())
+
+
+class _LazyPackage(types.ModuleType):
+    def __setattr__(self, name: str, value: Any) -> None:
+        # The import system binds a submodule to its package on import,
+        # keep the class of the same name defined in the package
+        if isinstance(value, types.ModuleType) and isinstance(
+            self.__dict__.get(name), type
+        ):
+            return
+        super().__setattr__(name, value)
+
+
+class _LazyReference:
+    __slots__ = ("__name", "__package", "__attributes", "__target")
+
+    def __init__(
+        self, name: str, package: str | None, attributes: tuple[str, ...]
+    ) -> None:
+        self.__name = name
+        self.__package = package
+        self.__attributes = attributes
+        self.__target: tuple[type[Any], str] | None = None
+
+    def __repr__(self) -> str:
+        name = ".".join((self.__name, *self.__attributes))
+        return f"<lazy reference {name!r} in {self.__package!r}>"
+
+    def __getattr__(self, name: str) -> _LazyReference:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _LazyReference(
+            self.__name, self.__package, (*self.__attributes, name)
+        )
+
+    def __set_name__(self, owner: type[Any], name: str) -> None:
+        self.__target = (owner, name)
+
+    def __get__(self, instance: Any, owner: type[Any] | None = None) -> Any:
+        value = self.__resolve()
+        if self.__target is not None:
+            setattr(*self.__target, value)
+        get = getattr(type(value), "__get__", None)
+        if get is None:
+            return value
+        return get(value, instance, owner)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.__resolve()(*args, **kwargs)
+
+    def __resolve(self) -> Any:
+        value: Any = import_module(self.__name, self.__package)
+        for attribute in self.__attributes:
+            value = getattr(value, attribute)
+            while isinstance(value, _LazyReference):
+                value = value.__resolve()
+        return value
+
+
 def _call(
     f: MethodType[P, T],
     funcname: str,
@@ -84,36 +162,155 @@ def _call(
     *args: P.args,
     **kwargs: P.kwargs,
 ) -> ReturnType[T]:
-    from .parser import parse, unparse
-
-    signature = inspect.signature(f)
-    type_hints = get_type_hints(f)
-
-    positional = {
-        k
-        for k, v in islice(signature.parameters.items(), 1, None)
-        if v.default is v.empty
-    }
-
-    def _iter_arguments() -> Generator[str, None, None]:
-        for key, value in signature.bind(
-            None, *args, **kwargs
-        ).arguments.items():
-            if value is None:
-                continue
-            name = rename.get(key, key)
-            literal = unparse(type_hints[key], value)
-
-            if len(positional) == 1 and key in positional:
-                yield f"{literal}"
+    plan = _CallPlan.get(f, funcname, rename)
+    interactive = self.__omc_interactive__
+
+    callbacks = _callbacks.get()
+    offload = getattr(interactive, "__omc_offload__", None)
+    if not callbacks and offload is None:
+        return fmap(
+            plan.parse, interactive.evaluate(plan.format(args, kwargs))
+        )
+
+    if offload is None:
+        unparse = partial(plan.format, args, kwargs)
+        evaluate, parse = interactive.evaluate, plan.parse
+    else:
+        # Large strings go through files, see `omc4py.offload`
+        call = offload(plan, args, kwargs, interactive)
+        unparse, evaluate, parse = call.unparse, call.evaluate, call.parse
+
+    if callbacks:
+        return _instrumented(  # type: ignore
+            callbacks, funcname, unparse, evaluate, parse
+        )
+    return fmap(parse, evaluate(unparse()))
+
+
+_call_plans: WeakKeyDictionary[Callable[..., Any], _CallPlan] = (
+    WeakKeyDictionary()
+)
+
+
+@dataclass(frozen=True)
+class _CallPlan:
+    """
+    Everything `_call` needs to know about an `external` function
+
+    Compiled once per function, on its first call,
+    because forward references in the type hints can't be resolved
+    while the defining module is still being executed.
+    """
+
+    funcname: str
+    signature: inspect.Signature
+    parameters: tuple[str, ...]
+    keywords: frozenset[str]
+    required: frozenset[str]
+    simple: bool
+    arguments: tuple[tuple[str, str, Callable[[Any], str]], ...]
+    strings: frozenset[str]
+    parse: Callable[[str], Any]
+
+    @classmethod
+    def get(
+        cls,
+        f: Callable[..., Any],
+        funcname: str,
+        rename: dict[str, str],
+    ) -> _CallPlan:
+        try:
+            return _call_plans[f]
+        except KeyError:
+            plan = _call_plans[f] = cls.compile(f, funcname, rename)
+            return plan
+
+    @classmethod
+    def compile(
+        cls,
+        f: Callable[..., Any],
+        funcname: str,
+        rename: dict[str, str],
+    ) -> _CallPlan:
+        from .parser import compile_parse, compile_unparse
+
+        signature = inspect.signature(f)
+        type_hints = get_type_hints(f)
+
+        parameters = tuple(islice(signature.parameters.values(), 1, None))
+        required = frozenset(
+            p.name for p in parameters if p.default is p.empty
+        )
+
+        def prefix(key: str) -> str:
+            if len(required) == 1 and key in required:
+                return ""
             else:
-                yield f"{name}={literal}"
+                return f"{rename.get(key, key)}="
+
+        return cls(
+            funcname=funcname,
+            signature=signature,
+            parameters=tuple(p.name for p in parameters),
+            keywords=frozenset(p.name for p in parameters),
+            required=required,
+            simple=all(p.kind is p.POSITIONAL_OR_KEYWORD for p in parameters),
+            arguments=tuple(
+                (p.name, prefix(p.name), compile_unparse(type_hints[p.name]))
+                for p in parameters
+            ),
+            strings=frozenset(
+                p.name for p in parameters if _is_string(type_hints[p.name])
+            ),
+            parse=compile_parse(type_hints["return"]),
+        )
+
+    def bind(
+        self, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> dict[str, Any]:
+        arguments = dict(zip(self.parameters, args))
+        arguments.update(kwargs)
+
+        if (
+            not self.simple
+            or len(self.parameters) < len(args)
+            or len(arguments) < len(args) + len(kwargs)
+            or not self.required.issubset(arguments)
+            or not self.keywords.issuperset(kwargs)
+        ):
+            # Let `inspect` reject (or accept) unusual calls
+            # with the same error as a call to the original function
+            bound = self.signature.bind(None, *args, **kwargs)
+            arguments = dict(islice(bound.arguments.items(), 1, None))
+
+        return arguments
+
+    def format(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+        arguments = self.bind(args, kwargs)
+        literals = ",".join(
+            prefix + unparse(value)
+            for key, prefix, unparse in self.arguments
+            if (value := arguments.get(key)) is not None
+        )
+        return f"{self.funcname}({literals})"
+
+    def format_with(
+        self, arguments: dict[str, Any], literals: dict[str, str]
+    ) -> str:
+        """`format` bound `arguments`, given `literals` of some of them"""
+        joined = ",".join(
+            prefix + (literals[key] if key in literals else unparse(value))
+            for key, prefix, unparse in self.arguments
+            if (value := arguments.get(key)) is not None
+        )
+        return f"{self.funcname}({joined})"
+
 
-    return fmap(
-        lambda x: parse(type_hints["return"], x),
-        self.__omc_interactive__.evaluate(
-            f"{funcname}({','.join(_iter_arguments())})"
-        ),
+def _is_string(type_hint: Any) -> bool:
+    """Whether `type_hint` is `str`, or `Union[str, None]`"""
+    return type_hint is str or (
+        get_origin(type_hint) is Union
+        and set(get_args(type_hint)) == {str, type(None)}
     )
 
 
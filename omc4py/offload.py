@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+__all__ = (
+    "OFFLOADED_FUNCTIONS",
+    "OffloadingInteractive",
+)
+
+import itertools
+import mmap
+import shutil
+import tempfile
+from contextlib import closing, suppress
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    FrozenSet,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .exception import OMCRuntimeError
+from .interactive import SETUP_FUNCTIONS
+from .protocol import Asynchronous, Calling, Synchronous, T_Calling
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from .modelica import _CallPlan
+    from .protocol import SupportsInteractive
+
+    Offload = Callable[
+        [_CallPlan, Tuple[Any, ...], Dict[str, Any], SupportsInteractive[Any]],
+        "_OffloadedCall",
+    ]
+
+#: Functions whose `String` result omc writes to a file
+OFFLOADED_FUNCTIONS: FrozenSet[str] = frozenset(
+    (
+        "getModelInstance",
+        "instantiateModel",
+        "list",
+        "listFile",
+        "readFile",
+    )
+)
+
+
+@dataclass(frozen=True, eq=False)
+class OffloadingInteractive(Generic[T_Calling]):
+    """
+    Interactive passing large strings to and from omc through files
+
+    `String` arguments of API calls over `threshold` characters
+    are written as such to a file in `directory`,
+    read by omc through `readFile(...)` in their place,
+    and kept until closed if given to `SETUP_FUNCTIONS`,
+    which a supervised session replays after a restart.
+    `String` results of `OFFLOADED_FUNCTIONS` are written to a file
+    by omc through `writeFile(...)`, and memory-mapped to be returned,
+    whatever their size: it is only known once omc has the result,
+    and these are the functions whose results run large.
+    Neither goes through the socket, nor is quoted or parsed.
+    Expressions given to `evaluate` go to omc unchanged.
+    Offloaded results skip a `CachedInteractive` around or under it,
+    being sent to omc as `writeFile(...)` calls.
+
+    omc must share the file system, i.e. run on the same machine.
+    """
+
+    interactive: SupportsInteractive[T_Calling]
+    threshold: int = 1 << 20
+    directory: Path = field(
+        default_factory=lambda: Path(tempfile.mkdtemp(prefix="omc4py-"))
+    )
+    _names: Iterator[int] = field(default_factory=itertools.count, repr=False)
+
+    def __enter__(self) -> Self:
+        return closing(self).__enter__()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return closing(self).__exit__(*exc_info)
+
+    def close(self) -> None:
+        try:
+            self.interactive.close()
+        finally:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    @property
+    def calling(self) -> T_Calling:
+        return self.interactive.calling
+
+    @property
+    def synchronous(self) -> OffloadingInteractive[Synchronous]:
+        if TYPE_CHECKING:
+            synchronous: OffloadingInteractive[Synchronous]
+        else:
+            synchronous = self
+        return replace(synchronous, interactive=self.interactive.synchronous)
+
+    @property
+    def asynchronous(self) -> OffloadingInteractive[Asynchronous]:
+        if TYPE_CHECKING:
+            asynchronous: OffloadingInteractive[Asynchronous]
+        else:
+            asynchronous = self
+        return replace(asynchronous, interactive=self.interactive.asynchronous)
+
+    def evaluate(self, expression: str) -> str | Coroutine[None, None, str]:
+        return self.interactive.evaluate(expression)
+
+    def __omc_offload__(
+        self,
+        plan: _CallPlan,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        interactive: SupportsInteractive[Any],
+    ) -> _OffloadedCall:
+        """
+        Unparse, evaluate and parse of an API call, by `_call`
+
+        Wrappers of this interactive forward it as a property,
+        evaluated through the outermost `interactive` of the session.
+        """
+        return _OffloadedCall(self, plan, args, kwargs, interactive)
+
+    def _file(self) -> Path:
+        return self.directory / f"{next(self._names)}.txt"
+
+
+@dataclass(eq=False)
+class _OffloadedCall:
+    """One API call through an `OffloadingInteractive`"""
+
+    offloading: OffloadingInteractive[Any]
+    plan: _CallPlan
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    interactive: SupportsInteractive[Any]
+    files: List[Path] = field(default_factory=list)
+    output: Optional[Path] = None
+    written: bool = False
+
+    def unparse(self) -> str:
+        from .parser import _quote_py_string
+
+        arguments = self.plan.bind(self.args, self.kwargs)
+        literals: Dict[str, str] = {}
+        threshold = self.offloading.threshold
+        try:
+            for key in self.plan.strings:
+                value = arguments.get(key)
+                if isinstance(value, str) and threshold < len(value):
+                    path = self._input()
+                    with path.open("w", encoding="utf-8", newline="") as file:
+                        file.write(value)
+                    literals[key] = (
+                        f"readFile({_quote_py_string(path.as_posix())})"
+                    )
+            expression = self.plan.format_with(arguments, literals)
+        except BaseException:
+            _remove(self.files)
+            raise
+
+        if self.plan.funcname in OFFLOADED_FUNCTIONS:
+            self.output = self._file()
+        return expression
+
+    def evaluate(self, expression: str) -> str | Coroutine[None, None, str]:
+        if self.interactive.calling is Calling.synchronous:
+            try:
+                return self._evaluate(expression)
+            finally:
+                _remove(self.files)
+        return self._aevaluate(expression)
+
+    def parse(self, reply: str) -> Any:
+        if self.written:
+            return reply  # the content of the file
+        return self.plan.parse(reply)
+
+    def _evaluate(self, expression: str) -> str:
+        interactive = self.interactive.synchronous
+        if self.output is None:
+            return interactive.evaluate(expression)
+        written = interactive.evaluate(_write_file(self.output, expression))
+        if written.rstrip() != "true":
+            error = interactive.evaluate("getErrorString()")
+            raise _unwritten(self.output, error)
+        return self._read(self.output)
+
+    async def _aevaluate(self, expression: str) -> str:
+        interactive = self.interactive.asynchronous
+        try:
+            if self.output is None:
+                return await interactive.evaluate(expression)
+            written = await interactive.evaluate(
+                _write_file(self.output, expression)
+            )
+            if written.rstrip() != "true":
+                error = await interactive.evaluate("getErrorString()")
+                raise _unwritten(self.output, error)
+            return self._read(self.output)
+        finally:
+            _remove(self.files)
+
+    def _file(self) -> Path:
+        path = self.offloading._file()  # noqa: SLF001
+        self.files.append(path)
+        return path
+
+    def _input(self) -> Path:
+        if self.plan.funcname in SETUP_FUNCTIONS:
+            # Replayed by a supervised omc after a restart: keep it
+            return self.offloading._file()  # noqa: SLF001
+        return self._file()
+
+    def _read(self, path: Path) -> str:
+        self.written = True
+        with path.open("rb") as file:
+            if not path.stat().st_size:
+                return ""  # empty files can't be mapped
+            with mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped:
+                return str(mapped, "utf-8")
+
+
+def _write_file(path: Path, expression: str) -> str:
+    from .parser import _quote_py_string
+
+    return f"writeFile({_quote_py_string(path.as_posix())}, {expression})"
+
+
+def _unwritten(path: Path, error: str) -> OMCRuntimeError:
+    from .parser import _unquote_modelica_string
+
+    message = _unquote_modelica_string(error.strip()).strip()
+    return OMCRuntimeError(f"omc did not write {path}: {message}")
+
+
+def _remove(files: List[Path]) -> None:
+    for path in files:
+        with suppress(FileNotFoundError):
+            path.unlink()
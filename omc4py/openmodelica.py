@@ -1,18 +1,29 @@
 from __future__ import annotations
 
-__all__ = ("Component", "TypeName", "VariableName")
+__all__ = ("Component", "ComponentTable", "TypeName", "VariableName")
 
 import itertools
+import re
+from array import array
 from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
+    ClassVar,
+    Dict,
     List,
     Literal,
     NamedTuple,
+    Sequence,
+    Tuple,
     TypeVar,
     Union,
+    overload,
 )
+from weakref import WeakValueDictionary
 
 if TYPE_CHECKING:
     from typing_extensions import Self
@@ -46,6 +57,58 @@ VariableNameLike = Union[
 TypeNameLike = VariableNameLike
 
 
+# Unquoted identifiers are recognized without the parser,
+# the parser handles quoted identifiers, white spaces and errors
+
+_IDENT = r"(?:[A-Z_a-z][0-9A-Z_a-z]*|\$[0-9A-Z_a-z]*)"
+_IDENT_PATTERN = re.compile(_IDENT)
+_TYPENAME_PATTERN = re.compile(rf"\.?{_IDENT}(?:\.{_IDENT})*")
+
+# Same as `modelicalang.v3_4.Syntax._keywords_`
+_KEYWORDS = frozenset(
+    (
+        "algorithm", "and", "annotation", "block", "break", "class",
+        "connect", "connector", "constant", "constrainedby", "der",
+        "discrete", "each", "else", "elseif", "elsewhen", "encapsulated",
+        "end", "enumeration", "equation", "expandable", "extends",
+        "external", "false", "final", "flow", "for", "function", "if",
+        "import", "impure", "in", "initial", "inner", "input", "loop",
+        "model", "not", "operator", "or", "outer", "output", "package",
+        "parameter", "partial", "protected", "public", "pure", "record",
+        "redeclare", "replaceable", "return", "stream", "then", "true",
+        "type", "when", "while", "within",
+    )
+)  # fmt: skip
+
+
+@lru_cache(maxsize=65536)
+def _split_typename(typename: str) -> Tuple[str, ...]:
+    if _TYPENAME_PATTERN.fullmatch(typename) is not None:
+        if typename.startswith("."):
+            parts = (".", *typename[1:].split("."))
+        else:
+            parts = tuple(typename.split("."))
+        if _KEYWORDS.isdisjoint(parts):
+            return parts
+
+    from .parser import split_typename_parts
+
+    return split_typename_parts(typename)
+
+
+@lru_cache(maxsize=65536)
+def _is_variablename(variablename: str) -> bool:
+    if (
+        _IDENT_PATTERN.fullmatch(variablename) is not None
+        and variablename not in _KEYWORDS
+    ):
+        return True
+
+    from .parser import is_variablename
+
+    return is_variablename(variablename)
+
+
 # $Code classes OpenModelica.$Code.{VariableName, TypeName}
 
 
@@ -82,8 +145,6 @@ class _BaseVariableName:
 
 class VariableName(_BaseVariableName):
     def __new__(cls, obj: VariableNameLike | None = None) -> Self:
-        from .parser import is_variablename
-
         if obj is None:
             return _BaseVariableName.__new__(cls)
 
@@ -100,7 +161,7 @@ class VariableName(_BaseVariableName):
                 f"got {obj!r}: {type(obj)}"
             )
 
-        if not is_variablename(identifier):
+        if not _is_variablename(identifier):
             raise ValueError(
                 f"Invalid modelica identifier, got {identifier!r}"
             )
@@ -109,14 +170,23 @@ class VariableName(_BaseVariableName):
 
 
 class _BaseTypeName:
-    __slots__ = ("parts",)
+    __slots__ = ("parts", "__parents", "__weakref__")
 
     parts: tuple[str, ...]
+    __parents: tuple[Self, ...]
 
     def __new__(cls, parts: tuple[str, ...] = ()) -> Self:
-        self = super().__new__(cls)
-        self.parts = parts
-        return self
+        # Interned, equal names share an instance (and its `parents`)
+        key = (cls, parts)
+        self = _typenames.get(key)
+        if self is None:
+            self = super().__new__(cls)
+            self.parts = parts
+            self = _typenames.setdefault(key, self)
+        return self  # type: ignore
+
+    def __reduce__(self) -> tuple[type[Self], tuple[str, ...]]:
+        return type(self), self.parts
 
     @property
     def is_absolute(self) -> bool:
@@ -133,17 +203,22 @@ class _BaseTypeName:
         if self.parts in {(), (".",)}:
             return VariableName()
         else:
-            return VariableName(self.parts[-1])
+            return _BaseVariableName.__new__(VariableName, self.parts[-1])
 
     @property
     def parents(self) -> tuple[Self, ...]:
-        return tuple(
-            _BaseTypeName.__new__(
-                type(self),
-                self.parts[:end],
-            )
-            for end in range(1 if self.is_absolute else 0, len(self.parts))
-        )[::-1]
+        try:
+            return self.__parents
+        except AttributeError:
+            pass
+
+        if len(self.parts) <= self.is_absolute:
+            parents: tuple[Self, ...] = ()
+        else:
+            parent = _BaseTypeName.__new__(type(self), self.parts[:-1])
+            parents = (parent, *parent.parents)
+        self.__parents = parents
+        return parents
 
     @property
     def parent(self) -> Self:
@@ -156,7 +231,9 @@ class _BaseTypeName:
         return hash(self.parts)
 
     def __eq__(self, other: Any) -> bool:
-        return isinstance(other, _BaseTypeName) and self.parts == other.parts
+        return self is other or (
+            isinstance(other, _BaseTypeName) and self.parts == other.parts
+        )
 
     def __repr__(self) -> str:
         if not self.parts:
@@ -179,6 +256,8 @@ class TypeName(_BaseTypeName):
             (part,) = parts
             if isinstance(part, cls):
                 return part
+            if isinstance(part, str) and part != ".":
+                return _BaseTypeName.__new__(cls, _split_typename(part))
 
         return _BaseTypeName.__new__(cls, tuple(TypeName.__split_parts(parts)))
 
@@ -193,8 +272,6 @@ class TypeName(_BaseTypeName):
 
     @staticmethod
     def __split_part(part: TypeNameLike) -> Iterator[str]:
-        from .parser import split_typename_parts
-
         if isinstance(part, TypeName):
             yield from part.parts
         elif isinstance(part, VariableName):
@@ -203,9 +280,185 @@ class TypeName(_BaseTypeName):
             if part == ".":
                 yield part
             else:
-                yield from split_typename_parts(part)
+                yield from _split_typename(part)
         else:
             raise TypeError(f"Unexpected part, got {part}: {type(part)}")
 
     def __truediv__(self, other: TypeNameLike) -> Self:
+        if isinstance(other, str) and not other.startswith("."):
+            parts = self.parts + _split_typename(other)
+            return _BaseTypeName.__new__(type(self), parts)
         return type(self)(self, other)
+
+
+_typenames: WeakValueDictionary[
+    tuple[type[_BaseTypeName], tuple[str, ...]], _BaseTypeName
+] = WeakValueDictionary()
+
+
+# Columnar `getComponents`
+
+
+@dataclass(frozen=True)
+class ComponentTable(Sequence[Component]):
+    """
+    Result of `getComponents` as columns, one row per component
+
+    Class names are interned into `classNames` and referred by
+    `classIndex`, booleans are packed into `flags` and enumerated strings
+    are coded as indices of `VARIABILITIES` etc.
+    `table[i]` materializes a `Component` on demand.
+    """
+
+    FINAL: ClassVar[int] = 1
+    FLOW: ClassVar[int] = 2
+    STREAM: ClassVar[int] = 4
+    REPLACEABLE: ClassVar[int] = 8
+    PROTECTED: ClassVar[int] = 16
+
+    VARIABILITIES: ClassVar[Tuple[str, ...]] = (
+        "constant",
+        "parameter",
+        "discrete",
+        "unspecified",
+    )
+    INNER_OUTERS: ClassVar[Tuple[str, ...]] = ("inner", "outer", "none")
+    INPUT_OUTPUTS: ClassVar[Tuple[str, ...]] = (
+        "input",
+        "output",
+        "unspecified",
+    )
+
+    classNames: List[TypeName] = field(default_factory=list)
+    classIndex: array[int] = field(default_factory=lambda: array("I"))
+    name: List[str] = field(default_factory=list)
+    comment: List[str] = field(default_factory=list)
+    flags: array[int] = field(default_factory=lambda: array("B"))
+    variability: array[int] = field(default_factory=lambda: array("B"))
+    innerOuter: array[int] = field(default_factory=lambda: array("B"))
+    inputOutput: array[int] = field(default_factory=lambda: array("B"))
+    dimensions: List[Tuple[str, ...]] = field(default_factory=list)
+
+    @classmethod
+    def from_components(cls, components: Iterable[Component]) -> Self:
+        self = cls()
+        append = self._appender()
+        for component in components:
+            append(
+                component.className.parts,
+                str(component.name),
+                component.comment,
+                component.protected,
+                component.isFinal,
+                component.isFlow,
+                component.isStream,
+                component.isReplaceable,
+                component.variability,
+                component.innerOuter,
+                component.inputOutput,
+                component.dimensions,
+            )
+        return self
+
+    def _appender(self) -> Callable[..., None]:
+        """Append a row of decoded fields, used while decoding"""
+        class_indices = {
+            typename.parts: i for i, typename in enumerate(self.classNames)
+        }
+        variabilities = _Codes("variability", self.VARIABILITIES)
+        inner_outers = _Codes("innerOuter", self.INNER_OUTERS)
+        input_outputs = _Codes("inputOutput", self.INPUT_OUTPUTS)
+
+        def append(  # noqa: PLR0913
+            className: tuple[str, ...],
+            name: str,
+            comment: str,
+            protected: str,
+            isFinal: bool,
+            isFlow: bool,
+            isStream: bool,
+            isReplaceable: bool,
+            variability: str,
+            innerOuter: str,
+            inputOutput: str,
+            dimensions: Iterable[str],
+        ) -> None:
+            # Codes first, not to append part of a row before failing
+            codes = (
+                variabilities[variability],
+                inner_outers[innerOuter],
+                input_outputs[inputOutput],
+            )
+            index = class_indices.get(className)
+            if index is None:
+                index = class_indices[className] = len(self.classNames)
+                self.classNames.append(TypeName(*className))
+            self.classIndex.append(index)
+            self.name.append(name)
+            self.comment.append(comment)
+            self.flags.append(
+                isFinal * self.FINAL
+                | isFlow * self.FLOW
+                | isStream * self.STREAM
+                | isReplaceable * self.REPLACEABLE
+                | (protected == "protected") * self.PROTECTED
+            )
+            self.variability.append(codes[0])
+            self.innerOuter.append(codes[1])
+            self.inputOutput.append(codes[2])
+            self.dimensions.append(tuple(dimensions))
+
+        return append
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    @overload
+    def __getitem__(self, index: int) -> Component: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Component]: ...
+
+    def __getitem__(self, index: int | slice) -> Component | List[Component]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        flags = self.flags[index]
+        return Component(
+            className=self.classNames[self.classIndex[index]],
+            name=_BaseVariableName.__new__(VariableName, self.name[index]),
+            comment=self.comment[index],
+            protected="protected" if flags & self.PROTECTED else "public",
+            isFinal=bool(flags & self.FINAL),
+            isFlow=bool(flags & self.FLOW),
+            isStream=bool(flags & self.STREAM),
+            isReplaceable=bool(flags & self.REPLACEABLE),
+            variability=self.VARIABILITIES[  # type: ignore
+                self.variability[index]
+            ],
+            innerOuter=self.INNER_OUTERS[  # type: ignore
+                self.innerOuter[index]
+            ],
+            inputOutput=self.INPUT_OUTPUTS[  # type: ignore
+                self.inputOutput[index]
+            ],
+            dimensions=list(self.dimensions[index]),
+        )
+
+    def where(self, flag: int) -> List[int]:
+        """Return indices of rows with any of `flag`, e.g. `table.FLOW`"""
+        return [i for i, flags in enumerate(self.flags) if flags & flag]
+
+
+class _Codes(Dict[str, int]):
+    """Code of each label of a `ComponentTable` column"""
+
+    def __init__(self, column: str, labels: tuple[str, ...]) -> None:
+        super().__init__((label, code) for code, label in enumerate(labels))
+        self.column = column
+
+    def __missing__(self, label: str) -> int:
+        raise ValueError(
+            f"Unknown {self.column} {label!r} of a component, "
+            f"expected one of {tuple(self)}"
+        )
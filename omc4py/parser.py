@@ -1,32 +1,36 @@
 from __future__ import annotations
 
 import re
+import sys
 import types
 from collections import ChainMap
 from collections.abc import (
     Callable,
     Coroutine,
     Generator,
-    Iterable,
+    Hashable,
     Mapping,
     Sequence,
 )
-from contextlib import suppress
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
 from dataclasses import dataclass
 from enum import Enum
-from functools import lru_cache, partial, reduce
+from functools import lru_cache, partial
 from itertools import chain
 from typing import (
     TYPE_CHECKING,
     Any,
     ClassVar,
     DefaultDict,
+    List,
     Literal,
     Set,
     Tuple,
     Type,
     TypeVar,
     Union,
+    cast,
     get_args,
     get_origin,
     get_type_hints,
@@ -54,6 +58,7 @@ from .exception import OMCError, OMCRuntimeError, OMCWarning
 from .modelica import enumeration, record
 from .openmodelica import (
     Component,
+    ComponentTable,
     TypeName,
     VariableName,
     _BaseTypeName,
@@ -172,25 +177,46 @@ def is_variablename(variablename: str) -> bool:
 
 
 def parse(typ: Any, s: str) -> Any:
+    return compile_parse(typ)(s)
+
+
+def compile_parse(typ: Any) -> Callable[[str], Any]:
+    if _is_ndarray(typ):
+        return partial(_parse_ndarray, _get_dtype(typ), None, None)
+    if ComponentTable in set(_unpack(typ)):
+        return partial(_parse_component_table, compile_parse(List[Component]))
+
     root_type = _get_type(typ)
     root_ndim = _get_ndim(typ)
-    with _ParametrizedSyntax:
-        parser = _ParametrizedSyntax.get_parser(
-            root_type=root_type,  # type: ignore
-            root_ndim=root_ndim,
-        )
-    visitor = _ParametrizedVisistor.get_visitor(
-        root_type=root_type,  # type: ignore
-        root_ndim=root_ndim,
+    parse = partial(
+        _parse,
+        root_type,
+        root_ndim,
+        _get_decoder(root_type, root_ndim),  # type: ignore
     )
-    if re.search(r"^Error($| occurred )", s) is not None:
-        raise OMCError(s)
+
+    if 0 < root_ndim and root_type in (float, int):
+        return partial(_parse_numeric, parse, root_type, root_ndim)
+    else:
+        return parse
+
+
+@contextmanager
+def ndarray_decoding(*, enabled: bool = True) -> Generator[None, None, None]:
+    """
+    Decode `Real[:]`, `Integer[:,:]`... results into `numpy.ndarray`
+
+    Effective in the current context (thread or asyncio task),
+    requires numpy. Ragged arrays are decoded into lists as without it.
+    """
+    if enabled:
+        import numpy as np  # noqa: F401
+
+    token = _ndarray_decoding.set(enabled)
     try:
-        parse_tree = parser.parse(s)
-    except NoMatch as no_match:
-        warn(OMCWarning(f"{no_match}"))
-        raise OMCRuntimeError(s) from None
-    return visit_parse_tree(parse_tree, visitor)
+        yield
+    finally:
+        _ndarray_decoding.reset(token)
 
 
 def split_typename_parts(typename: str) -> tuple[str, ...]:
@@ -206,7 +232,22 @@ def split_typename_parts(typename: str) -> tuple[str, ...]:
 
 
 def unparse(typ: Any, obj: Any) -> str:
-    return _unparse(_get_type(typ), _get_ndim(typ), (), obj)
+    try:
+        compiled = _cached_unparse(typ)
+    except TypeError:  # unhashable type hint
+        compiled = compile_unparse(typ)
+    return compiled(obj)
+
+
+def compile_unparse(typ: Any) -> Callable[[Any], str]:
+    root_type = _get_type(typ)
+    root_ndim = _get_ndim(typ)
+    return partial(
+        _unparse_compiled,
+        _compile_unparse(root_type, root_ndim),  # type: ignore
+        root_type,
+        root_ndim,
+    )
 
 
 # endregion
@@ -216,6 +257,38 @@ def unparse(typ: Any, obj: Any) -> str:
 # region parse Implementation
 
 
+def _parse(
+    root_type: _ScalarType,
+    root_ndim: int,
+    decoder: _Decoder | None,
+    s: str,
+) -> Any:
+    if re.search(r"^Error($| occurred )", s) is not None:
+        raise OMCError(s)
+
+    if decoder is not None:
+        with suppress(_Unsupported):
+            return _decode(decoder, s)
+
+    # Types are hashable, which mypy doesn't know of their union
+    hashable_type = cast(Hashable, root_type)
+    with _ParametrizedSyntax:
+        parser = _ParametrizedSyntax.get_parser(
+            root_type=hashable_type,
+            root_ndim=root_ndim,
+        )
+    visitor = _ParametrizedVisistor.get_visitor(
+        root_type=hashable_type,
+        root_ndim=root_ndim,
+    )
+    try:
+        parse_tree = parser.parse(s)
+    except NoMatch as no_match:
+        warn(OMCWarning(f"{no_match}"))
+        raise OMCRuntimeError(s) from None
+    return visit_parse_tree(parse_tree, visitor)
+
+
 @dataclass
 class _ParametrizedSyntax(Syntax):
     root_type: _ScalarType
@@ -526,6 +599,612 @@ def _runtime_method(
     return decorator
 
 
+# endregion
+
+# region fast parse Implementation
+
+
+class _Unsupported(Exception):
+    pass
+
+
+if TYPE_CHECKING:
+    _Decoder = Callable[[str, int], Tuple[Any, int]]
+
+
+def _decode(decoder: _Decoder, s: str) -> Any:
+    value, pos = decoder(s, 0)
+    if _Lexicon.get().whitespaces.match(s, pos).end() != len(s):  # type: ignore
+        raise _Unsupported
+    return value
+
+
+def _parse_component_table(
+    parse_components: Callable[[str], list[Component]], s: str
+) -> ComponentTable:
+    # A code missing from `ComponentTable` raises `ValueError`
+    if re.search(r"^Error($| occurred )", s) is None:
+        with suppress(_Unsupported):
+            return cast(
+                ComponentTable,
+                _decode(_Lexicon.get().component_table, s),
+            )
+    return ComponentTable.from_components(parse_components(s))
+
+
+@lru_cache(None)
+def _get_decoder(_type: _ScalarType, ndim: int) -> _Decoder | None:
+    try:
+        return _compile_decoder(_type, ndim)
+    except _Unsupported:
+        return None
+
+
+def _compile_decoder(_type: _ScalarType, ndim: int) -> _Decoder:
+    lexicon = _Lexicon.get()
+
+    if 0 < ndim:
+        if _type is None:
+            raise _Unsupported
+        return lexicon.repeat("{", _compile_decoder(_type, ndim - 1), "}")
+    elif _type is None:
+        return lexicon.none
+    elif _type in lexicon.primitives:
+        return lexicon.primitives[_type]
+    elif issubclass(_type, record):
+        return lexicon.record(
+            _type,
+            {
+                attr: _compile_decoder(tt, nn)
+                for attr, (tt, nn) in _iter_attribute_types(_type)
+            },
+        )
+    elif issubclass(_type, enumeration):
+        return lexicon.enumeration(_type)
+    elif _is_named_tuple(_type):
+        return lexicon.fixed(
+            "(",
+            [
+                _compile_decoder(tt, nn)
+                for _, (tt, nn) in _iter_attribute_types(_type)
+            ],
+            ")",
+            _type._make,  # type: ignore
+        )
+    else:
+        raise _Unsupported
+
+
+_WHITESPACES = r"[\t\n\r ]*"
+
+# `Syntax.STRING` unrolled, not to keep a backtracking state per character,
+# and possessive where supported, nor per escape sequence
+if sys.version_info < (3, 11):
+    _STRING = r'"[^"\\]*(?:\\[\'"?\\abfnrtv][^"\\]*)*"'
+else:
+    _STRING = r'"[^"\\]*+(?:\\[\'"?\\abfnrtv][^"\\]*+)*+"'
+
+
+class _Lexicon:
+    """
+    Hand-written decoders of omc literals
+
+    Each decoder takes `(s, pos)`, skips leading whitespaces as arpeggio does
+    and returns the value with the position just after it.
+    `_Unsupported` is raised for anything left to the PEG parser.
+    """
+
+    def __init__(self) -> None:
+        with _ParametrizedSyntax:
+            keywords = "|".join(Syntax._keywords_)
+            q_ident = Syntax.Q_IDENT().to_match
+            unsigned_number = Syntax.UNSIGNED_NUMBER().to_match
+            unsigned_integer = Syntax.UNSIGNED_INTEGER().to_match
+
+        ident = (
+            rf"(?!(?:{keywords})(?![0-9A-Z_a-z]))"
+            rf"(?:[A-Z_a-z][0-9A-Z_a-z]*|{q_ident})"
+            r"|\$\w*"
+        )
+
+        self.whitespaces = re.compile(_WHITESPACES)
+        self._real = re.compile(
+            rf"{_WHITESPACES}([+-]?){_WHITESPACES}({unsigned_number})"
+        )
+        self._integer = re.compile(
+            rf"{_WHITESPACES}([+-]?){_WHITESPACES}({unsigned_integer})"
+        )
+        self._boolean = re.compile(
+            rf"{_WHITESPACES}(true|false)(?![0-9A-Z_a-z])"
+        )
+        self._string = re.compile(rf"{_WHITESPACES}({_STRING})")
+        self._ident = re.compile(rf"{_WHITESPACES}({ident})")
+        self._dot = re.compile(rf"{_WHITESPACES}\.")
+        self._dimension = re.compile(rf"{_WHITESPACES}(:|{unsigned_integer})")
+        self._record = re.compile(rf"{_WHITESPACES}record(?![0-9A-Z_a-z])")
+        self._end = re.compile(rf"{_WHITESPACES}end(?![0-9A-Z_a-z])")
+        self._find_open_brace = _finder("{")
+        self._find_close_brace = _finder("}")
+        self._find_comma = _finder(",")
+        self._find_comma_or_close_brace = _finder("[,}]")
+        self._dimensions = self.repeat("{", self.subscript, "}")
+
+        self.primitives: dict[_ScalarType, _Decoder] = {
+            float: self.real,
+            int: self.integer,
+            bool: self.boolean,
+            str: self.string,
+            TypeName: self.typename,
+            VariableName: self.variablename,
+            Component: self.fixed(
+                "{",
+                [
+                    self.typename,  # className
+                    self.variablename,  # name
+                    self.string,  # comment
+                    self.string,  # protected
+                    self.boolean,  # isFinal
+                    self.boolean,  # isFlow
+                    self.boolean,  # isStream
+                    self.boolean,  # isReplaceable
+                    self.string,  # variability
+                    self.string,  # innerOuter
+                    self.string,  # inputOutput
+                    self._dimensions,  # dimensions
+                ],
+                "}",
+                Component._make,
+            ),
+        }
+
+    @classmethod
+    @lru_cache(None)
+    def get(cls) -> _Lexicon:
+        return cls()
+
+    def none(self, s: str, pos: int) -> tuple[None, int]:  # noqa: ARG002
+        return None, pos
+
+    def real(self, s: str, pos: int) -> tuple[float, int]:
+        matched = _match(self._real, s, pos)
+        sign, number = matched.group(1, 2)
+        value = float(number)
+        return (-value if sign == "-" else value), matched.end()
+
+    def integer(self, s: str, pos: int) -> tuple[int, int]:
+        matched = _match(self._integer, s, pos)
+        sign, number = matched.group(1, 2)
+        value = int(number)
+        return (-value if sign == "-" else value), matched.end()
+
+    def boolean(self, s: str, pos: int) -> tuple[bool, int]:
+        matched = _match(self._boolean, s, pos)
+        return matched.group(1) == "true", matched.end()
+
+    def string(self, s: str, pos: int) -> tuple[str, int]:
+        matched = _match(self._string, s, pos)
+        literal = matched.group(1)
+        if "\\" not in literal:  # nothing to unescape
+            return literal[1:-1], matched.end()
+        return _unquote_modelica_string(literal), matched.end()
+
+    def typename(self, s: str, pos: int) -> tuple[TypeName, int]:
+        parts, pos = self.parts(s, pos)
+        return _BaseTypeName.__new__(TypeName, parts), pos
+
+    def variablename(self, s: str, pos: int) -> tuple[VariableName, int]:
+        matched = _match(self._ident, s, pos)
+        identifier = matched.group(1)
+        return _BaseVariableName.__new__(
+            VariableName, identifier
+        ), matched.end()
+
+    def parts(self, s: str, pos: int) -> tuple[tuple[str, ...], int]:
+        parts: list[str] = []
+
+        dot = self._dot.match(s, pos)
+        if dot is not None:
+            parts.append(".")
+            pos = dot.end()
+
+        matched = _match(self._ident, s, pos)
+        while True:
+            parts.append(matched.group(1))
+            pos = matched.end()
+            dot = self._dot.match(s, pos)
+            if dot is None:
+                break
+            matched = self._ident.match(s, dot.end())  # type: ignore
+            if matched is None:
+                break
+
+        return tuple(parts), pos
+
+    def subscript(self, s: str, pos: int) -> tuple[str, int]:
+        # Only ":", integer and name; any other expression is left to PEG
+        matched = self._dimension.match(s, pos)
+        if matched is not None:
+            return matched.group(1), matched.end()
+        parts, pos = self.parts(s, pos)
+        return str(_BaseTypeName.__new__(TypeName, parts)), pos
+
+    def repeat(self, open_: str, element: _Decoder, close: str) -> _Decoder:
+        """Decode `open_ [element {, element}] close` into list"""
+        find_open = _finder(open_)
+        find_close = _finder(close)
+        find_separator_or_close = _finder(f"[,{re.escape(close)}]")
+
+        def decode(s: str, pos: int) -> tuple[list[Any], int]:
+            pos = find_open(s, pos)
+            values: list[Any] = []
+
+            with suppress(_Unsupported):
+                return values, find_close(s, pos)
+
+            while True:
+                value, pos = element(s, pos)
+                values.append(value)
+                pos = find_separator_or_close(s, pos)
+                if s[pos - 1] == close:
+                    return values, pos
+
+        return decode
+
+    def fixed(
+        self,
+        open_: str,
+        elements: list[_Decoder],
+        close: str,
+        make: Callable[[list[Any]], Any],
+    ) -> _Decoder:
+        """Decode `open_ element, ..., element close` by `make`"""
+        find_open = _finder(open_)
+        finders = [_finder(",")] * (len(elements) - 1) + [_finder(close)]
+        pairs = list(zip(elements, finders))
+
+        def decode(s: str, pos: int) -> tuple[Any, int]:
+            pos = find_open(s, pos)
+            values: list[Any] = []
+            for element, find in pairs:
+                value, pos = element(s, pos)
+                values.append(value)
+                pos = find(s, pos)
+            return make(values), pos
+
+        return decode
+
+    def record(
+        self, record_type: type[record], attributes: dict[str, _Decoder]
+    ) -> _Decoder:
+        parent = record_type.__omc_class__.parent
+        class_name = record_type.__omc_class__.last_identifier
+        name = re.compile(rf"{_WHITESPACES}({parent}\.)?{class_name}")
+        keys = [
+            (
+                attr,
+                re.compile(rf"{_WHITESPACES}_*{attr}_*", re.IGNORECASE),
+                decoder,
+            )
+            for attr, decoder in attributes.items()
+        ]
+        find_equal = _finder("=")
+        find_comma = _finder(",")
+        find_semicolon = _finder(";")
+
+        def decode(s: str, pos: int) -> tuple[record, int]:
+            pos = _match(self._record, s, pos).end()
+            pos = _match(name, s, pos).end()
+
+            values: dict[str, Any] = {}
+            while len(values) < len(keys):
+                if values:
+                    pos = find_comma(s, pos)
+
+                for attr, key, decoder in keys:
+                    if attr in values:
+                        continue
+                    matched = key.match(s, pos)
+                    if matched is None:
+                        continue
+                    with suppress(_Unsupported):
+                        end = find_equal(s, matched.end())
+                        values[attr], pos = decoder(s, end)
+                        break
+                else:
+                    raise _Unsupported
+
+            pos = _match(self._end, s, pos).end()
+            pos = _match(name, s, pos).end()
+            pos = find_semicolon(s, pos)
+
+            return record_type(**values), pos
+
+        return decode
+
+    def enumeration(self, enumeration_type: type[enumeration]) -> _Decoder:
+        pattern = re.compile(
+            rf"{_WHITESPACES}\.?{_WHITESPACES}"
+            + re.escape(f"{enumeration_type.__omc_class__}.")
+            + rf"{_WHITESPACES}("
+            + "|".join(re.escape(e.name) for e in enumeration_type)
+            + ")"
+        )
+
+        def decode(s: str, pos: int) -> tuple[enumeration, int]:
+            matched = _match(pattern, s, pos)
+            return enumeration_type[matched.group(1)], matched.end()
+
+        return decode
+
+    def component_table(self, s: str, pos: int) -> tuple[ComponentTable, int]:
+        """Decode `{component, ...}` into columns, without `Component`"""
+        table = ComponentTable()
+        append = table._appender()
+        find_open = self._find_open_brace
+        find_comma = self._find_comma
+        find_close = self._find_close_brace
+        find_comma_or_close = self._find_comma_or_close_brace
+        string = self.string
+        boolean = self.boolean
+        dimensions = self._dimensions
+
+        pos = find_open(s, pos)
+        with suppress(_Unsupported):
+            return table, find_close(s, pos)
+
+        while True:
+            className, pos = self.parts(s, find_open(s, pos))
+            name = _match(self._ident, s, find_comma(s, pos))
+            comment, pos = string(s, find_comma(s, name.end()))
+            protected, pos = string(s, find_comma(s, pos))
+            isFinal, pos = boolean(s, find_comma(s, pos))
+            isFlow, pos = boolean(s, find_comma(s, pos))
+            isStream, pos = boolean(s, find_comma(s, pos))
+            isReplaceable, pos = boolean(s, find_comma(s, pos))
+            variability, pos = string(s, find_comma(s, pos))
+            innerOuter, pos = string(s, find_comma(s, pos))
+            inputOutput, pos = string(s, find_comma(s, pos))
+            subscripts, pos = dimensions(s, find_comma(s, pos))
+            pos = find_close(s, pos)
+            append(
+                className,
+                name.group(1),
+                comment,
+                protected,
+                isFinal,
+                isFlow,
+                isStream,
+                isReplaceable,
+                variability,
+                innerOuter,
+                inputOutput,
+                subscripts,
+            )
+
+            pos = find_comma_or_close(s, pos)
+            if s[pos - 1] == "}":
+                return table, pos
+
+
+def _match(pattern: re.Pattern[str], s: str, pos: int) -> re.Match[str]:
+    matched = pattern.match(s, pos)
+    if matched is None:
+        raise _Unsupported
+    return matched
+
+
+def _finder(chars: str) -> Callable[[str, int], int]:
+    if not chars.startswith("["):
+        chars = re.escape(chars)
+    pattern = re.compile(f"{_WHITESPACES}{chars}")
+
+    def find(s: str, pos: int) -> int:
+        return _match(pattern, s, pos).end()
+
+    return find
+
+
+# endregion
+
+# region ndarray Implementation
+
+_ndarray_decoding: ContextVar[bool] = ContextVar(
+    "_ndarray_decoding", default=False
+)
+
+
+def _parse_numeric(
+    parse: Callable[[str], Any],
+    root_type: type[float] | type[int],
+    root_ndim: int,
+    s: str,
+) -> Any:
+    if not _ndarray_decoding.get():
+        return parse(s)
+
+    import numpy as np
+
+    return _parse_ndarray(
+        np.float64 if root_type is float else np.int64,
+        root_ndim,
+        parse,
+        s,
+    )
+
+
+def _parse_ndarray(
+    dtype: Any,
+    ndim: int | None,
+    fallback: Callable[[str], Any] | None,
+    s: str,
+) -> Any:
+    import numpy as np
+
+    if re.search(r"^Error($| occurred )", s) is not None:
+        raise OMCError(s)
+
+    try:
+        return _decode_ndarray(dtype, ndim, s)
+    except _Unsupported:
+        if fallback is None:
+            raise OMCRuntimeError(s) from None
+        decoded = fallback(s)
+        try:
+            return np.array(decoded, dtype=dtype)
+        # ragged, e.g. `{{1,2},{3}}`, or integers over `np.int64`
+        except (ValueError, OverflowError):
+            return decoded
+
+
+def _decode_ndarray(dtype: Any, ndim: int | None, s: str) -> Any:
+    """
+    Decode `{...}` of numbers into `np.ndarray` without python objects
+
+    Structure (depth, rectangularity) is checked on the raw bytes,
+    then all numbers are converted by a single `np.fromstring`.
+    """
+    import numpy as np
+
+    try:
+        original = s.encode("ascii")
+    except UnicodeEncodeError:
+        raise _Unsupported from None
+
+    # Numbers as the PEG parser reads them: not `nan`, `inf` nor `.5`
+    # (the rest of malformed numbers is rejected by `np.fromstring`)
+    # and integers of up to 18 digits, which `np.int64` holds exactly
+    table, integer = _number_syntax(dtype)
+    raw = np.frombuffer(original, dtype=np.uint8)
+    if not table[raw].all():
+        raise _Unsupported
+    digits = (raw >= ord("0")) & (raw <= ord("9"))
+    dots = raw == ord(".")
+    if dots[0] or (dots[1:] & ~digits[:-1]).any():
+        raise _Unsupported
+    if integer:
+        runs = np.diff(np.flatnonzero(~digits)) - 1
+        if runs.size and 18 < runs.max():
+            raise _Unsupported
+
+    data = original.translate(None, b" \t\n\r")
+    if not data:
+        raise _Unsupported
+
+    chars = np.frombuffer(data, dtype=np.uint8)
+    opens = chars == ord("{")
+    closes = chars == ord("}")
+    commas = chars == ord(",")
+    depth = np.cumsum(
+        opens.view(np.int8) - closes.view(np.int8), dtype=np.int8
+    )
+
+    # Single outermost sequence covering the whole string
+    if not (opens[0] and depth[-1] == 0 and (depth[:-1] > 0).all()):
+        raise _Unsupported
+
+    max_depth = int(depth.max())
+    if ndim is None:
+        ndim = max_depth
+    elif max_depth != ndim:
+        raise _Unsupported
+
+    # Numbers appear only in innermost sequences
+    contents = ~(opens | closes | commas)
+    if (contents & (depth != ndim)).any():
+        raise _Unsupported
+
+    # No empty element such as `{,` `,,` `,}`
+    if (opens[:-1] & commas[1:]).any() or (
+        commas[:-1] & (commas[1:] | closes[1:])
+    ).any():
+        raise _Unsupported
+
+    shape: list[int] = []
+    for level in range(1, ndim + 1):
+        parents = np.flatnonzero(opens & (depth == level))
+        if level < ndim:
+            children = np.flatnonzero(opens & (depth == level + 1))
+        else:
+            children = np.flatnonzero(commas & (depth == level))
+        counts = np.bincount(
+            np.searchsorted(parents, children) - 1,
+            minlength=len(parents),
+        )
+        if counts.min() != counts.max():
+            raise _Unsupported
+        size = int(counts[0])
+
+        if level == ndim:
+            empties = closes[parents + 1]
+            if empties.all():
+                size = 0
+            elif empties.any():
+                raise _Unsupported
+            else:
+                size += 1
+
+        shape.append(size)
+        if size == 0:
+            shape.extend([0] * (ndim - level))
+            break
+
+    # Whitespaces are kept, so that `1 2` is rejected rather than joined
+    try:
+        values = np.fromstring(
+            original.translate(None, b"{}"),
+            dtype=np.int64 if integer else dtype,
+            sep=",",
+        )
+    except ValueError:
+        raise _Unsupported from None
+
+    if values.size != np.prod(shape):
+        raise _Unsupported
+
+    if values.dtype != dtype:  # narrower integers, range checked
+        info = np.iinfo(dtype)
+        if values.size and (
+            int(values.min()) < info.min or info.max < int(values.max())
+        ):
+            raise _Unsupported
+        values = values.astype(dtype)
+
+    return values.reshape(shape)
+
+
+@lru_cache(None)
+def _number_syntax(dtype: Any) -> tuple[Any, bool]:
+    """Bytes `{...}` of numbers of `dtype` may have, and if integers"""
+    import numpy as np
+
+    allowed = b"0123456789{},+- \t\n\r"
+    integer = bool(np.issubdtype(dtype, np.integer))
+    if not integer:
+        allowed += b".Ee"
+    table = np.zeros(256, dtype=np.bool_)
+    table[np.frombuffer(allowed, dtype=np.uint8)] = True
+    return table, integer
+
+
+def _is_ndarray(obj: Any) -> bool:
+    np = sys.modules.get("numpy")
+    return np is not None and (
+        obj is np.ndarray or get_origin(obj) is np.ndarray
+    )
+
+
+def _get_dtype(obj: Any) -> Any:
+    import numpy as np
+
+    with suppress(ValueError, IndexError):
+        _, dtype = get_args(obj)
+        (scalar_type,) = get_args(dtype)
+        if isinstance(scalar_type, type):
+            return scalar_type
+
+    return np.float64
+
+
 # endregion
 
 # region split_typename_parts Implementation
@@ -693,6 +1372,178 @@ def _unparse_primitive(
         return str(obj)
 
 
+# region compiled unparse
+
+
+@lru_cache(None)
+def _cached_unparse(typ: Any) -> Callable[[Any], str]:
+    return compile_unparse(typ)
+
+
+def _unparse_compiled(
+    compiled: Callable[[Any], str], t: _ScalarType, n: int, obj: Any
+) -> str:
+    try:
+        return compiled(obj)
+    except Exception:  # noqa: S110
+        pass
+    # Once failed, find out where by the generic one
+    return _unparse(t, n, (), obj)
+
+
+@lru_cache(None)
+def _compile_unparse(t: _ScalarType, n: int) -> Callable[[Any], str]:
+    """
+    `_unparse(t, n, (), ...)` as closures specialized for `t` and `n`
+
+    Same result for any object `_unparse` accepts; raises on failure
+    without telling where, which is left to `_unparse`.
+    """
+    if 0 < n:
+        return _compile_unparse_sequence(t, n)
+    elif t is None:
+        return _unparse_str
+    elif issubclass(t, Component):
+        return _compile_unparse_attributes(t, component=True)
+    elif issubclass(t, tuple):
+        return _compile_unparse_attributes(t, component=False)
+    elif issubclass(t, record):
+        return _compile_unparse_record(t)
+    elif issubclass(t, enumeration):
+        return partial(_unparse_enumeration_compiled, t)
+    elif issubclass(t, str):
+        return _unparse_string
+    elif issubclass(t, bool):
+        return _unparse_bool
+    else:
+        return _unparse_str
+
+
+def _compile_unparse_sequence(t: _ScalarType, n: int) -> Callable[[Any], str]:
+    item = _compile_unparse(t, n - 1)  # type: ignore
+
+    if n == 1 and t in (float, int):
+
+        def unparse_numbers(obj: Any) -> str:
+            obj = _as_list(obj)
+            literals = ",".join(map(str, obj))
+            if "None" in literals:  # `None` is unparsed as ""
+                literals = ",".join(map(item, obj))
+            return "{" + literals + "}"
+
+        return unparse_numbers
+
+    def unparse_sequence(obj: Any) -> str:
+        return "{" + ",".join(map(item, _as_list(obj))) + "}"
+
+    return unparse_sequence
+
+
+def _as_list(obj: Any) -> Any:
+    """Items of `obj` as `_unparse_sequence` sees them by `obj[i]`"""
+    if isinstance(obj, (list, tuple)):
+        return obj
+    dtype = getattr(obj, "dtype", None)  # e.g. numpy.ndarray
+    if (
+        dtype is not None
+        and (
+            dtype.kind in "biuUO"
+            or (dtype.kind == "f" and dtype.itemsize == 8)
+        )
+        and 0 < getattr(obj, "ndim", 0)
+    ):
+        # python objects printed alike numpy scalars
+        return obj.tolist()
+    return [obj[i] for i in range(len(obj))]
+
+
+def _compile_unparse_attributes(
+    t: type, *, component: bool
+) -> Callable[[Any], str]:
+    """`{...}` of `Component` by attribute, `(...)` of tuple by index"""
+    items = []
+    for i, (attr, (tt, nn)) in enumerate(_iter_attribute_types(t)):
+        if component and attr == "dimensions":
+            tt = None  # noqa: PLW2901
+        items.append(
+            (
+                partial(_getattr, attr) if component else partial(_getitem, i),
+                _compile_unparse(tt, nn),  # type: ignore
+            )
+        )
+    open_, close = ("{", "}") if component else ("(", ")")
+
+    def unparse_attributes(obj: Any) -> str:
+        if obj is None:
+            return ""
+        return (
+            open_
+            + ",".join([unparse(get(obj)) for get, unparse in items])
+            + close
+        )
+
+    return unparse_attributes
+
+
+def _compile_unparse_record(t: type[record]) -> Callable[[Any], str]:
+    items = [
+        (attr, f"{attr}=", _compile_unparse(tt, nn))  # type: ignore
+        for attr, (tt, nn) in _iter_attribute_types(t)
+    ]
+    head = f"record {t.__omc_class__} "
+    tail = f" end {t.__omc_class__};"
+
+    def unparse_record(obj: Any) -> str:
+        if obj is None:
+            return ""
+        if isinstance(obj, Mapping):
+            values = [
+                prefix + unparse(obj[attr]) for attr, prefix, unparse in items
+            ]
+        else:
+            values = [
+                prefix + unparse(getattr(obj, attr))
+                for attr, prefix, unparse in items
+            ]
+        return head + ",".join(values) + tail
+
+    return unparse_record
+
+
+def _unparse_enumeration_compiled(t: type[enumeration], obj: Any) -> str:
+    if obj is None:
+        return ""
+    return _unparse_enumeration(t, 0, (), obj)
+
+
+def _unparse_string(obj: Any) -> str:
+    if type(obj) is str:  # noqa: E721, skips slow `isinstance` of Protocol
+        return _quote_py_string(obj)
+    if obj is None:
+        return ""
+    if isinstance(obj, PathLike):
+        obj = obj.__fspath__()
+    return _quote_py_string(str(obj))
+
+
+def _unparse_bool(obj: Any) -> str:
+    if obj is None:
+        return ""
+    return "true" if obj else "false"
+
+
+def _unparse_str(obj: Any) -> str:
+    return "" if obj is None else str(obj)
+
+
+def _getattr(attr: str, obj: Any) -> Any:
+    return getattr(obj, attr)
+
+
+def _getitem(i: int, obj: Any) -> Any:
+    return obj[i]
+
+
 # endregion
 
 
@@ -896,18 +1747,37 @@ _MODELICA_CHAR_ESCAPE_MAP = {
 }
 
 
+_MODELICA_CHAR_ESCAPE = re.compile(
+    "|".join(map(re.escape, _MODELICA_CHAR_ESCAPE_MAP))
+)
+
+
 def _escape_py_string(py_string: str) -> str:
-    return _replace_all(py_string, _MODELICA_CHAR_ESCAPE_MAP.items())
+    if _MODELICA_CHAR_ESCAPE.search(py_string) is None:
+        return py_string
+    # "\\" first; chained `str.replace` outrun `re.sub` with a function
+    for original, escaped in _MODELICA_CHAR_ESCAPE_MAP.items():
+        py_string = py_string.replace(original, escaped)
+    return py_string
+
+
+_MODELICA_CHAR_UNESCAPES = [
+    (escaped, original)
+    for original, escaped in _MODELICA_CHAR_ESCAPE_MAP.items()
+    if original != "\\"
+]
 
 
 def _unescape_modelica_string(modelica_string: str) -> str:
-    return _replace_all(
-        modelica_string,
-        [
-            (escaped, orignal)
-            for orignal, escaped in _MODELICA_CHAR_ESCAPE_MAP.items()
-        ],
-    )
+    # Split at escaped backslashes, so that `\\n` is a backslash and "n"
+    return "\\".join(map(_unescape_chars, modelica_string.split("\\\\")))
+
+
+def _unescape_chars(modelica_string: str) -> str:
+    if "\\" in modelica_string:
+        for escaped, original in _MODELICA_CHAR_UNESCAPES:
+            modelica_string = modelica_string.replace(escaped, original)
+    return modelica_string
 
 
 def _quote_py_string(py_string: str) -> str:
@@ -926,10 +1796,6 @@ def _unquote_modelica_string(modelica_string: str) -> str:
     return _unescape_modelica_string(modelica_string[1:-1])
 
 
-def _replace_all(s: str, old_and_new: Iterable[tuple[str, str]]) -> str:
-    return reduce(lambda x, y: x.replace(y[0], y[1]), old_and_new, s)
-
-
 # endregion
 
 # endregion
@@ -0,0 +1,592 @@
+from __future__ import annotations
+
+__all__ = (
+    "Outcome",
+    "SessionPool",
+    "Standby",
+    "Startup",
+    "aparallel_map",
+    "parallel_map",
+)
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Generator,
+    Iterable,
+)
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import (
+    ExitStack,
+    asynccontextmanager,
+    closing,
+    contextmanager,
+    suppress,
+)
+from dataclasses import dataclass, field
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Generic,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+from exceptiongroup import BaseExceptionGroup
+
+from .exception import OMCRuntimeError
+from .interactive import Interactive
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from . import AsyncSession, Session
+    from .protocol import PathLike
+
+    Slot = Optional[Session]
+    Waiter = Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]
+
+T_item = TypeVar("T_item")
+T_result = TypeVar("T_result")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SessionPool:
+    """
+    Pre-started omc sessions leased to threads and asyncio tasks
+
+    `setup` runs once for each new session (e.g. `loadModel`),
+    `reset` runs each time a session is returned after a health-check.
+    A session failing either is closed and replaced on the next lease.
+    """
+
+    size: int
+    _open: Callable[[], Session] = field(repr=False)
+    _setup: Callable[[Session], Any] | None = field(repr=False)
+    _reset: Callable[[Session], Any] | None = field(repr=False)
+    _idle: Deque[Slot] = field(repr=False)
+    _waiters: Deque[Waiter] = field(repr=False)
+    _condition: threading.Condition = field(repr=False)
+    _closed: threading.Event = field(repr=False)
+
+    @classmethod
+    def open(
+        cls,
+        size: int | None = None,
+        omc: str | PathLike[str] | Callable[[], Session] | None = None,
+        *,
+        setup: Callable[[Session], Any] | None = None,
+        reset: Callable[[Session], Any] | None = None,
+    ) -> Self:
+        if size is None:
+            size = os.cpu_count() or 1
+        if size < 1:
+            raise ValueError(f"size must be positive, got {size}")
+
+        self = cls(
+            size,
+            _to_open(omc),
+            setup,
+            reset,
+            deque(),
+            deque(),
+            threading.Condition(),
+            threading.Event(),
+        )
+
+        # omc takes a while to start, start them all at once
+        with ThreadPoolExecutor(size) as executor:
+            futures = [executor.submit(self._create) for _ in range(size)]
+        sessions: List[Session] = [
+            future.result() for future in futures if not future.exception()
+        ]
+        errors: List[BaseException] = [
+            error for error in map(Future.exception, futures) if error
+        ]
+
+        if errors:
+            for session in sessions:
+                session.close()
+            if len(errors) == 1:
+                raise errors[0]
+            raise BaseExceptionGroup("Failed to start sessions", errors)
+
+        self._idle.extend(sessions)
+        return self
+
+    def __enter__(self) -> Self:
+        return closing(self).__enter__()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return closing(self).__exit__(*exc_info)
+
+    def close(self) -> None:
+        """Close idle sessions now, and leased sessions when returned"""
+        with self._condition:
+            self._closed.set()
+            slots = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+            while self._waiters:
+                _wake(*self._waiters.popleft())
+
+        for slot in slots:
+            if slot is not None:
+                slot.close()
+
+    @contextmanager
+    def lease(
+        self, timeout: float | None = None
+    ) -> Generator[Session, None, None]:
+        """
+        Lease a session to the current thread
+
+        Raise `TimeoutError` if no session is returned within `timeout`.
+        """
+        with self._condition:
+            if not self._condition.wait_for(self._is_ready, timeout):
+                raise TimeoutError("No session is available")
+            slot = self._take()
+
+        session = self._fill(slot)
+        try:
+            yield session
+        finally:
+            self._release(session)
+
+    @asynccontextmanager
+    async def alease(self) -> AsyncGenerator[AsyncSession, None]:
+        """Lease a session to the current asyncio task"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._is_ready():
+                    slot = self._take()
+                    break
+                waiter: asyncio.Future[None] = loop.create_future()
+                self._waiters.append((loop, waiter))
+
+            try:
+                await waiter
+            except BaseException:
+                with self._condition:
+                    if not waiter.done():
+                        self._waiters.remove((loop, waiter))
+                    elif self._idle:  # pass the wake-up to the next
+                        self._notify()
+                raise
+
+        filling = loop.run_in_executor(None, self._fill, slot)
+        try:
+            session = await asyncio.shield(filling)
+        except asyncio.CancelledError:
+            # Not to shrink the pool, the session is put back once made
+            filling.add_done_callback(self._put_filled)
+            raise
+        try:
+            yield session.asynchronous
+        finally:
+            await loop.run_in_executor(None, self._release, session)
+
+    def _apply(
+        self,
+        fn: Callable[[Session, T_item], T_result],
+        index: int,
+        item: T_item,
+    ) -> Outcome[T_item, T_result]:
+        with self.lease() as session:
+            try:
+                return Outcome(index, item, result=fn(session, item))
+            except Exception as error:
+                return Outcome(index, item, error=error)
+
+    async def _aapply(
+        self,
+        fn: Callable[
+            [AsyncSession, T_item], Union[T_result, Awaitable[T_result]]
+        ],
+        index: int,
+        item: T_item,
+    ) -> Outcome[T_item, T_result]:
+        async with self.alease() as session:
+            try:
+                result = fn(session, item)
+                if isinstance(result, Awaitable):
+                    result = await result
+                return Outcome(index, item, result=result)
+            except Exception as error:
+                return Outcome(index, item, error=error)
+
+    def _is_ready(self) -> bool:
+        return bool(self._idle) or self._closed.is_set()
+
+    def _take(self) -> Slot:
+        if self._closed.is_set():
+            raise OMCRuntimeError("SessionPool is closed")
+        return self._idle.pop()
+
+    def _put(self, slot: Slot) -> None:
+        with self._condition:
+            if not self._closed.is_set():
+                self._idle.append(slot)
+                self._notify()
+                return
+        if slot is not None:
+            slot.close()
+
+    def _notify(self) -> None:
+        self._condition.notify()
+        while self._waiters:
+            loop, waiter = self._waiters.popleft()
+            if not waiter.done():
+                _wake(loop, waiter)
+                return
+
+    def _create(self) -> Session:
+        session = self._open()
+        try:
+            if self._setup is not None:
+                self._setup(session)
+        except BaseException:
+            session.close()
+            raise
+        return session
+
+    def _fill(self, slot: Slot) -> Session:
+        """Return the session of `slot`, (re)creating it if needed"""
+        if slot is not None:
+            return slot
+        try:
+            return self._create()
+        except BaseException:
+            self._put(None)
+            raise
+
+    def _put_filled(self, filling: asyncio.Future[Session]) -> None:
+        if not filling.cancelled() and filling.exception() is None:
+            self._put(filling.result())
+
+    def _release(self, session: Session) -> None:
+        try:
+            _check_health(session)
+            if self._reset is not None:
+                self._reset(session)
+        except Exception:
+            logger.warning("Replace unhealthy session", exc_info=True)
+            session.close()
+            self._put(None)
+        else:
+            self._put(session)
+
+
+class Startup(NamedTuple):
+    """Seconds to start omc and to run `setup` on it"""
+
+    process: float
+    setup: float
+
+    @property
+    def total(self) -> float:
+        return self.process + self.setup
+
+
+@dataclass(frozen=True)
+class Standby:
+    """
+    Standby omc sessions, started and `setup` in background
+
+    `get()` hands out a ready session, which the caller must close,
+    and starts a replacement. `get` can be `omc` of `SessionPool.open`
+    to replace unhealthy sessions without waiting for omc.
+    """
+
+    size: int
+    startups: Deque[Startup] = field(repr=False)
+    _open: Callable[[], Session] = field(repr=False)
+    _setup: Callable[[Session], Any] | None = field(repr=False)
+    _ready: queue.Queue[Future[Session]] = field(repr=False)
+    _executor: ThreadPoolExecutor = field(repr=False)
+    _closed: threading.Event = field(repr=False)
+
+    @classmethod
+    def open(
+        cls,
+        size: int = 1,
+        omc: str | PathLike[str] | Callable[[], Session] | None = None,
+        *,
+        setup: Callable[[Session], Any] | None = None,
+    ) -> Self:
+        if size < 1:
+            raise ValueError(f"size must be positive, got {size}")
+
+        self = cls(
+            size,
+            deque(maxlen=1024),
+            _to_open(omc),
+            setup,
+            queue.Queue(),
+            ThreadPoolExecutor(size, thread_name_prefix="omc4py-standby"),
+            threading.Event(),
+        )
+        for _ in range(size):
+            self._start()
+        return self
+
+    def __enter__(self) -> Self:
+        return closing(self).__enter__()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return closing(self).__exit__(*exc_info)
+
+    def close(self) -> None:
+        """Close standby sessions, including those starting now"""
+        self._closed.set()
+        self._executor.shutdown(wait=True)
+        while not self._ready.empty():
+            future = self._ready.get_nowait()
+            if not future.cancelled() and future.exception() is None:
+                future.result().close()
+
+    def get(self, timeout: float | None = None) -> Session:
+        """
+        Take a ready session, waiting for one being started
+
+        `TimeoutError` is raised if none is ready within `timeout` seconds.
+        An error to start or `setup` a session is raised here.
+        """
+        if self._closed.is_set():
+            raise OMCRuntimeError("Standby is closed")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            future = self._ready.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("No session is ready") from None
+        if deadline is not None:
+            timeout = max(deadline - time.monotonic(), 0)
+        try:
+            session = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self._ready.put(future)
+            raise TimeoutError("No session is ready") from None
+        except BaseException:
+            self._start()
+            raise
+        self._start()
+        return session
+
+    def _start(self) -> None:
+        with suppress(RuntimeError):  # executor is shut down
+            self._ready.put(self._executor.submit(self._create))
+
+    def _create(self) -> Session:
+        start = time.perf_counter()
+        session = self._open()
+        opened = time.perf_counter()
+        try:
+            if self._setup is not None:
+                self._setup(session)
+        except BaseException:
+            session.close()
+            raise
+        startup = Startup(opened - start, time.perf_counter() - opened)
+        self.startups.append(startup)
+        logger.info(
+            f"Standby session is ready in {startup.total:.3f}s "
+            f"(process={startup.process:.3f}s, setup={startup.setup:.3f}s)"
+        )
+        if self._closed.is_set():
+            session.close()
+            raise OMCRuntimeError("Standby is closed")
+        return session
+
+
+@dataclass(frozen=True)
+class Outcome(Generic[T_item, T_result]):
+    """Result or error of `fn(session, item)` for the `index`-th item"""
+
+    index: int
+    item: T_item
+    result: T_result | None = None
+    error: Exception | None = None
+
+    def get(self) -> T_result:
+        if self.error is not None:
+            raise self.error
+        return self.result  # type: ignore
+
+
+def parallel_map(
+    omc: SessionPool | str | PathLike[str] | Callable[[], Session] | None,
+    fn: Callable[[Session, T_item], T_result],
+    items: Iterable[T_item],
+    *,
+    workers: int | None = None,
+    ordered: bool = True,
+) -> Generator[Outcome[T_item, T_result], None, None]:
+    """
+    Yield `Outcome` of `fn(session, item)` for each item from threads
+
+    `omc` is an existing pool (to `setup` sessions), or opens a pool
+    of `workers` sessions closed at the end.
+    Outcomes are yielded in order of `items`, or as they complete
+    if not `ordered`. An error of `fn` is kept in its `Outcome`
+    and doesn't stop the other items.
+    """
+    with ExitStack() as stack:
+        if isinstance(omc, SessionPool):
+            pool = omc
+        else:
+            pool = stack.enter_context(SessionPool.open(workers, omc))
+        executor = stack.enter_context(ThreadPoolExecutor(pool.size))
+
+        # Pending futures are cancelled before waiting running ones
+        pending: Deque[Future[Outcome[T_item, T_result]]] = deque()
+        stack.callback(lambda: [future.cancel() for future in pending])
+
+        def completed() -> Generator[Future[Any], None, None]:
+            if ordered:
+                yield pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield future
+
+        for index, item in enumerate(items):
+            pending.append(executor.submit(pool._apply, fn, index, item))
+            if len(pending) >= 2 * pool.size:
+                yield from (future.result() for future in completed())
+
+        while pending:
+            yield from (future.result() for future in completed())
+
+
+@overload
+def aparallel_map(
+    omc: SessionPool | str | PathLike[str] | Callable[[], Session] | None,
+    fn: Callable[[AsyncSession, T_item], Awaitable[T_result]],
+    items: Iterable[T_item],
+    *,
+    workers: int | None = None,
+    ordered: bool = True,
+) -> AsyncGenerator[Outcome[T_item, T_result], None]: ...
+
+
+@overload
+def aparallel_map(
+    omc: SessionPool | str | PathLike[str] | Callable[[], Session] | None,
+    fn: Callable[[AsyncSession, T_item], T_result],
+    items: Iterable[T_item],
+    *,
+    workers: int | None = None,
+    ordered: bool = True,
+) -> AsyncGenerator[Outcome[T_item, T_result], None]: ...
+
+
+async def aparallel_map(
+    omc: SessionPool | str | PathLike[str] | Callable[[], Session] | None,
+    fn: Callable[[AsyncSession, T_item], Union[T_result, Awaitable[T_result]]],
+    items: Iterable[T_item],
+    *,
+    workers: int | None = None,
+    ordered: bool = True,
+) -> AsyncGenerator[Outcome[T_item, T_result], None]:
+    """`parallel_map` for asyncio tasks, `fn` may be a coroutine function"""
+    loop = asyncio.get_running_loop()
+    if isinstance(omc, SessionPool):
+        pool = omc
+    else:
+        pool = await loop.run_in_executor(
+            None,
+            partial(SessionPool.open, workers, omc),
+        )
+
+    pending: Deque[asyncio.Future[Outcome[T_item, T_result]]] = deque()
+    try:
+
+        async def completed() -> List[asyncio.Future[Any]]:
+            if ordered:
+                return [pending.popleft()]
+            done, _ = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                pending.remove(future)
+            return list(done)
+
+        for index, item in enumerate(items):
+            pending.append(
+                asyncio.ensure_future(pool._aapply(fn, index, item))
+            )
+            if len(pending) >= 2 * pool.size:
+                for future in await completed():
+                    yield await future
+
+        while pending:
+            for future in await completed():
+                yield await future
+
+    finally:
+        for future in pending:
+            future.cancel()
+        if pending:
+            await asyncio.wait(pending)
+        if pool is not omc:
+            await loop.run_in_executor(None, pool.close)
+
+
+def _to_open(
+    omc: str | PathLike[str] | Callable[[], Session] | None,
+) -> Callable[[], Session]:
+    if callable(omc):
+        return omc
+    from . import open_session
+
+    return partial(open_session, omc)
+
+
+def _check_health(session: Session) -> None:
+    interactive = session.__omc_interactive__
+    if isinstance(interactive, Interactive):
+        process = interactive._resource.process
+        if process.poll() is not None:
+            raise OMCRuntimeError(
+                f"omc (pid={process.pid}) exited with {process.returncode}"
+            )
+    # Round trip, and drop messages left by the previous lease
+    interactive.synchronous.evaluate("getErrorString()")
+
+
+def _wake(
+    loop: asyncio.AbstractEventLoop, waiter: asyncio.Future[None]
+) -> None:
+    with suppress(RuntimeError):  # loop is closed
+        loop.call_soon_threadsafe(partial(_set_result, waiter))
+
+
+def _set_result(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -34,6 +34,12 @@ class SupportsClose(Protocol):
     def __exit__(self, *exc_info: Any) -> None: ...
 
 
+@runtime_checkable
+class SupportsResultFile(Protocol):
+    @property
+    def resultFile(self) -> str: ...
+
+
 class Calling(enum.Enum):
     synchronous = enum.auto()
     asynchronous = enum.auto()
@@ -0,0 +1,134 @@
+"""
+Stand-in of omc answering from a capture of `omc4py.trace`
+
+    python -m omc4py.replay CAPTURE --interactive=zmq -z=SUFFIX
+
+serves the replies recorded in CAPTURE over zmq, with the port file
+handshake of omc, so sessions can be opened on it without OpenModelica.
+`executable` writes a launcher to pass as `omc` to `open_session`.
+"""
+
+from __future__ import annotations
+
+__all__ = (
+    "Replies",
+    "executable",
+    "main",
+)
+
+import argparse
+import getpass
+import os
+import platform
+import shlex
+import sys
+import tempfile
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Deque, Dict, List, Sequence
+
+from .trace import REQUEST, read_capture
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from .protocol import PathLike
+
+
+@dataclass(frozen=True)
+class Replies:
+    """
+    Replies of omc by expression, in the order they were captured
+
+    Once all replies to an expression are given, the last is repeated.
+    Expressions never captured are answered by `missing`.
+    """
+
+    replies: Dict[str, List[str]]
+    missing: str = ""
+    _given: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def load(cls, path: str | PathLike[str]) -> Self:
+        requests: Dict[int, Deque[str]] = defaultdict(deque)
+        replies: Dict[str, List[str]] = defaultdict(list)
+        for message in read_capture(path):
+            if message.direction == REQUEST:
+                requests[message.pid].append(message.payload)
+            elif requests[message.pid]:
+                # omc replies to its requests one by one, in order
+                expression = requests[message.pid].popleft()
+                replies[expression].append(message.payload)
+        return cls(dict(replies))
+
+    def reply(self, expression: str) -> str:
+        replies = self.replies.get(expression)
+        if not replies:
+            return self.missing
+        given = self._given.get(expression, 0)
+        self._given[expression] = given + 1
+        return replies[min(given, len(replies) - 1)]
+
+
+def executable(
+    capture: str | PathLike[str], directory: str | PathLike[str]
+) -> Path:
+    """Write a launcher of the stand-in of omc into `directory`"""
+    command = [sys.executable, "-m", __name__, os.fspath(capture)]
+    if platform.system() == "Windows":
+        path = Path(directory, "omc.bat")
+        path.write_text(f"@{' '.join(map(_quote_cmd, command))} %*\r\n")
+    else:
+        path = Path(directory, "omc")
+        path.write_text(f'#!/bin/sh\nexec {shlex.join(command)} "$@"\n')
+        path.chmod(0o755)
+    return path
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog=f"python -m {__name__}", description=__doc__
+    )
+    parser.add_argument("capture")
+    parser.add_argument("-z", dest="suffix", default=None)
+    parser.add_argument("--interactive", default="zmq")
+    args, _ = parser.parse_known_args(argv)  # e.g. `--locale=C`
+    if args.interactive != "zmq":
+        parser.error(f"--interactive={args.interactive} is not supported")
+
+    serve(Replies.load(args.capture), args.suffix)
+
+
+def serve(replies: Replies, suffix: str | None) -> None:
+    import zmq
+
+    with zmq.Context() as context, context.socket(zmq.REP) as socket:
+        port = socket.bind_to_random_port("tcp://127.0.0.1")
+        _write_port_file(f"tcp://127.0.0.1:{port}", suffix)
+        print(f"Started replay server on port {port}", flush=True)  # noqa: T201
+
+        while True:
+            expression = socket.recv().decode()
+            socket.send(replies.reply(expression).encode())
+            if expression == "quit()":
+                return
+
+
+def _write_port_file(address: str, suffix: str | None) -> None:
+    name = f"openmodelica.{getpass.getuser()}.port"
+    if suffix is not None:
+        name += f".{suffix}"
+    path = Path(tempfile.gettempdir(), name)
+    # Written at once, not to be read half-written
+    temporary = path.with_name(f".{name}.tmp")
+    temporary.write_text(address)
+    temporary.replace(path)
+
+
+def _quote_cmd(word: str) -> str:
+    return f'"{word}"' if " " in word else word
+
+
+if __name__ == "__main__":
+    main()
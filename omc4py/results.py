@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+__all__ = ("CSVResult", "ResultFile", "Variable")
+
+import csv
+import mmap
+import re
+import struct
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import closing, suppress
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Literal,
+    NamedTuple,
+    Tuple,
+    Union,
+    cast,
+)
+
+from .exception import OMCRuntimeError
+from .protocol import SupportsResultFile
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+    from typing_extensions import Self
+
+    from .openmodelica import VariableName
+    from .protocol import PathLike
+
+ResultSource = Union[str, "PathLike[str]", SupportsResultFile]
+
+
+class Variable(NamedTuple):
+    name: str
+    description: str
+    block: Literal[1, 2]
+    column: int
+    negated: bool
+
+
+@dataclass(frozen=True)
+class ResultFile:
+    """
+    MAT v4 result file written by `simulate`, memory-mapped
+
+    `file[name]` is a read-only view into the mapped file for
+    trajectories (`block == 2`) and parameters (`block == 1`).
+    Only negated aliases are copied.
+    Views must be released before `close` to unmap the file.
+    """
+
+    variables: Mapping[str, Variable]
+    _mmap: mmap.mmap = field(repr=False)
+    _blocks: dict[int, npt.NDArray[Any]] = field(repr=False)
+
+    @classmethod
+    def open(cls, source: ResultSource) -> Self:
+        with _to_path(source).open("rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls._from_buffer(buffer)
+        except BaseException:
+            _close_mmap(buffer)
+            raise
+
+    @classmethod
+    def _from_buffer(cls, buffer: mmap.mmap) -> Self:
+        matrices = dict(_iter_matrices(buffer))
+        try:
+            aclass = _to_strings(matrices["Aclass"], transposed=False)
+            transposed = aclass[3:4] == ["binTrans"]
+            names = _to_strings(matrices["name"], transposed=transposed)
+            descriptions = _to_strings(
+                matrices["description"], transposed=transposed
+            )
+            info = matrices["dataInfo"]
+            blocks = {
+                1: matrices["data_1"],
+                2: matrices["data_2"],
+            }
+        except KeyError as missing:
+            raise OMCRuntimeError(
+                f"{missing} is not found in result file"
+            ) from None
+
+        # One row per variable
+        if not transposed:
+            info = info.T
+        else:
+            blocks = {block: data.T for block, data in blocks.items()}
+
+        variables = {}
+        for name, description, (block, index) in zip(
+            names, descriptions, info[:, :2].tolist()
+        ):
+            variables[name] = Variable(
+                name=name,
+                description=description,
+                block=block or 2,  # 0 for abscissa (time)
+                column=abs(index) - 1,
+                negated=index < 0,
+            )
+
+        return cls(variables, buffer, blocks)
+
+    def __enter__(self) -> Self:
+        return closing(self).__enter__()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return closing(self).__exit__(*exc_info)
+
+    def close(self) -> None:
+        self._blocks.clear()
+        _close_mmap(self._mmap)
+
+    def __getitem__(self, name: str) -> npt.NDArray[Any]:
+        variable = self.variables[name]
+        # a row of the block, typed as scalar by numpy
+        data = cast(
+            "npt.NDArray[Any]", self._blocks[variable.block][variable.column]
+        )
+        if variable.negated:
+            return -data
+        return data
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.variables
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.variables)
+
+    def __len__(self) -> int:
+        return len(self.variables)
+
+    @property
+    def time(self) -> npt.NDArray[Any]:
+        return cast("npt.NDArray[Any]", self._blocks[2][0])
+
+
+@dataclass(frozen=True)
+class CSVResult:
+    """
+    CSV result file written by `simulate(..., outputFormat="csv")`
+
+    Rows are streamed in chunks, only the selected columns are converted.
+    """
+
+    path: Path
+    names: Tuple[str, ...]
+
+    @classmethod
+    def open(cls, source: ResultSource) -> Self:
+        path = _to_path(source)
+        with path.open(newline="") as f:
+            header = next(csv.reader(f), [])
+        if header[-1:] == [""]:  # trailing ","
+            header.pop()
+        if not header:
+            raise OMCRuntimeError(f"{path} has no header")
+        return cls(path, tuple(header))
+
+    def select(
+        self,
+        variables: Iterable[str | VariableName] | None = None,
+        *,
+        variableFilter: str | None = None,
+    ) -> Tuple[str, ...]:
+        """
+        Select columns by names and/or `variableFilter` regex of `simulate`
+
+        All columns are selected if neither is given.
+        """
+        selected: dict[str, None] = {}
+        if variables is not None:
+            for variable in map(str, variables):
+                if variable not in self.names:
+                    raise KeyError(variable)
+                selected[variable] = None
+        if variableFilter is not None:
+            pattern = re.compile(variableFilter)
+            selected.update(
+                (name, None)
+                for name in self.names
+                if pattern.fullmatch(name) is not None
+            )
+        if variables is None and variableFilter is None:
+            selected.update((name, None) for name in self.names)
+        return tuple(selected)
+
+    def iter_chunks(
+        self,
+        variables: Iterable[str | VariableName] | None = None,
+        *,
+        variableFilter: str | None = None,
+        chunksize: int = 65536,
+    ) -> Iterator[npt.NDArray[np.float64]]:
+        """
+        Yield arrays of shape `(rows, columns)` of selected columns
+
+        Columns are ordered as `select(variables, variableFilter=...)`,
+        and at most `chunksize` rows are held in memory at once.
+        """
+        import numpy as np
+
+        index = {name: i for i, name in enumerate(self.names)}
+        usecols = [
+            index[name]
+            for name in self.select(variables, variableFilter=variableFilter)
+        ]
+        with self.path.open(newline="") as f:
+            next(f, None)  # header
+            while True:
+                lines = list(islice(f, chunksize))
+                if not lines:
+                    return
+                yield np.loadtxt(
+                    lines,
+                    dtype=np.float64,
+                    delimiter=",",
+                    usecols=usecols,
+                    ndmin=2,
+                )
+
+
+_HEADER = struct.Struct("<5i")
+_PRECISIONS = ("f8", "f4", "i4", "i2", "u2", "u1")
+
+
+def _iter_matrices(
+    buffer: mmap.mmap,
+) -> Iterator[tuple[str, npt.NDArray[Any]]]:
+    """
+    Yield `(name, matrix)` of MAT v4 matrices as views of `buffer`
+
+    Matrices keep the stored (column-major) layout: `matrix[j]` is column `j`.
+    """
+    import numpy as np
+
+    offset = 0
+    while offset < len(buffer):
+        try:
+            header = _HEADER.unpack_from(buffer, offset)
+            if not 0 <= header[0] < 1000:  # noqa: PLR2004
+                header = struct.unpack_from(">5i", buffer, offset)
+        except struct.error:
+            raise OMCRuntimeError("Truncated result file") from None
+        type_, mrows, ncols, imagf, namlen = header
+
+        endian, type_ = divmod(type_, 1000)
+        order, type_ = divmod(type_, 100)
+        precision, text = divmod(type_, 10)
+        if (
+            endian not in (0, 1)
+            or order != 0
+            or not 0 <= precision < len(_PRECISIONS)
+            or text not in (0, 1)
+            or imagf != 0
+        ):
+            raise OMCRuntimeError(f"Unsupported MAT v4 header {header}")
+        offset += _HEADER.size
+
+        name = bytes(buffer[offset : offset + namlen]).rstrip(b"\0")
+        offset += namlen
+
+        dtype: np.dtype[Any] = np.dtype(
+            f"{'<>'[endian]}{_PRECISIONS[precision]}"
+        )
+        count = mrows * ncols
+        if len(buffer) < offset + count * dtype.itemsize:
+            raise OMCRuntimeError("Truncated result file")
+        matrix = np.frombuffer(buffer, dtype, count, offset)
+        offset += count * dtype.itemsize
+
+        yield name.decode("ascii"), matrix.reshape(ncols, mrows)
+
+
+def _to_strings(matrix: npt.NDArray[Any], *, transposed: bool) -> list[str]:
+    if not transposed:
+        matrix = matrix.T
+    return [
+        bytes(row.astype("u1")).rstrip(b"\0 ").decode("utf-8", "replace")
+        for row in matrix
+    ]
+
+
+def _close_mmap(buffer: mmap.mmap) -> None:
+    # If views are still alive, the mapping is released with them
+    with suppress(BufferError):
+        buffer.close()
+
+
+def _to_path(source: ResultSource) -> Path:
+    """
+    `source` or `source.resultFile` as path
+
+    Relative `resultFile` is relative to the working directory of omc.
+    """
+    if isinstance(source, SupportsResultFile):
+        return Path(source.resultFile)
+    return Path(source)
@@ -9,12 +9,14 @@ from exceptiongroup import ExceptionGroup
 from .algorithm import fmap
 from .exception import OMCError, OMCWarning
 from .modelica import external
-from .openmodelica import Component, TypeName
+from .openmodelica import Component, ComponentTable, TypeName
 from .protocol import Asynchronous, HasInteractive, Synchronous, T_Calling
 
 if TYPE_CHECKING:
     from typing_extensions import Self
 
+    from .batch import Batch
+    from .cache import CacheInfo, DiskCache
     from .v_1_24.OpenModelica.Scripting import (  # NOTE: update to latest
         ErrorMessage,
     )
@@ -48,6 +50,67 @@ class BasicSession(HasInteractive[T_Calling]):
             cls = type(self)
         return cls(self.__omc_interactive__.asynchronous)
 
+    def cached(
+        self,
+        maxsize: int | None = 1024,
+        *,
+        store: DiskCache | None = None,
+    ) -> Self:
+        """
+        Share omc, answering class queries from a cache of replies
+
+        See `omc4py.cache.CachedInteractive` for cached functions
+        and those invalidating the cache.
+        `store` keeps replies on disk for later sessions.
+        """
+        from .cache import CachedInteractive
+
+        interactive = CachedInteractive(
+            self.__omc_interactive__, maxsize, store
+        )
+        return type(self)(interactive)  # type: ignore
+
+    def cache_info(self) -> CacheInfo | None:
+        """Statistics of the cache of `cached()` session, if any"""
+        from .cache import CachedInteractive
+
+        interactive = self.__omc_interactive__
+        if isinstance(interactive, CachedInteractive):
+            return interactive.cache_info()
+        return None
+
+    def memory_bounded(self, max_heap: int, *, every: int = 100) -> Self:
+        """
+        Share supervised omc, recycled when its heap outgrows `max_heap`
+
+        See `omc4py.memory.MemoryBoundedInteractive`.
+        """
+        from .memory import MemoryBoundedInteractive
+
+        interactive = MemoryBoundedInteractive(
+            self.__omc_interactive__, max_heap, every
+        )
+        return type(self)(interactive)  # type: ignore
+
+    def offloaded(self, threshold: int = 1 << 20) -> Self:
+        """
+        Share local omc, passing strings over `threshold` through files
+
+        See `omc4py.offload.OffloadingInteractive`.
+        """
+        from .offload import OffloadingInteractive
+
+        interactive = OffloadingInteractive(
+            self.__omc_interactive__, threshold
+        )
+        return type(self)(interactive)  # type: ignore
+
+    def batch(self) -> Batch[Self]:
+        """Collect calls into one omc script, sent when the block exits"""
+        from .batch import Batch
+
+        return Batch.open(self)
+
     @overload
     def getComponents(
         self: BasicSession[Synchronous],
@@ -67,6 +130,26 @@ class BasicSession(HasInteractive[T_Calling]):
     ) -> Union[List[Component], Coroutine[None, None, List[Component]]]:
         return ...  # type: ignore
 
+    @overload
+    def getComponentTable(
+        self: BasicSession[Synchronous],
+        name: Union[TypeName, str],
+    ) -> ComponentTable: ...
+
+    @overload
+    async def getComponentTable(
+        self: BasicSession[Asynchronous],
+        name: Union[TypeName, str],
+    ) -> ComponentTable: ...
+
+    @external("getComponents")
+    def getComponentTable(
+        self: Union[BasicSession[Synchronous], BasicSession[Asynchronous]],
+        name: Union[TypeName, str],  # noqa: ARG002
+    ) -> Union[ComponentTable, Coroutine[None, None, ComponentTable]]:
+        """`getComponents` decoded into columns, see `ComponentTable`"""
+        return ...  # type: ignore
+
     @overload
     def getMessagesStringInternal(
         self: BasicSession[Synchronous],
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+__all__ = (
+    "PREVIEW",
+    "REPLY",
+    "REQUEST",
+    "Capture",
+    "CapturedMessage",
+    "capture",
+    "preview",
+    "read_capture",
+)
+
+import logging
+import struct
+import threading
+import time
+from collections.abc import Generator, Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, ClassVar, NamedTuple, Tuple
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from .protocol import PathLike
+
+#: Characters of expressions and replies shown in debug logs
+PREVIEW = 1000
+
+REQUEST = ">>>"
+REPLY = "<<<"
+
+
+def preview(text: str) -> str:
+    """`text` cut to `PREVIEW` characters"""
+    if len(text) <= PREVIEW:
+        return text
+    return f"{text[:PREVIEW]}... ({len(text)} characters)"
+
+
+class CapturedMessage(NamedTuple):
+    direction: str  # `REQUEST` or `REPLY`
+    pid: int
+    time: float
+    payload: str
+
+
+@dataclass(frozen=True)
+class Capture:
+    """
+    Binary file of expressions sent to omc and its replies
+
+    Each message is a header of direction, pid, time and size,
+    followed by the UTF-8 payload. `read_capture` reads them back.
+    """
+
+    MAGIC: ClassVar[bytes] = b"omc4py-capture\x00\x01"
+    HEADER: ClassVar[struct.Struct] = struct.Struct("<BIdQ")
+    DIRECTIONS: ClassVar[Tuple[str, str]] = (REQUEST, REPLY)
+
+    path: Path
+    _file: IO[bytes] = field(repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def open(cls, path: str | PathLike[str]) -> Self:
+        path = Path(path).expanduser()
+        file = path.open("wb")
+        file.write(cls.MAGIC)
+        return cls(path, file)
+
+    def __enter__(self) -> Self:
+        return closing(self).__enter__()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return closing(self).__exit__(*exc_info)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def write(self, direction: str, pid: int, payload: bytes) -> None:
+        header = self.HEADER.pack(
+            self.DIRECTIONS.index(direction), pid, time.time(), len(payload)
+        )
+        with self._lock:
+            if self._file.closed:  # by `capture` exited meanwhile
+                return
+            self._file.write(header)
+            self._file.write(payload)
+
+
+def read_capture(path: str | PathLike[str]) -> Iterator[CapturedMessage]:
+    with Path(path).expanduser().open("rb") as file:
+        if file.read(len(Capture.MAGIC)) != Capture.MAGIC:
+            raise ValueError(f"{path} is not a capture of omc4py")
+        while True:
+            header = file.read(Capture.HEADER.size)
+            if len(header) < Capture.HEADER.size:
+                return  # the end, or a message cut by a crash
+            direction, pid, time_, size = Capture.HEADER.unpack(header)
+            payload = file.read(size)
+            if len(payload) < size:
+                return
+            yield CapturedMessage(
+                Capture.DIRECTIONS[direction], pid, time_, payload.decode()
+            )
+
+
+@contextmanager
+def capture(path: str | PathLike[str]) -> Generator[Capture, None, None]:
+    """Capture messages of all omc sessions of this process into `path`"""
+    global _captures  # noqa: PLW0603
+
+    with Capture.open(path) as file:
+        with _lock:
+            _captures = (*_captures, file)
+        try:
+            yield file
+        finally:
+            with _lock:
+                _captures = tuple(c for c in _captures if c is not file)
+
+
+_captures: Tuple[Capture, ...] = ()
+_lock = threading.Lock()
+
+
+def enabled(logger: logging.Logger, capture: Capture | None = None) -> bool:
+    """Whether `message` does anything, cheap enough for every call"""
+    return (
+        capture is not None
+        or bool(_captures)
+        or logger.isEnabledFor(logging.DEBUG)
+    )
+
+
+def message(
+    logger: logging.Logger,
+    pid: int,
+    direction: str,
+    text: str,
+    capture: Capture | None = None,
+) -> None:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"(pid={pid}) {direction} {preview(text)}")
+    captures = _captures if capture is None else (*_captures, capture)
+    if captures:
+        payload = text.encode()
+        for file in captures:
+            file.write(direction, pid, payload)
@@ -1,8 +1,8 @@
 from __future__ import annotations as _
 
-from typing import Coroutine, Union, overload
+from typing import TYPE_CHECKING, Coroutine, Union, overload
 
-from omc4py.modelica import enumeration, external, package
+from omc4py.modelica import enumeration, external, lazy_import, package
 from omc4py.openmodelica import TypeName
 from omc4py.protocol import (
     Asynchronous,
@@ -11,7 +11,10 @@ from omc4py.protocol import (
     T_Calling,
 )
 
-from . import Time as time
+if TYPE_CHECKING:
+    from . import Time as time
+else:
+    time = lazy_import(".Time", __name__)
 
 
 class Time(package[T_Calling]):
@@ -1,10 +1,15 @@
 from __future__ import annotations as _
 
-from omc4py.modelica import package
+from typing import TYPE_CHECKING
+
+from omc4py.modelica import lazy_import, package
 from omc4py.openmodelica import TypeName
 from omc4py.protocol import T_Calling
 
-from . import Time as time
+if TYPE_CHECKING:
+    from . import Time as time
+else:
+    time = lazy_import(".Time", __name__)
 
 
 class Time(package[T_Calling]):
@@ -1,8 +1,8 @@
 from __future__ import annotations as _
 
-from typing import Coroutine, Union, overload
+from typing import TYPE_CHECKING, Coroutine, Union, overload
 
-from omc4py.modelica import external, package
+from omc4py.modelica import external, lazy_import, package
 from omc4py.openmodelica import TypeName
 from omc4py.protocol import (
     Asynchronous,
@@ -11,7 +11,10 @@ from omc4py.protocol import (
     T_Calling,
 )
 
-from . import Architecture as architecture
+if TYPE_CHECKING:
+    from . import Architecture as architecture
+else:
+    architecture = lazy_import(".Architecture", __name__)
 
 
 @overload
@@ -2,12 +2,15 @@ from __future__ import annotations as _
 
 from typing import TYPE_CHECKING
 
-from omc4py.modelica import package
+from omc4py.modelica import lazy_import, package
 from omc4py.openmodelica import TypeName
 from omc4py.protocol import Asynchronous, Synchronous, T_Calling
 from omc4py.session import BasicSession
 
-from . import OpenModelica as openModelica
+if TYPE_CHECKING:
+    from . import OpenModelica as openModelica
+else:
+    openModelica = lazy_import(".OpenModelica", __name__)
 
 
 class OpenModelica(package[T_Calling]):
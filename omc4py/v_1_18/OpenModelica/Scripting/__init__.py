@@ -2,6 +2,7 @@ from __future__ import annotations as _
 
 from dataclasses import dataclass
 from typing import (
+    TYPE_CHECKING,
     Coroutine,
     List,
     Literal,
@@ -11,7 +12,7 @@ from typing import (
     overload,
 )
 
-from omc4py.modelica import enumeration, external, package, record
+from omc4py.modelica import enumeration, external, lazy_import, package, record
 from omc4py.openmodelica import TypeName, VariableName
 from omc4py.protocol import (
     Asynchronous,
@@ -21,8 +22,12 @@ from omc4py.protocol import (
     T_Calling,
 )
 
-from . import Experimental as experimental
-from . import Internal as internal
+if TYPE_CHECKING:
+    from . import Experimental as experimental
+    from . import Internal as internal
+else:
+    experimental = lazy_import(".Experimental", __name__)
+    internal = lazy_import(".Internal", __name__)
 
 
 @dataclass(frozen=True)
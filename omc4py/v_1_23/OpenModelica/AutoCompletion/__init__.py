@@ -1,10 +1,15 @@
 from __future__ import annotations as _
 
-from omc4py.modelica import package
+from typing import TYPE_CHECKING
+
+from omc4py.modelica import lazy_import, package
 from omc4py.openmodelica import TypeName
 from omc4py.protocol import T_Calling
 
-from . import Annotations as annotations
+if TYPE_CHECKING:
+    from . import Annotations as annotations
+else:
+    annotations = lazy_import(".Annotations", __name__)
 
 
 class Annotations(package[T_Calling]):
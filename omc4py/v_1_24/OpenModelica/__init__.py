@@ -1,9 +1,9 @@
 from __future__ import annotations as _
 
 from dataclasses import dataclass
-from typing import Coroutine, Union, overload
+from typing import TYPE_CHECKING, Coroutine, Union, overload
 
-from omc4py.modelica import external, package, record
+from omc4py.modelica import external, lazy_import, package, record
 from omc4py.openmodelica import TypeName
 from omc4py.protocol import (
     Asynchronous,
@@ -12,10 +12,16 @@ from omc4py.protocol import (
     T_Calling,
 )
 
-from . import AutoCompletion as autoCompletion
-from . import Internal as internal
-from . import Scripting as scripting
-from . import UsersGuide as usersGuide
+if TYPE_CHECKING:
+    from . import AutoCompletion as autoCompletion
+    from . import Internal as internal
+    from . import Scripting as scripting
+    from . import UsersGuide as usersGuide
+else:
+    autoCompletion = lazy_import(".AutoCompletion", __name__)
+    internal = lazy_import(".Internal", __name__)
+    scripting = lazy_import(".Scripting", __name__)
+    usersGuide = lazy_import(".UsersGuide", __name__)
 
 
 @overload
@@ -1,11 +1,202 @@
 from __future__ import annotations
 
-from collections.abc import Callable
-from typing import TYPE_CHECKING
+import asyncio
+import re
+import sys
+import threading
+from collections.abc import Callable, Coroutine, Generator, Mapping
+from contextlib import ExitStack, closing, contextmanager
+from dataclasses import dataclass, field, replace
+from functools import partial
+from itertools import count
+from subprocess import PIPE, Popen
+from typing import TYPE_CHECKING, Any, Generic, Union, overload
+
+import zmq
 
 from omc4py import Session
+from omc4py.exception import OMCRuntimeError
+from omc4py.interactive import (
+    Interactive,
+    Port,
+    _Resource,
+    _Slot,
+    _Sockets,
+    _terminating,
+)
+from omc4py.protocol import (
+    Asynchronous,
+    Calling,
+    Synchronous,
+    T_Calling,
+    synchronous,
+)
 
 if TYPE_CHECKING:
+    from typing_extensions import Self
+
     OpenSession = Callable[[], Session]
 else:
     OpenSession = ...
+
+#: Reply of a function, or function of the arguments to reply
+Reply = Union[str, Callable[[str], str]]
+
+# `;` separates statements out of string literals
+_STATEMENT = re.compile(r'(?:"(?:[^"\\]|\\.)*"|[^;"])+', re.DOTALL)
+
+_ids = count()
+
+
+@dataclass(frozen=True)
+class StubOMC(Generic[T_Calling]):
+    """
+    Interactive replying to `;`-separated statements like omc, without it
+
+    String literals are replied as such, and calls of a function
+    by its `replies`, else by `default` ("" for no outputs).
+    Statements after a call of `abort` are not evaluated.
+    `state["closed"]` is set on close and `state["broken"]` fails calls,
+    for both its synchronous and asynchronous variants.
+    """
+
+    calling: T_Calling
+    replies: Mapping[str, Reply] = field(default_factory=dict, compare=False)
+    default: str = ""
+    abort: str | None = None
+    id: int = field(default_factory=lambda: next(_ids))
+    expressions: list[str] = field(default_factory=list, compare=False)
+    state: dict[str, bool] = field(default_factory=dict, compare=False)
+
+    def __enter__(self) -> Self:
+        return closing(self).__enter__()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return closing(self).__exit__(*exc_info)
+
+    def close(self) -> None:
+        self.state["closed"] = True
+
+    @property
+    def synchronous(self) -> StubOMC[Synchronous]:
+        if TYPE_CHECKING:
+            synchronous: StubOMC[Synchronous]
+        else:
+            synchronous = self
+        return replace(synchronous, calling=Calling.synchronous)
+
+    @property
+    def asynchronous(self) -> StubOMC[Asynchronous]:
+        if TYPE_CHECKING:
+            asynchronous: StubOMC[Asynchronous]
+        else:
+            asynchronous = self
+        return replace(asynchronous, calling=Calling.asynchronous)
+
+    @overload
+    def evaluate(self: StubOMC[Synchronous], expression: str) -> str: ...
+
+    @overload
+    async def evaluate(
+        self: StubOMC[Asynchronous], expression: str
+    ) -> str: ...
+
+    def evaluate(self, expression: str) -> str | Coroutine[None, None, str]:
+        self.expressions.append(expression)
+        if self.state.get("broken"):
+            raise OMCRuntimeError("broken")
+        replies = []
+        for statement in _STATEMENT.findall(expression):
+            if statement.startswith(f"{self.abort}("):
+                break  # the rest of the script is not evaluated
+            if reply := self.reply(statement):
+                replies.append(f"{reply}\n")
+        if self.calling is Calling.synchronous:
+            return "".join(replies)
+        return self._evaluate("".join(replies))
+
+    def reply(self, statement: str) -> str:
+        """Reply to `statement`, without the line feed"""
+        if statement.startswith('"'):
+            return statement
+        funcname, _, arguments = statement.partition("(")
+        reply = self.replies.get(funcname, self.default)
+        if isinstance(reply, str):
+            return reply
+        return reply(arguments[:-1])
+
+    async def _evaluate(self, reply: str) -> str:
+        await asyncio.sleep(0)
+        return reply
+
+
+@dataclass
+class Server:
+    """
+    ROUTER replying upper-cased expressions, unlike omc out of order
+
+    Every `batch` requests are answered in reverse order,
+    requests starting with `hang` are never answered
+    and those in `replies` are answered as such.
+    """
+
+    address: str
+    batch: int = 1
+    received: list[bytes] = field(default_factory=list)
+    replies: dict[bytes, bytes] = field(default_factory=dict)
+
+
+@contextmanager
+def serve(batch: int = 1) -> Generator[Server, None, None]:
+    context = zmq.Context()
+    router = context.socket(zmq.ROUTER)
+    port = router.bind_to_random_port("tcp://127.0.0.1")
+    server = Server(f"tcp://127.0.0.1:{port}", batch)
+    stop = threading.Event()
+
+    def reply() -> None:
+        requests = []
+        while not stop.is_set():
+            if not router.poll(10):
+                continue
+            peer, request_id, empty, expression = router.recv_multipart()
+            server.received.append(expression)
+            if expression.startswith(b"hang"):
+                continue
+            requests.append((peer, request_id, empty, expression))
+            if len(requests) == server.batch:
+                for peer, request_id, empty, expression in requests[::-1]:
+                    reply = server.replies.get(expression, expression.upper())
+                    router.send_multipart([peer, request_id, empty, reply])
+                requests.clear()
+
+    thread = threading.Thread(target=reply)
+    thread.start()
+    try:
+        yield server
+    finally:
+        stop.set()
+        thread.join()
+        router.close(linger=0)
+        context.term()
+
+
+@contextmanager
+def _fake_resource(address: str) -> Generator[_Resource, None, None]:
+    process = Popen(
+        [sys.executable, "-c", "import time; time.sleep(60)"],
+        stdout=PIPE,
+        encoding="utf-8",
+    )
+    with _terminating(process), _Sockets.open(Port(address)) as sockets:
+        yield _Resource(process, sockets)
+
+
+def open_interactive(
+    omc: Server, timeout: float | None = None, *, supervised: bool = False
+) -> Interactive[Synchronous]:
+    exit_stack = ExitStack()
+    slot = exit_stack.enter_context(
+        _Slot.open(partial(_fake_resource, omc.address), supervised=supervised)
+    )
+    return Interactive(exit_stack, slot, synchronous, timeout)
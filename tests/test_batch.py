@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from concurrent.futures import CancelledError
+
+import pytest
+
+from omc4py.batch import Batched
+from omc4py.exception import OMCRuntimeError
+from omc4py.protocol import asynchronous, synchronous
+from omc4py.v_1_24 import GenericSession
+
+from . import StubOMC
+
+REPLIES = {
+    "getVersion": '"OpenModelica 1.24.0"',
+    "isPackage": "true",
+    "getClassRestriction": '"model"',
+}
+
+
+def test_batch() -> None:
+    stub = StubOMC(synchronous, REPLIES)
+    session = GenericSession(stub)
+    with session.batch() as b:
+        version = b.getVersion()
+        restriction = b.getClassRestriction("A")
+        nothing = b.threadWorkFailed()  # no output
+        is_package = b.isPackage("A")
+        assert stub.expressions == []
+
+    assert len(stub.expressions) == 1
+    assert stub.expressions[0].startswith("getVersion();")
+    assert version.result() == "OpenModelica 1.24.0"
+    assert restriction.result() == "model"
+    assert is_package.result() is True
+    assert nothing.result() is None
+
+
+@pytest.mark.asyncio
+async def test_batch_asynchronous() -> None:
+    stub = StubOMC(asynchronous, REPLIES)
+    session = GenericSession(stub)
+    async with session.batch() as b:
+        versions = [b.getVersion() for _ in range(3)]
+    assert len(stub.expressions) == 1
+    assert [v.result() for v in versions] == ["OpenModelica 1.24.0"] * 3
+
+
+def test_batch_not_sent() -> None:
+    stub = StubOMC(synchronous, REPLIES)
+    session = GenericSession(stub)
+    with session.batch():
+        pass
+    assert stub.expressions == []
+
+    versions = []
+
+    def fail(b: Batched) -> None:
+        versions.append(b.getVersion())
+        raise ZeroDivisionError
+
+    with pytest.raises(ZeroDivisionError), session.batch() as b:
+        fail(b)
+    assert stub.expressions == []
+    with pytest.raises(CancelledError):
+        versions[0].result()
+
+
+def test_batch_unexpected_reply() -> None:
+    session = GenericSession(StubOMC(synchronous, REPLIES, abort="isPackage"))
+    batch = session.batch()
+    version = batch.batched.getVersion()
+    batch.batched.isPackage("A")
+    with pytest.raises(OMCRuntimeError), batch:
+        pass
+    with pytest.raises(OMCRuntimeError):
+        version.result()
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from omc4py.cache import CacheInfo, DiskCache
+from omc4py.protocol import Synchronous, asynchronous, synchronous
+from omc4py.v_1_24 import GenericSession
+
+from . import StubOMC, open_interactive, serve
+
+REPLIES = {
+    "isPackage": "true",
+    "getClassRestriction": '"model"',
+    "loadString": "true",
+    "getErrorString": '""',
+    "setComponentModifierValue": "",
+}
+
+
+def test_cached() -> None:
+    stub = StubOMC(synchronous, REPLIES, "true")
+    session = GenericSession(stub)
+    assert session.cache_info() is None
+
+    cached = session.cached()
+    assert cached.isPackage("A") is True
+    assert cached.isPackage("A") is True
+    assert cached.isPackage("B") is True
+    assert cached.getErrorString() == ""
+    assert cached.getErrorString() == ""
+    assert stub.expressions == [
+        "isPackage(A)",
+        "isPackage(B)",
+        "getErrorString()",
+        "getErrorString()",
+    ]
+    assert cached.cache_info() == CacheInfo(
+        hits=1, misses=2, maxsize=1024, currsize=2
+    )
+
+    # shared by the synchronous/asynchronous variants of the session
+    assert cached.asynchronous.cache_info() == cached.cache_info()
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda session: session.loadString("model A end A;"),
+        lambda session: session.setComponentModifierValue(),
+        lambda session: session.clearProgram(),
+    ],
+)
+def test_cached_invalidation(mutate: Callable[[Any], Any]) -> None:
+    stub = StubOMC(synchronous, REPLIES, "true")
+    cached = GenericSession(stub).cached()
+    cached.isPackage("A")
+    mutate(cached)
+    assert cached.cache_info().currsize == 0  # type: ignore
+    cached.isPackage("A")
+    assert stub.expressions.count("isPackage(A)") == 2
+
+
+def test_cached_batch_invalidates() -> None:
+    stub = StubOMC(synchronous, REPLIES, "true")
+    cached = GenericSession(stub).cached()
+    cached.isPackage("A")
+    with cached.batch() as b:
+        b.isPackage("A")
+        b.loadString("model A end A;")
+    assert cached.cache_info().currsize == 0  # type: ignore
+
+
+def test_cached_lru() -> None:
+    stub = StubOMC(synchronous, REPLIES, "true")
+    cached = GenericSession(stub).cached(maxsize=2)
+    for name in ["A", "B", "A", "C", "A", "B"]:
+        cached.getClassRestriction(name)
+    assert stub.expressions == [
+        "getClassRestriction(A)",
+        "getClassRestriction(B)",
+        "getClassRestriction(C)",
+        "getClassRestriction(B)",
+    ]
+    assert cached.cache_info() == CacheInfo(
+        hits=2, misses=4, maxsize=2, currsize=2
+    )
+
+
+def test_cached_restarted() -> None:
+    with serve() as omc:
+        omc.replies[b"isPackage(A)"] = b"true\n"
+        omc.replies[b"getVersion()"] = b'"OpenModelica 1.24.0"\n'
+        interactive = open_interactive(omc, supervised=True)
+        with GenericSession(interactive).cached() as cached:
+            assert cached.isPackage("A") is True
+            assert cached.isPackage("A") is True
+            assert omc.received == [b"isPackage(A)"]
+
+            # a new omc, which may not have `A` anymore
+            interactive._resource.process.kill()
+            interactive._resource.process.wait()
+            assert cached.getVersion() == "OpenModelica 1.24.0"
+            assert cached.isPackage("A") is True
+            assert cached.isPackage("A") is True
+            assert omc.received[-2:] == [b"getVersion()", b"isPackage(A)"]
+
+            interactive.recycle("for the test")
+            assert cached.isPackage("A") is True
+            assert omc.received[-1:] == [b"isPackage(A)"]
+            assert omc.received.count(b"isPackage(A)") == 3
+            assert len(interactive.restarts) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_asynchronous() -> None:
+    stub = StubOMC(asynchronous, REPLIES, "true")
+    cached = GenericSession(stub).cached()
+    assert await cached.isPackage("A") is True
+    assert await cached.isPackage("A") is True
+    assert stub.expressions == ["isPackage(A)"]
+    assert cached.synchronous.isPackage("A") is True
+    assert stub.expressions == ["isPackage(A)"]
+
+
+def _library(source: str | None) -> StubOMC[Synchronous]:
+    replies = dict(
+        REPLIES,
+        getVersion='"OpenModelica 1.24.0"',
+        getLoadedLibraries='{{"Lib","1.0.0"}}',
+        getClassNames="{Lib}",
+        getSourceFile='""' if source is None else f'"{source}"',
+    )
+    return StubOMC(synchronous, replies, "true")
+
+
+def test_disk_cache(tmp_path: Path) -> None:
+    package = tmp_path / "Lib" / "package.mo"
+    package.parent.mkdir()
+    package.write_text("package Lib end Lib;")
+
+    with DiskCache.open(tmp_path / "cache" / "interface.sqlite") as store:
+        first = _library(package.as_posix())
+        GenericSession(first).cached(store=store).isPackage("Lib")
+        assert first.expressions.count("isPackage(Lib)") == 1
+
+        # a later session of the same program asks omc for its fingerprint
+        second = _library(package.as_posix())
+        cached = GenericSession(second).cached(store=store)
+        assert cached.isPackage("Lib") is True
+        assert cached.isPackage("Lib") is True
+        assert "isPackage(Lib)" not in second.expressions
+        assert cached.cache_info().hits == 2  # type: ignore
+
+        # a changed library is another program
+        (package.parent / "A.mo").write_text("model A end A;")
+        third = _library(package.as_posix())
+        GenericSession(third).cached(store=store).isPackage("Lib")
+        assert "isPackage(Lib)" in third.expressions
+
+    with DiskCache.open(tmp_path / "cache" / "interface.sqlite") as store:
+        fourth = _library(package.as_posix())
+        GenericSession(fourth).cached(store=store).isPackage("Lib")
+        assert "isPackage(Lib)" not in fourth.expressions
+
+
+def test_disk_cache_without_source(tmp_path: Path) -> None:
+    with DiskCache.open(tmp_path / "interface.sqlite") as store:
+        for _ in range(2):
+            stub = _library(None)  # e.g. by `loadString`
+            GenericSession(stub).cached(store=store).isPackage("Lib")
+            assert "isPackage(Lib)" in stub.expressions
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_asynchronous(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    package = tmp_path / "Lib.mo"
+    package.write_text("package Lib end Lib;")
+    # nothing blocks the event loop on omc
+    monkeypatch.setattr(
+        StubOMC, "synchronous", property(lambda _: pytest.fail("blocking"))
+    )
+
+    with DiskCache.open(tmp_path / "interface.sqlite") as store:
+        for hits in (0, 1):
+            stub = _library(package.as_posix()).asynchronous
+            cached = GenericSession(stub).cached(store=store)
+            assert await cached.isPackage("Lib") is True
+            assert cached.cache_info().hits == hits  # type: ignore
+            assert "getSourceFile(Lib)" in stub.expressions
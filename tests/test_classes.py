@@ -119,6 +119,56 @@ def test_typename(typename: TypeName, last_identifier: VariableName) -> None:
         assert typename.parent == typename.parents[0]
 
 
+@pytest.mark.parametrize(
+    "s",
+    [
+        "A",
+        ".A.B",
+        "A.$Code.B",
+        "A . B",
+        "A.'b.c'",
+        "A.model",
+        "der",
+        "A..B",
+        "A.",
+        "1A",
+    ],
+)
+def test_typename_fast_path(s: str) -> None:
+    from omc4py.openmodelica import _is_variablename, _split_typename
+    from omc4py.parser import is_variablename, split_typename_parts
+
+    try:
+        expected = split_typename_parts(s)
+    except Exception as error:  # noqa: BLE001
+        with pytest.raises(type(error)):
+            _split_typename(s)
+    else:
+        assert _split_typename(s) == expected
+    assert _is_variablename(s) == is_variablename(s)
+
+
+def test_typename_keywords() -> None:
+    from modelicalang import v3_4
+
+    from omc4py.openmodelica import _KEYWORDS
+
+    assert frozenset(v3_4.Syntax._keywords_) == _KEYWORDS
+
+
+def test_typename_interned() -> None:
+    typename = TypeName("A.B.C")
+    assert TypeName("A.B.C") is typename
+    assert TypeName("A", "B", "C") is typename
+    assert TypeName("A.B") / "C" is typename
+    assert typename.parent is TypeName("A.B")
+    assert typename.parents is typename.parents
+    assert typename.parents[1:] == typename.parent.parents
+    assert pickle.loads(pickle.dumps(typename)) is typename
+    assert TypeName(".A.B.C").parents[-1] is TypeName(".")
+    assert TypeName("A.B.C").parents[-1] is TypeName()
+
+
 def test_absolute_typename() -> None:
     typename = TypeName("A.B.C.D")
     assert not typename.is_absolute
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+
+from omc4py.exception import OMCRuntimeError
+from omc4py.instrument import (
+    CallRecord,
+    LatencyHistogram,
+    instrument,
+)
+from omc4py.protocol import synchronous
+from omc4py.v_1_24 import GenericSession
+
+from . import StubOMC
+
+REPLIES = {
+    "getVersion": '"OpenModelica 1.24.0"',
+    "isPackage": "true",
+    "isModel": "garbage",
+}
+
+
+def test_instrument() -> None:
+    session = GenericSession(StubOMC(synchronous, REPLIES))
+    records: list[CallRecord] = []
+
+    with instrument(records.append):
+        assert session.isPackage("Modelica") is True
+        with pytest.raises(OMCRuntimeError), pytest.warns(Warning):
+            session.isModel("A")
+    session.getVersion()
+
+    assert [record.funcname for record in records] == ["isPackage", "isModel"]
+    ok, failed = records
+    assert ok.sent == len("isPackage(Modelica)")
+    assert ok.received == len("true\n")
+    assert ok.error is None
+    assert isinstance(failed.error, OMCRuntimeError)
+    assert all(
+        0 <= record.unparse <= record.total
+        and 0 <= record.omc <= record.total
+        and 0 <= record.parse <= record.total
+        for record in records
+    )
+
+
+def test_instrument_nested(caplog: pytest.LogCaptureFixture) -> None:
+    session = GenericSession(StubOMC(synchronous, REPLIES))
+    outer: list[CallRecord] = []
+    inner: list[CallRecord] = []
+
+    def fail(_: CallRecord) -> None:
+        raise ZeroDivisionError
+
+    with instrument(outer.append), caplog.at_level(logging.ERROR):
+        with instrument(fail, inner.append):
+            assert session.isPackage("A") is True
+        session.getVersion()
+
+    assert [record.funcname for record in outer] == ["isPackage", "getVersion"]
+    assert [record.funcname for record in inner] == ["isPackage"]
+    assert "Instrumentation of isPackage failed" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_instrument_asynchronous() -> None:
+    session = GenericSession(StubOMC(synchronous, REPLIES)).asynchronous
+    records: list[CallRecord] = []
+
+    async def call(name: str) -> bool:
+        with instrument(records.append):
+            return await session.isPackage(name)
+
+    assert list(await asyncio.gather(call("A"), call("B"))) == [True] * 2
+    assert await session.isPackage("C") is True
+    assert [record.sent for record in records] == [len("isPackage(A)")] * 2
+
+
+def test_instrument_batch() -> None:
+    session = GenericSession(StubOMC(synchronous, REPLIES))
+    records: list[CallRecord] = []
+
+    with instrument(records.append), session.batch() as b:
+        version = b.getVersion()
+        assert records == []
+    assert version.result() == "OpenModelica 1.24.0"
+    assert [record.funcname for record in records] == ["getVersion"]
+
+
+def test_latency_histogram() -> None:
+    histogram = LatencyHistogram()
+    for total in [3e-6, 3e-6, 5e-6, 1e-3]:
+        histogram(CallRecord("isPackage", 0.0, 10, total, 5, 0.0, None))
+    error = OMCRuntimeError("loadModel")
+    histogram(CallRecord("loadModel", 0.0, 20, 2.0, 6, 0.0, error))
+
+    stats = histogram.stats()
+    is_package = stats["isPackage"]
+    assert is_package.calls == 4
+    assert is_package.errors == 0
+    assert is_package.sent == 40
+    assert is_package.buckets == (0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 1)
+    assert is_package.quantile(0.5) == pytest.approx(4e-6)
+    assert is_package.quantile(0.99) == pytest.approx(1024e-6)
+    assert stats["loadModel"].errors == 1
+
+    lines = str(histogram).splitlines()
+    assert lines[0].startswith("function")
+    assert lines[1].startswith("loadModel")  # slowest in total first
+    assert lines[3].startswith("isPackage")
+    assert lines[4] == f"  < {'4us':>8} {'#' * 40} 2"
+    assert lines[5] == f"  < {'8us':>8} {'#' * 20:<40} 1"
+
+    histogram.clear()
+    assert histogram.stats() == {}
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Generator
+
+import pytest
+import zmq
+import zmq.asyncio
+
+from omc4py.exception import OMCRuntimeError, OMCTimeoutError
+from omc4py.interactive import (
+    Interactive,
+    _Pipeline,
+    _resource_pipelines,
+    _SharedContext,
+    call_timeout,
+    zmq_context,
+)
+from omc4py.protocol import Calling, Synchronous
+from tests import Server, open_interactive, serve
+
+
+@pytest.fixture
+def server() -> Generator[Server, None, None]:
+    with serve(batch=4) as server:
+        yield server
+
+
+@pytest.fixture
+def omc() -> Generator[Server, None, None]:
+    with serve(batch=1) as server:
+        yield server
+
+
+@pytest.fixture(autouse=True)
+def _check_interval(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("omc4py.interactive.CHECK_INTERVAL", 0.01)
+
+
+def _crash_later(interactive: Interactive[Synchronous]) -> None:
+    threading.Timer(0.1, interactive._resource.process.kill).start()
+
+
+@pytest.mark.asyncio
+async def test_pipeline(server: Server) -> None:
+    with zmq.asyncio.Context().socket(zmq.DEALER) as socket:
+        socket.connect(server.address)
+        pipeline = _Pipeline(socket)
+
+        expressions = [f"f{i}()" for i in range(8)]
+        replies = await asyncio.gather(
+            *(pipeline.evaluate(expression) for expression in expressions)
+        )
+        assert replies == [expression.upper() for expression in expressions]
+        assert sorted(server.received) == sorted(
+            expression.encode() for expression in expressions
+        )
+        assert pipeline.pending == {}
+        assert pipeline.drained.is_set()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_cancel(server: Server) -> None:
+    with zmq.asyncio.Context().socket(zmq.DEALER) as socket:
+        socket.connect(server.address)
+        pipeline = _Pipeline(socket)
+
+        cancelled = asyncio.ensure_future(pipeline.evaluate("cancelled()"))
+        await asyncio.sleep(0.05)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+
+        # the late reply of the cancelled request is dropped
+        replies = await asyncio.gather(
+            *(pipeline.evaluate(f"g{i}()") for i in range(3))
+        )
+        assert replies == ["G0()", "G1()", "G2()"]
+        assert pipeline.pending == {}
+        assert pipeline.drained.is_set()
+
+
+def test_shared_context(omc: Server) -> None:
+    with zmq_context() as context:
+        with open_interactive(omc) as first, open_interactive(omc) as second:
+            sockets = first._resource.sockets
+            assert first.evaluate("f()") == "F()"
+            # connected on first use only
+            assert list(sockets._connected) == [Calling.synchronous]
+            assert not second._resource.sockets._connected
+            assert sockets.synchronous.context.underlying == context.underlying
+        assert not context.closed
+
+
+def test_shared_context_terminated() -> None:
+    shared = _SharedContext()
+    with shared.use(2):
+        context = shared.synchronous
+        assert context.get(zmq.IO_THREADS) == 2
+        with shared.use():
+            assert shared.synchronous is context
+        with pytest.raises(ValueError, match="2 IO threads"), shared.use(4):
+            pass
+        assert not context.closed
+    assert context.closed
+    assert not shared.users
+
+
+def test_timeout(omc: Server) -> None:
+    with open_interactive(omc, timeout=0.1) as interactive:
+        stalled = interactive._resource
+        assert interactive.evaluate("f()") == "F()"
+
+        with pytest.raises(OMCTimeoutError):
+            interactive.evaluate("hang()")
+        assert interactive._resource is not stalled
+        assert stalled.process.poll() is not None
+        assert interactive.evaluate("f()") == "F()"
+
+        restarted = interactive._resource
+        with call_timeout(None):
+            assert interactive.evaluate("g()") == "G()"
+        assert interactive._resource is restarted
+
+
+def test_call_timeout(omc: Server) -> None:
+    with open_interactive(omc, timeout=None) as interactive:
+        stalled = interactive._resource
+        with pytest.raises(TimeoutError), call_timeout(0.1):
+            interactive.evaluate("hang()")
+        assert interactive._resource is not stalled
+
+
+def test_interrupted(omc: Server) -> None:
+    with open_interactive(omc, timeout=None) as interactive:
+        # as if a call were interrupted before its reply
+        socket = interactive._resource.sockets.synchronous
+        socket.send_multipart([b"interrupted", b"", b"interrupted()"])
+
+        assert interactive.evaluate("f()") == "F()"
+        assert omc.received == [b"interrupted()", b"f()"]
+
+
+@pytest.mark.asyncio
+async def test_timeout_asynchronous(omc: Server) -> None:
+    with open_interactive(omc, timeout=0.1) as interactive:
+        asynchronous = interactive.asynchronous
+        stalled = interactive._resource
+        assert await asynchronous.evaluate("f()") == "F()"
+
+        async def wait(timeout: float) -> str:
+            with call_timeout(timeout):
+                return await asynchronous.evaluate("hang()")
+
+        # a call waiting longer fails as well when omc is restarted
+        errors = await asyncio.gather(
+            wait(5), wait(0.1), return_exceptions=True
+        )
+        assert [type(error) for error in errors] == [OMCTimeoutError] * 2
+        assert interactive._resource is not stalled
+        assert await asynchronous.evaluate("f()") == "F()"
+
+
+def test_exited(omc: Server) -> None:
+    with open_interactive(omc, timeout=None) as interactive:
+        crashed = interactive._resource
+        _crash_later(interactive)
+        with pytest.raises(OMCRuntimeError, match="exited"):
+            interactive.evaluate("hang()")
+
+        # not supervised, omc stays dead
+        with pytest.raises(OMCRuntimeError, match="exited"):
+            interactive.evaluate("f()")
+        assert interactive._resource is crashed
+        assert not interactive.restarts
+
+
+def test_supervised(omc: Server) -> None:
+    with open_interactive(omc, timeout=None, supervised=True) as interactive:
+        setup = [
+            'cd("/tmp")',
+            "loadModel(Modelica)",
+            'setCommandLineOptions("-d=nogen")',
+        ]
+        for expression in [*setup, "cd()", "getVersion()"]:
+            interactive.evaluate(expression)
+        omc.received.clear()
+
+        # restarted and set up again on the next call
+        interactive._resource.process.kill()
+        interactive._resource.process.wait()
+        assert interactive.evaluate("f()") == "F()"
+        assert omc.received == [
+            expression.encode() for expression in setup
+        ] + [b"f()"]
+
+        # restarted while waiting for reply
+        _crash_later(interactive)
+        with pytest.raises(OMCRuntimeError, match="set up again"):
+            interactive.evaluate("hang()")
+        assert interactive.evaluate("f()") == "F()"
+
+        # unloaded classes are not loaded again
+        interactive.evaluate("clearProgram()")
+        omc.received.clear()
+        with pytest.raises(OMCTimeoutError), call_timeout(0.1):
+            interactive.evaluate("hang()")
+        assert omc.received == [b"hang()", b'cd("/tmp")', setup[2].encode()]
+
+        assert len(interactive.restarts) == 3
+        assert all(0 <= restart.total for restart in interactive.restarts)
+
+
+@pytest.mark.asyncio
+async def test_supervised_asynchronous(omc: Server) -> None:
+    with open_interactive(omc, timeout=None, supervised=True) as interactive:
+        asynchronous = interactive.asynchronous
+        await asynchronous.evaluate("loadModel(Modelica)")
+
+        _crash_later(interactive)
+        errors = await asyncio.gather(
+            asynchronous.evaluate("hang()"),
+            asynchronous.evaluate("hang()"),
+            return_exceptions=True,
+        )
+        assert [type(error) for error in errors] == [OMCRuntimeError] * 2
+        assert len(interactive.restarts) == 1
+        assert omc.received[-1] == b"loadModel(Modelica)"
+        assert await asynchronous.evaluate("f()") == "F()"
+
+
+@pytest.mark.asyncio
+async def test_recycle_asynchronous(omc: Server) -> None:
+    with open_interactive(omc, supervised=True) as interactive:
+        asynchronous = interactive.asynchronous
+
+        # no pipeline to wait for, nor to create
+        resource = interactive._resource
+        await asynchronous.recycle("unused")
+        assert resource not in _resource_pipelines
+
+        # calls in flight are answered by the old omc, then closed
+        resource = interactive._resource
+        calls = asyncio.gather(
+            *(asynchronous.evaluate(f"f{i}()") for i in range(3))
+        )
+        await asyncio.sleep(0)
+        await asynchronous.recycle("used")
+        assert await calls == ["F0()", "F1()", "F2()"]
+        assert _resource_pipelines[resource].drained.is_set()
+        assert len(interactive.restarts) == 2
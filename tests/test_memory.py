@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Generator
+
+import pytest
+
+from omc4py.memory import MemoryBoundedInteractive
+from omc4py.offload import OffloadingInteractive
+from omc4py.parser import _quote_py_string
+from omc4py.v_1_24 import GenericSession
+from tests import Server, open_interactive, serve
+
+
+def _stats(heap: int, unmapped: int = 0) -> bytes:
+    return (
+        "record OpenModelica.Scripting.GC_PROFSTATS\n"
+        f"    heapsize_full = {heap},\n"
+        f"    free_bytes_full = {unmapped + 100},\n"
+        f"    unmapped_bytes = {unmapped},\n"
+        "    bytes_allocd_since_gc = 0,\n"
+        "    allocd_bytes_before_gc = 0,\n"
+        "    non_gc_bytes = 0,\n"
+        "    gc_no = 3,\n"
+        "    markers_m1 = 0,\n"
+        "    bytes_reclaimed_since_gc = 0,\n"
+        "    reclaimed_bytes_before_gc = 0\n"
+        "end OpenModelica.Scripting.GC_PROFSTATS;\n"
+    ).encode()
+
+
+@pytest.fixture
+def omc() -> Generator[Server, None, None]:
+    with serve() as server:
+        server.replies[b"GC_get_prof_stats()"] = _stats(1000)
+        server.replies[b"GC_gcollect_and_unmap()"] = b"\n"
+        server.replies[b"loadModel(Modelica)"] = b"true\n"
+        server.replies[b"getVersion()"] = b'"OpenModelica 1.24.0"\n'
+        yield server
+
+
+def test_memory_bounded(omc: Server) -> None:
+    interactive = open_interactive(omc, supervised=True)
+    with GenericSession(interactive).memory_bounded(2000, every=2) as session:
+        bounded = session.__omc_interactive__
+        assert isinstance(bounded, MemoryBoundedInteractive)
+
+        session.loadModel("Modelica")
+        session.getVersion()
+        assert [sample.action for sample in bounded.samples] == [""]
+        assert bounded.samples[0].heap == 1000
+        assert bounded.samples[0].free == 100
+
+        # reclaimed by GC
+        omc.replies[b"GC_get_prof_stats()"] = _stats(3000, unmapped=1500)
+        session.getVersion()
+        session.getVersion()
+        assert bounded.samples[-1].heap == 1500
+        assert not interactive.restarts
+
+        # recycled, set up again
+        omc.replies[b"GC_get_prof_stats()"] = _stats(3000)
+        pid = interactive._resource.process.pid
+        omc.received.clear()
+        session.getVersion()
+        session.getVersion()
+        assert [sample.action for sample in bounded.samples][-2:] == [
+            "collect",
+            "recycle",
+        ]
+        assert len(interactive.restarts) == 1
+        assert interactive.restarts[0].pid == pid
+        assert interactive._resource.process.pid != pid
+        assert omc.received[-1] == b"loadModel(Modelica)"
+
+
+@pytest.mark.asyncio
+async def test_memory_bounded_asynchronous(omc: Server) -> None:
+    interactive = open_interactive(omc, supervised=True)
+    with GenericSession(interactive).memory_bounded(2000, every=1) as session:
+        asynchronous = session.asynchronous
+        omc.replies[b"GC_get_prof_stats()"] = _stats(3000)
+
+        # calls in flight are not failed by recycling
+        versions = await asyncio.gather(
+            *(asynchronous.getVersion() for _ in range(5))
+        )
+        assert versions == ["OpenModelica 1.24.0"] * 5
+        assert len(interactive.restarts) == 1
+
+
+def test_memory_bounded_unsupervised(omc: Server) -> None:
+    with open_interactive(omc) as interactive, pytest.raises(ValueError):
+        GenericSession(interactive).memory_bounded(2000)
+
+
+def test_memory_bounded_offloaded(omc: Server) -> None:
+    interactive = open_interactive(omc, supervised=True)
+    offloaded = GenericSession(interactive).offloaded(threshold=10)
+    with offloaded.memory_bounded(2000, every=1) as session:
+        offloading = offloaded.__omc_interactive__
+        assert isinstance(offloading, OffloadingInteractive)
+        path = _quote_py_string((offloading.directory / "0.txt").as_posix())
+        loaded = f"loadString(readFile({path}))".encode()
+        omc.replies[loaded] = b"true\n"
+
+        # offloaded, then sampled
+        assert session.loadString("package P end P;")
+        assert omc.received == [loaded, b"GC_get_prof_stats()"]
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from collections.abc import Coroutine
+from dataclasses import dataclass, field
+from typing import Any, List, Union
+
+import pytest
+
+from omc4py import TypeName
+from omc4py.modelica import _call_plans, external
+from omc4py.protocol import (
+    Asynchronous,
+    Calling,
+    HasInteractive,
+    SupportsInteractiveProperty,
+    Synchronous,
+)
+
+
+@dataclass
+class Recorder:
+    reply: str
+    calling: Calling
+    expressions: list[str] = field(default_factory=list)
+
+    def evaluate(self, expression: str) -> Any:
+        self.expressions.append(expression)
+        if self.calling is Calling.synchronous:
+            return self.reply
+        return self._evaluate()
+
+    async def _evaluate(self) -> str:
+        return self.reply
+
+
+SelfType = Union[
+    SupportsInteractiveProperty[Synchronous],
+    SupportsInteractiveProperty[Asynchronous],
+]
+
+
+@external("getClassNames")
+def getClassNames(
+    self: SelfType,  # noqa: ARG001
+    class_: Union[TypeName, str, None] = None,  # noqa: ARG001
+    recursive: Union[bool, None] = None,  # noqa: ARG001
+) -> Union[List[TypeName], Coroutine[None, None, List[TypeName]]]:
+    return ...  # type: ignore
+
+
+@external("isPackage")
+def isPackage(
+    self: SelfType,  # noqa: ARG001
+    cl: Union[TypeName, str],  # noqa: ARG001
+) -> Union[bool, Coroutine[None, None, bool]]:
+    return ...  # type: ignore
+
+
+@external("setCommandLineOptions", rename={"value": "val"})
+def setCommandLineOptions(
+    self: SelfType,  # noqa: ARG001
+    option: str,  # noqa: ARG001
+    value: Union[str, None] = None,  # noqa: ARG001
+) -> Union[bool, Coroutine[None, None, bool]]:
+    return ...  # type: ignore
+
+
+def _self(reply: str, calling: Calling = Calling.synchronous) -> Any:
+    return HasInteractive(Recorder(reply, calling))  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "args, kwargs, expression",
+    [
+        ((), {}, "getClassNames()"),
+        (("A",), {}, "getClassNames(class_=A)"),
+        ((None, True), {}, "getClassNames(recursive=true)"),
+        (
+            (),
+            {"recursive": False, "class_": "A.B"},
+            "getClassNames(class_=A.B,recursive=false)",
+        ),
+    ],
+)
+def test_call_arguments(
+    args: tuple[Any, ...], kwargs: dict[str, Any], expression: str
+) -> None:
+    self = _self("{A,B}")
+    assert getClassNames(self, *args, **kwargs) == [
+        TypeName("A"),
+        TypeName("B"),
+    ]
+    assert self.__omc_interactive__.expressions == [expression]
+
+
+def test_call_positional() -> None:
+    self = _self("true")
+    assert isPackage(self, "A") is True
+    assert isPackage(self, cl=TypeName("A.B")) is True
+    assert self.__omc_interactive__.expressions == [
+        "isPackage(A)",
+        "isPackage(A.B)",
+    ]
+
+
+def test_call_rename() -> None:
+    self = _self("true")
+    assert setCommandLineOptions(self, "-d=newInst", value="x")
+    assert self.__omc_interactive__.expressions == [
+        'setCommandLineOptions("-d=newInst",val="x")',
+    ]
+
+
+@pytest.mark.parametrize(
+    "args, kwargs",
+    [
+        ((), {}),
+        (("A", "B"), {}),
+        (("A",), {"cl": "B"}),
+        ((), {"class_": "A"}),
+    ],
+)
+def test_call_invalid_arguments(
+    args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> None:
+    self = _self("true")
+    with pytest.raises(TypeError):
+        isPackage(self, *args, **kwargs)
+    assert self.__omc_interactive__.expressions == []
+
+
+@pytest.mark.asyncio
+async def test_call_asynchronous() -> None:
+    self = _self("true", Calling.asynchronous)
+    called = isPackage(self, "A")
+    assert isinstance(called, Coroutine)
+    assert (await called) is True
+    assert self.__omc_interactive__.expressions == ["isPackage(A)"]
+
+
+def test_call_plan_is_cached() -> None:
+    self = _self("true")
+    isPackage(self, "A")
+    plans = dict(_call_plans)
+    isPackage(self, "B")
+    assert dict(_call_plans) == plans
+    assert any(plan.funcname == "isPackage" for plan in plans.values())
+
+
+def test_lazy_import() -> None:
+    script = """
+import sys
+import omc4py.v_1_24 as v
+scripting = "omc4py.v_1_24.OpenModelica.Scripting"
+assert isinstance(v.OpenModelica, type)
+assert scripting not in sys.modules
+assert v.GenericSession.getVersion.__name__ == "getVersion"
+assert scripting in sys.modules
+assert isinstance(v.OpenModelica, type)  # not replaced by the submodule
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)  # noqa: S603
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import re
+import shutil
+from pathlib import Path
+from typing import Any, get_type_hints
+
+import pytest
+
+from omc4py.exception import OMCRuntimeError
+from omc4py.instrument import CallRecord, instrument
+from omc4py.modelica import _extract_return_type
+from omc4py.offload import OFFLOADED_FUNCTIONS, OffloadingInteractive
+from omc4py.openmodelica import TypeName
+from omc4py.parser import _quote_py_string, _unquote_modelica_string
+from omc4py.protocol import HasInteractive, Synchronous, synchronous
+from omc4py.v_1_24 import GenericSession
+
+from . import Reply, StubOMC, open_interactive, serve
+
+# e.g. backslashes and quotes to escape, and non-ASCII
+PACKAGE = 'package P "\\\\ é"\n  model M end M;\nend P;\n' * 100
+
+
+def _stub(program: list[str]) -> StubOMC[Synchronous]:
+    """Evaluate `loadString`, `list`, `readFile` and `writeFile` like omc"""
+    replies: dict[str, Reply] = {}
+    stub = StubOMC(synchronous, replies)
+    errors: list[str] = []
+
+    def load_string(arguments: str) -> str:
+        program[0] = _unquote_modelica_string(stub.reply(arguments))
+        return "true"
+
+    def read_file(arguments: str) -> str:
+        path = Path(_unquote_modelica_string(arguments))
+        return _quote_py_string(path.read_text(encoding="utf-8"))
+
+    def write_file(arguments: str) -> str:
+        matched = re.match(r'("[^"]*"), (.*)', arguments)
+        assert matched is not None
+        path, content = matched.groups()
+        try:
+            Path(_unquote_modelica_string(path)).write_text(
+                _unquote_modelica_string(stub.reply(content)),
+                encoding="utf-8",
+            )
+        except OSError as error:
+            errors.append(f"Error: {error}\n")
+            return "false"
+        return "true"
+
+    def get_error_string(_: str) -> str:
+        message = "".join(errors)
+        errors.clear()
+        return _quote_py_string(message)
+
+    replies.update(
+        {
+            "getClassNames": "{P}",
+            "getErrorString": get_error_string,
+            "list": lambda _: _quote_py_string(program[0]),
+            "loadString": load_string,
+            "readFile": read_file,
+            "writeFile": write_file,
+        }
+    )
+    return stub
+
+
+def _directory(session: HasInteractive[Any]) -> Path:
+    offloading = session.__omc_interactive__
+    assert isinstance(offloading, OffloadingInteractive)
+    return offloading.directory
+
+
+def test_offloaded() -> None:
+    program = [""]
+    stub = _stub(program)
+    with GenericSession(stub).offloaded(threshold=1000) as session:
+        directory = _directory(session)
+        assert session.loadString(PACKAGE)
+        assert program[0] == PACKAGE
+        # the content of the file, not a literal to parse
+        assert session.list() == PACKAGE
+        # kept for `loadString` to be replayed, the result is removed
+        (loaded,) = directory.iterdir()
+        assert loaded.read_text(encoding="utf-8") == PACKAGE
+
+        assert stub.expressions[0].startswith("loadString(readFile(")
+        assert stub.expressions[1].startswith("writeFile(")
+        assert PACKAGE[:100] not in "".join(stub.expressions)
+
+        # small ones go as such
+        assert session.loadString("package Q end Q;")
+        assert stub.expressions[-1] == 'loadString("package Q end Q;")'
+    assert not directory.exists()
+
+
+@pytest.mark.asyncio
+async def test_offloaded_asynchronous() -> None:
+    stub = _stub([""]).asynchronous
+    with GenericSession(stub).offloaded(threshold=1000) as session:
+        assert await session.loadString(PACKAGE)
+        assert await session.list() == PACKAGE
+        assert len(list(_directory(session).iterdir())) == 1
+
+
+def test_offloaded_cached() -> None:
+    stub = _stub([""])
+    offloaded = GenericSession(stub).offloaded(threshold=1000)
+    for session in [offloaded.cached(), offloaded.cached().offloaded()]:
+        stub.expressions.clear()
+        assert session.loadString(PACKAGE)
+        assert session.list() == PACKAGE
+        assert session.getClassNames() == [TypeName("P")]
+        assert session.getClassNames() == [TypeName("P")]  # from the cache
+        assert [expression[:11] for expression in stub.expressions] == [
+            "loadString(",
+            'writeFile("',
+            "getClassNam",
+        ]
+        assert PACKAGE[:100] not in "".join(stub.expressions)
+
+
+def test_offloaded_supervised() -> None:
+    with serve() as omc:
+        interactive = open_interactive(omc, supervised=True)
+        session = GenericSession(interactive).offloaded(threshold=1000)
+        with session:
+            path = _directory(session) / "0.txt"
+            loaded = (
+                f"loadString(readFile({_quote_py_string(path.as_posix())}))"
+            )
+            omc.replies[loaded.encode()] = b"true\n"
+            omc.replies[b"getVersion()"] = b'"OpenModelica 1.24.0"\n'
+            assert session.loadString(PACKAGE)
+
+            # set up again from the same file
+            interactive._resource.process.kill()
+            interactive._resource.process.wait()
+            assert session.getVersion() == "OpenModelica 1.24.0"
+            assert omc.received == [loaded.encode()] * 2 + [b"getVersion()"]
+            assert path.read_text(encoding="utf-8") == PACKAGE
+
+
+def test_offloaded_unwritten() -> None:
+    stub = _stub([""])
+    with GenericSession(stub).offloaded() as session:
+        assert session.list() == ""  # empty file
+
+        # written nowhere, raised without evaluating it again
+        shutil.rmtree(_directory(session))
+        with pytest.raises(OMCRuntimeError, match="No such file"):
+            session.list()
+        assert stub.expressions[-2].startswith("writeFile(")
+        assert stub.expressions[-1] == "getErrorString()"
+
+
+@pytest.mark.parametrize("funcname", sorted(OFFLOADED_FUNCTIONS))
+def test_offloaded_functions(funcname: str) -> None:
+    # only `String` results can be read back from a file as such
+    hints = get_type_hints(getattr(GenericSession, funcname))
+    assert _extract_return_type(hints["return"]) is str
+
+
+def test_offloaded_instrumented() -> None:
+    records: list[CallRecord] = []
+    session = GenericSession(_stub([""])).offloaded(threshold=1000)
+    with session, instrument(records.append):
+        assert session.loadString(PACKAGE)
+        assert session.list() == PACKAGE
+    assert [record.funcname for record in records] == ["loadString", "list"]
+    assert records[0].sent < 1000
+    assert records[1].received == len(PACKAGE.encode())
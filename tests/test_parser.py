@@ -4,19 +4,32 @@ import collections.abc
 import os
 import types
 import typing
-from collections.abc import Generator, Iterable
+from collections.abc import Generator, Hashable, Iterable
 from contextlib import suppress
 from dataclasses import dataclass
 from itertools import product
-from typing import Any, List, Literal, NamedTuple, Sequence, TypeVar, Union
+from typing import (
+    Any,
+    List,
+    Literal,
+    NamedTuple,
+    Sequence,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import pytest
+from exceptiongroup import ExceptionGroup
 
 import omc4py.protocol
 from omc4py import TypeName, VariableName
+from omc4py.exception import OMCError, OMCRuntimeError, OMCWarning
 from omc4py.modelica import enumeration, record
-from omc4py.openmodelica import Component
+from omc4py.openmodelica import Component, ComponentTable
 from omc4py.parser import (
+    _decode,
+    _get_decoder,
     _get_ndim,
     _get_type,
     _is_component,
@@ -29,7 +42,11 @@ from omc4py.parser import (
     _is_primitive,
     _is_sequence,
     _is_union,
+    _parse,
     _ScalarType,
+    _unparse,
+    _Unsupported,
+    ndarray_decoding,
     parse,
     unparse,
 )
@@ -457,7 +474,7 @@ def test_cast(typ: Any, val: Any, expected: Any) -> None:
     assert parse(typ, unparse(typ, val)) == expected
 
 
-@pytest.mark.parametrize(
+parse_examples = pytest.mark.parametrize(
     "annotation," "literal," "expected,",
     [
         (None, "", None),
@@ -930,6 +947,271 @@ end OpenModelica.Scripting.SourceInfo;
         ),
     ],
 )
+
+
+@parse_examples
 def test_parse(annotation: Any, literal: str, expected: Any) -> None:
     assert parse(annotation, literal) == expected
     assert parse(annotation, unparse(annotation, expected)) == expected
+
+
+@parse_examples
+def test_compiled_unparse(
+    annotation: Any,
+    literal: str,  # noqa: ARG001
+    expected: Any,
+) -> None:
+    assert unparse(annotation, expected) == _unparse(
+        _get_type(annotation), _get_ndim(annotation), (), expected
+    )
+
+
+@parse_examples
+def test_fast_parse(annotation: Any, literal: str, expected: Any) -> None:
+    root_type, root_ndim = _get_type(annotation), _get_ndim(annotation)
+    decoder = _get_decoder(cast(Hashable, root_type), root_ndim)
+
+    assert decoder is not None
+    fast = _decode(decoder, literal)
+    slow = _parse(root_type, root_ndim, None, literal)
+    assert fast == slow == expected
+    assert repr(fast) == repr(slow)
+
+
+@pytest.mark.parametrize(
+    "annotation," "literal," "expected,",
+    [
+        (
+            Component,
+            '{A,a,"","public",false,false,false,false,'
+            '"unspecified","none","unspecified",{n + 1, 2, :}}',
+            Component(
+                className=TypeName("A"),
+                name=VariableName("a"),
+                comment="",
+                protected="public",
+                isFinal=False,
+                isFlow=False,
+                isStream=False,
+                isReplaceable=False,
+                variability="unspecified",
+                innerOuter="none",
+                inputOutput="unspecified",
+                dimensions=["n+1", "2", ":"],
+            ),
+        ),
+        (List[List[None]], "{{}}", [[None]]),
+    ],
+)
+def test_fast_parse_fallback(
+    annotation: Any, literal: str, expected: Any
+) -> None:
+    root_type, root_ndim = _get_type(annotation), _get_ndim(annotation)
+    decoder = _get_decoder(cast(Hashable, root_type), root_ndim)
+
+    if decoder is not None:
+        with pytest.raises(_Unsupported):
+            _decode(decoder, literal)
+    assert parse(annotation, literal) == expected
+
+
+@pytest.mark.parametrize(
+    "literal",
+    [
+        "{}",
+        """\
+{
+    {.A, a, "", "public", false, false, false, false,
+     "unspecified", "none", "unspecified", {:, :}},
+    {B.C, b, "comment", "protected", true, true, false, true,
+     "parameter", "outer", "output", {2, n}},
+    {.A, $c, "", "public", false, false, true, false,
+     "discrete", "inner", "input", {}}
+}""",
+        # left to the PEG parser
+        '{{A,a,"","public",false,false,false,false,'
+        '"unspecified","none","unspecified",{n + 1, 2, :}}}',
+    ],
+)
+def test_parse_component_table(literal: str) -> None:
+    components = parse(List[Component], literal)
+    table = parse(ComponentTable, literal)
+
+    assert isinstance(table, ComponentTable)
+    assert list(table) == components
+    assert table[::-1] == components[::-1]
+    assert ComponentTable.from_components(components) == table
+    assert len(table.classNames) == len(
+        {component.className for component in components}
+    )
+    # interned, as any `TypeName`
+    assert all(
+        typename is TypeName(str(typename)) for typename in table.classNames
+    )
+    assert [table.name[i] for i in table.where(table.FLOW)] == [
+        str(component.name) for component in components if component.isFlow
+    ]
+
+
+def test_parse_component_table_error() -> None:
+    with pytest.raises(OMCError):
+        parse(ComponentTable, "Error")
+    with pytest.raises(ValueError, match="Unknown variability 'unknown'"):
+        parse(
+            ComponentTable,
+            '{{A,a,"","public",false,false,false,false,'
+            '"unknown","none","unspecified",{}}}',
+        )
+
+
+@pytest.mark.parametrize(
+    "annotation, literal",
+    [
+        (bool, "True"),
+        (int, "1.0"),
+        (List[int], "{1,}"),
+        (VariableName, "end"),
+        (TypeName, "A."),
+        (OneTwo, "OneTwo.Three"),
+        (SingleRecord, "record SingleRecord b = 0 end SingleRecord;"),
+    ],
+)
+def test_parse_error(annotation: Any, literal: str) -> None:
+    with pytest.warns(OMCWarning), pytest.raises(OMCRuntimeError):
+        parse(annotation, literal)
+
+
+@pytest.mark.parametrize(
+    "literal, shape",
+    [
+        ("{}", (0,)),
+        ("{{}}", (1, 0)),
+        ("{1.0, -2.5e3, 3}", (3,)),
+        ("{{1,2},{3,4},{5,6}}", (3, 2)),
+        ("{ {1e-3, 2},\n  {3, 4} }", (2, 2)),
+    ],
+)
+def test_parse_ndarray(literal: str, shape: tuple[int, ...]) -> None:
+    np = pytest.importorskip("numpy")
+    annotation = List[float] if len(shape) == 1 else List[List[float]]
+
+    expected = parse(annotation, literal)
+    with ndarray_decoding():
+        actual = parse(annotation, literal)
+
+    assert isinstance(actual, np.ndarray)
+    assert actual.dtype == np.float64
+    assert actual.shape == shape
+    assert actual.tolist() == expected
+
+
+def test_parse_ndarray_annotation() -> None:
+    np = pytest.importorskip("numpy")
+    typing = pytest.importorskip("numpy.typing")
+
+    integers = parse(typing.NDArray[np.int32], "{{1,2},{3,4}}")
+    assert integers.dtype == np.int32
+    assert integers.tolist() == [[1, 2], [3, 4]]
+
+    reals = parse(np.ndarray, "{1.5,2}")
+    assert reals.dtype == np.float64
+    assert reals.tolist() == [1.5, 2.0]
+
+
+@pytest.mark.parametrize(
+    "annotation, literal",
+    [
+        (List[List[float]], "{{1 2}}"),
+        (List[List[float]], "{{1,},{2,3}}"),
+        (List[int], "{1.5}"),
+        # rejected by the PEG parser too
+        (List[float], "{nan}"),
+        (List[float], "{inf,-inf}"),
+        (List[float], "{.5}"),
+    ],
+)
+def test_parse_ndarray_error(annotation: Any, literal: str) -> None:
+    pytest.importorskip("numpy")
+    with ndarray_decoding(), pytest.warns(OMCWarning), pytest.raises(
+        OMCRuntimeError
+    ):
+        parse(annotation, literal)
+
+
+def test_parse_ndarray_ragged() -> None:
+    pytest.importorskip("numpy")
+    with ndarray_decoding():
+        assert parse(List[List[float]], "{{1,2},{3}}") == [[1.0, 2.0], [3.0]]
+        assert parse(List[List[int]], "{{1},{}}") == [[1], []]
+
+
+def test_parse_ndarray_overflow() -> None:
+    np = pytest.importorskip("numpy")
+    typing = pytest.importorskip("numpy.typing")
+    with ndarray_decoding():
+        assert parse(List[int], "{-999999999999999999}").tolist() == [
+            -999999999999999999
+        ]
+        # not saturated to `np.iinfo(np.int64).max`
+        assert parse(List[int], "{99999999999999999999}") == [
+            99999999999999999999
+        ]
+    integers = parse(typing.NDArray[np.int32], "{2147483647}")
+    assert integers.dtype == np.int32
+    assert integers.tolist() == [2147483647]
+    with pytest.raises(OMCRuntimeError):
+        parse(typing.NDArray[np.int32], "{2147483648}")
+
+
+def test_ndarray_decoding_scope() -> None:
+    np = pytest.importorskip("numpy")
+    with ndarray_decoding():
+        assert isinstance(parse(List[float], "{1}"), np.ndarray)
+        with ndarray_decoding(enabled=False):
+            assert parse(List[float], "{1}") == [1.0]
+    assert parse(List[float], "{1}") == [1.0]
+
+
+@pytest.mark.parametrize(
+    "annotation, obj, literal",
+    [
+        (List[float], [1.0, None, 2], "{1.0,,2}"),
+        (List[str], ["a\\'b\n", None], r'{"a\\\'b\n",}'),
+        (
+            List[OneTwo],
+            [OneTwo.One, 2, "One"],
+            "{OneTwo.One,OneTwo.Two,OneTwo.One}",
+        ),
+        (SingleRecord, {"a": 1}, "record SingleRecord a=1 end SingleRecord;"),
+        (List[TwoInt], [(1, 2)], "{(1,2)}"),
+    ],
+)
+def test_unparse_compiled(annotation: Any, obj: Any, literal: str) -> None:
+    assert unparse(annotation, obj) == literal
+
+
+def test_unparse_error() -> None:
+    with pytest.raises(ExceptionGroup) as error:
+        unparse(List[SingleRecord], [SingleRecord(a=1), {}])
+    assert "obj[1]" in str(error.value.exceptions[0])
+
+
+def test_unparse_ndarray() -> None:
+    np = pytest.importorskip("numpy")
+    matrix = [[0.1, 1e16], [-2.5, 3.0]]
+    assert unparse(List[List[float]], np.array(matrix)) == unparse(
+        List[List[float]], matrix
+    )
+    assert unparse(List[int], np.arange(3)) == "{0,1,2}"
+    # printed by numpy, not as python float
+    single = np.array([0.1], dtype=np.float32)
+    assert unparse(List[float], single) == "{0.1}"
+
+
+def test_parse_string_escapes() -> None:
+    # a backslash followed by "n", not a newline
+    assert parse(str, r'"a\\nb\"c\nd"') == 'a\\nb"c\nd'
+    assert parse(str, unparse(str, "\\n\\'\n")) == "\\n\\'\n"
+    # long ones with many escapes, as of `list()`
+    line = 'model M "M" Real x "\\x"; end M;\n'
+    assert parse(str, unparse(str, line * 10_000)) == line * 10_000
@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from omc4py.exception import OMCRuntimeError
+from omc4py.pool import (
+    Outcome,
+    SessionPool,
+    Standby,
+    aparallel_map,
+    parallel_map,
+)
+from omc4py.protocol import Calling, synchronous
+from omc4py.session import BasicSession
+
+from . import StubOMC
+
+
+def _open() -> Any:
+    return BasicSession(StubOMC(synchronous, default='""'))
+
+
+def _stub(session: Any) -> StubOMC[Any]:
+    return session.__omc_interactive__  # type: ignore
+
+
+def test_pool_lease() -> None:
+    setup: list[Any] = []
+    with SessionPool.open(2, _open, setup=setup.append) as pool:
+        assert pool.size == 2
+        assert len(setup) == 2
+
+        with pool.lease() as first, pool.lease() as second:
+            assert first is not second
+            with pytest.raises(TimeoutError), pool.lease(timeout=0.01):
+                pass
+            _stub(first).expressions.clear()
+
+        # health-check on return
+        assert _stub(first).expressions == ["getErrorString()"]
+        with pool.lease() as third:
+            assert third in (first, second)
+
+    assert all(_stub(session).state["closed"] for session in setup)
+    with pytest.raises(OMCRuntimeError), pool.lease():
+        pass
+
+
+def test_pool_replace_unhealthy() -> None:
+    setup: list[Any] = []
+    with SessionPool.open(1, _open, setup=setup.append) as pool:
+        with pool.lease() as session:
+            _stub(session).state["broken"] = True
+        assert _stub(session).state["closed"]
+
+        with pool.lease() as replaced:
+            assert replaced is not session
+        assert setup == [session, replaced]
+
+
+def test_pool_reset() -> None:
+    def reset(session: Any) -> None:
+        if _stub(session).state.get("dirty"):
+            raise OMCRuntimeError("dirty")
+        session.__omc_interactive__.evaluate("clearVariables()")
+
+    with SessionPool.open(1, _open, reset=reset) as pool:
+        with pool.lease() as session:
+            pass
+        assert _stub(session).expressions[-1] == "clearVariables()"
+
+        with pool.lease() as session:
+            _stub(session).state["dirty"] = True
+        with pool.lease() as replaced:
+            assert replaced is not session
+
+
+def test_pool_setup_error() -> None:
+    def setup(session: Any) -> None:
+        sessions.append(session)
+        if len(sessions) == 2:
+            raise OMCRuntimeError("setup")
+
+    sessions: list[Any] = []
+    with pytest.raises(OMCRuntimeError):
+        SessionPool.open(3, _open, setup=setup)
+    assert len(sessions) == 3
+    assert all(_stub(session).state["closed"] for session in sessions)
+
+
+def test_pool_threads() -> None:
+    leased: set[Any] = set()
+    lock = threading.Lock()
+    overlaps: list[Any] = []
+
+    def work(pool: SessionPool) -> None:
+        for _ in range(20):
+            with pool.lease() as session:
+                with lock:
+                    if session in leased:
+                        overlaps.append(session)
+                    leased.add(session)
+                session.__omc_interactive__.evaluate("1")
+                with lock:
+                    leased.discard(session)
+
+    with SessionPool.open(2, _open) as pool:
+        threads = [
+            threading.Thread(target=work, args=(pool,)) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert overlaps == []
+
+
+@pytest.mark.asyncio
+async def test_pool_asynchronous() -> None:
+    active: set[int] = set()
+    overlaps: list[int] = []
+
+    async def work(pool: SessionPool) -> None:
+        async with pool.alease() as session:
+            interactive = _stub(session)
+            assert interactive.calling is Calling.asynchronous
+            if interactive.id in active:
+                overlaps.append(interactive.id)
+            active.add(interactive.id)
+            assert await interactive.evaluate("1") == '""\n'  # type: ignore
+            active.discard(interactive.id)
+
+    with SessionPool.open(2, _open) as pool:
+        await asyncio.gather(*(work(pool) for _ in range(16)))
+
+        # waiting task can be cancelled
+        async with pool.alease(), pool.alease():
+            task = asyncio.ensure_future(work(pool))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        await work(pool)
+
+    assert overlaps == []
+
+
+@pytest.mark.asyncio
+async def test_pool_cancel_filling() -> None:
+    opened: list[Any] = []
+    filling = threading.Event()
+    event = threading.Event()
+
+    def slow_open() -> Any:
+        if opened:  # replacement
+            filling.set()
+            event.wait()
+        opened.append(_open())
+        return opened[-1]
+
+    with SessionPool.open(1, slow_open) as pool:
+        with pool.lease() as session:
+            _stub(session).state["broken"] = True
+
+        async def lease() -> None:
+            async with pool.alease():
+                pass
+
+        task = asyncio.ensure_future(lease())
+        await asyncio.get_running_loop().run_in_executor(None, filling.wait)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        event.set()
+
+        # the new session is pooled, not leaked
+        async with pool.alease() as leased:
+            assert _stub(leased).id == _stub(opened[-1]).id
+    assert _stub(opened[-1]).state["closed"]
+
+
+def _check(session: Any, item: int) -> int:
+    if item % 3 == 0:
+        raise OMCRuntimeError(f"{item}")
+    assert session.__omc_interactive__.evaluate(f"{item}") == '""\n'
+    return item * 2
+
+
+def _verify(outcomes: list[Outcome[int, int]], n: int) -> None:
+    assert sorted(outcome.index for outcome in outcomes) == list(range(n))
+    for outcome in outcomes:
+        assert outcome.item == outcome.index
+        if outcome.item % 3 == 0:
+            assert isinstance(outcome.error, OMCRuntimeError)
+            with pytest.raises(OMCRuntimeError):
+                outcome.get()
+        else:
+            assert outcome.error is None
+            assert outcome.get() == outcome.item * 2
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_parallel_map(ordered: bool) -> None:
+    outcomes = list(
+        parallel_map(_open, _check, range(50), workers=3, ordered=ordered)
+    )
+    _verify(outcomes, 50)
+    if ordered:
+        assert [outcome.index for outcome in outcomes] == list(range(50))
+
+
+def test_parallel_map_pool() -> None:
+    with SessionPool.open(2, _open) as pool:
+        iterator = parallel_map(pool, _check, range(100))
+        assert next(iterator).index == 0
+        iterator.close()  # stop early, pool is still open
+
+        _verify(list(parallel_map(pool, _check, range(10))), 10)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_aparallel_map(ordered: bool) -> None:
+    async def check(session: Any, item: int) -> int:
+        if item % 3 == 0:
+            raise OMCRuntimeError(f"{item}")
+        assert await session.__omc_interactive__.evaluate(f"{item}") == '""\n'
+        return item * 2
+
+    outcomes = [
+        outcome
+        async for outcome in aparallel_map(
+            _open, check, range(50), workers=3, ordered=ordered
+        )
+    ]
+    _verify(outcomes, 50)
+    if ordered:
+        assert [outcome.index for outcome in outcomes] == list(range(50))
+
+    # synchronous `fn` on `AsyncSession`
+    with SessionPool.open(2, _open) as pool:
+        outcomes = [
+            outcome
+            async for outcome in aparallel_map(
+                pool,
+                lambda _, item: item * 2 if item % 3 else 1 // 0,
+                range(9),
+            )
+        ]
+    assert [outcome.result for outcome in outcomes] == [
+        None, 2, 4, None, 8, 10, None, 14, 16,
+    ]  # fmt: skip
+
+
+def test_standby() -> None:
+    setup: list[Any] = []
+    with Standby.open(2, _open, setup=setup.append) as standby:
+        session = standby.get(timeout=1)
+        assert session in setup
+        assert not _stub(session).state.get("closed")
+
+        # replacement is started in background
+        sessions = [standby.get(timeout=1) for _ in range(3)]
+        assert len({session, *sessions}) == 4
+        assert len(standby.startups) >= 4
+        assert all(0 <= startup.total for startup in standby.startups)
+
+    assert len(setup) == 6
+    standing = [s for s in setup if s not in (session, *sessions)]
+    assert all(_stub(s).state["closed"] for s in standing)
+    assert not any(_stub(s).state.get("closed") for s in sessions)
+    with pytest.raises(OMCRuntimeError):
+        standby.get()
+
+
+def test_standby_error() -> None:
+    def setup(session: Any) -> None:
+        if not calls:
+            calls.append(session)
+            raise OMCRuntimeError("setup")
+
+    calls: list[Any] = []
+    with Standby.open(1, _open, setup=setup) as standby:
+        with pytest.raises(OMCRuntimeError):
+            standby.get()
+        assert _stub(calls[0]).state["closed"]
+        standby.get(timeout=1).close()
+
+
+def test_standby_timeout() -> None:
+    event = threading.Event()
+
+    def setup(_: Any) -> None:
+        event.wait()
+
+    with Standby.open(1, _open, setup=setup) as standby:
+        with pytest.raises(TimeoutError):
+            standby.get(timeout=0.01)
+        event.set()
+        standby.get(timeout=1).close()
+
+
+def test_standby_timeout_waiting() -> None:
+    event = threading.Event()
+
+    def setup(_: Any) -> None:
+        event.wait()
+
+    with Standby.open(1, _open, setup=setup) as standby:
+        # the only session being started is awaited by another thread
+        waiting = threading.Thread(
+            target=lambda: standby.get(timeout=1).close()
+        )
+        waiting.start()
+        time.sleep(0.05)
+        with pytest.raises(TimeoutError):
+            standby.get(timeout=0.05)
+        event.set()
+        waiting.join()
+        standby.get(timeout=1).close()
+
+
+def test_pool_from_standby() -> None:
+    setup: list[Any] = []
+    with Standby.open(1, _open, setup=setup.append) as standby:  # noqa: SIM117
+        with SessionPool.open(2, standby.get) as pool:
+            with pool.lease() as session:
+                _stub(session).state["broken"] = True
+            with pool.lease() as first, pool.lease() as second:
+                assert session not in (first, second)
+    assert len(setup) == 4
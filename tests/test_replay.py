@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from omc4py import open_session
+from omc4py.interactive import Interactive
+from omc4py.protocol import Calling
+from omc4py.replay import Replies, executable
+from omc4py.trace import REPLY, REQUEST, Capture, read_capture
+
+MESSAGES = [
+    (REQUEST, 1, "getVersion()"),
+    (REPLY, 1, '"OpenModelica 1.24.0"\n'),
+    (REQUEST, 1, "isPackage(Modelica)"),
+    (REQUEST, 1, "getErrorString()"),  # pipelined
+    (REPLY, 1, "true\n"),
+    (REPLY, 1, '""\n'),
+    (REQUEST, 2, "getErrorString()"),
+    (REPLY, 2, '"Error: oops"\n'),
+]
+
+
+@pytest.fixture
+def capture(tmp_path: Path) -> Path:
+    path = tmp_path / "omc.capture"
+    with Capture.open(path) as file:
+        for direction, pid, payload in MESSAGES:
+            file.write(direction, pid, payload.encode())
+    return path
+
+
+def test_replies(capture: Path) -> None:
+    replies = Replies.load(capture)
+    assert replies.reply("isPackage(Modelica)") == "true\n"
+    assert replies.reply("getErrorString()") == '""\n'
+    assert replies.reply("getErrorString()") == '"Error: oops"\n'
+    assert replies.reply("getErrorString()") == '"Error: oops"\n'
+    assert replies.reply("loadModel(Modelica)") == ""
+
+
+def test_replay(capture: Path, tmp_path: Path) -> None:
+    omc = executable(capture, tmp_path)
+    recapture = tmp_path / "replayed.capture"
+    with open_session(omc, capture=recapture) as session:
+        assert session.isPackage("Modelica") is True
+        assert session.getErrorString() == ""
+        interactive = session.__omc_interactive__
+        assert isinstance(interactive, Interactive)
+        pid = interactive._resource.process.pid
+
+    assert [
+        (message.direction, message.pid, message.payload)
+        for message in read_capture(recapture)
+    ] == [
+        (REQUEST, pid, "getVersion()"),
+        (REPLY, pid, '"OpenModelica 1.24.0"\n'),
+        (REQUEST, pid, "isPackage(Modelica)"),
+        (REPLY, pid, "true\n"),
+        (REQUEST, pid, "getErrorString()"),
+        (REPLY, pid, '""\n'),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_replay_asynchronous(capture: Path, tmp_path: Path) -> None:
+    omc = executable(capture, tmp_path)
+    with Interactive.open(omc, Calling.asynchronous) as interactive:
+        replies = await asyncio.gather(
+            *(interactive.evaluate("isPackage(Modelica)") for _ in range(10))
+        )
+    assert replies == ["true\n"] * 10
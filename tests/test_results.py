@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+import pytest
+
+from omc4py.exception import OMCRuntimeError
+from omc4py.results import CSVResult, ResultFile, Variable
+from omc4py.v_1_24.OpenModelica.Scripting import SimulationResult
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+np = pytest.importorskip("numpy")
+
+Endian = Literal["<", ">"]
+
+NAMES = ["time", "x", "der(x)", "y", "k"]
+DESCRIPTIONS = ["Simulation time [s]", "state", "", "alias of -x", "gain"]
+DATA_INFO = [
+    [0, 1, 0, -1],
+    [2, 2, 0, -1],
+    [2, 3, 0, -1],
+    [2, -2, 0, -1],
+    [1, 2, 0, 0],
+]
+TIME = [0.0, 0.5, 1.0]
+# One row per column of `dataInfo`
+DATA_1 = [[0.0, 1.0], [2.0, 2.0]]
+DATA_2 = [[0.0, 0.5, 1.0], [1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+
+
+def _write_matrix(
+    f: Any,
+    name: str,
+    matrix: npt.NDArray[Any],
+    *,
+    text: bool = False,
+    endian: Endian = "<",
+) -> None:
+    """Write MAT v4 `matrix` of shape (mrows, ncols) in column-major"""
+    precision = ("f8", "f4", "i4", "i2", "u2", "u1").index(
+        matrix.dtype.str[1:]
+    )
+    type_ = (endian == ">") * 1000 + precision * 10 + text
+    mrows, ncols = matrix.shape
+    encoded = name.encode() + b"\0"
+    f.write(struct.pack(f"{endian}5i", type_, mrows, ncols, 0, len(encoded)))
+    f.write(encoded)
+    f.write(matrix.astype(matrix.dtype.newbyteorder(endian)).tobytes("F"))
+
+
+def _text(strings: list[str]) -> npt.NDArray[Any]:
+    width = max(map(len, strings))
+    text: npt.NDArray[Any] = np.array(
+        [list(s.ljust(width).encode()) for s in strings], dtype="u1"
+    )
+    return text
+
+
+def write_result(
+    path: Path,
+    *,
+    transposed: bool = True,
+    single: bool = False,
+    endian: Endian = "<",
+) -> Path:
+    layout = "binTrans" if transposed else "binNormal"
+    data_2 = np.array(DATA_2, dtype="f4" if single else "f8")
+    matrices = [
+        ("Aclass", _text(["Atrajectory", "1.1", "", layout]), True),
+        ("name", _text(NAMES), True),
+        ("description", _text(DESCRIPTIONS), True),
+        ("dataInfo", np.array(DATA_INFO, dtype="i4"), False),
+        ("data_1", np.array(DATA_1, dtype="f8"), False),
+        ("data_2", data_2, False),
+    ]
+    with path.open("wb") as f:
+        for name, matrix, text in matrices:
+            # binNormal: one row per variable (or time for data_*)
+            if name.startswith("data_"):
+                matrix = matrix.T  # noqa: PLW2901
+            if transposed and name != "Aclass":
+                matrix = matrix.T  # noqa: PLW2901
+            _write_matrix(f, name, matrix, text=text, endian=endian)
+    return path
+
+
+@pytest.mark.parametrize(
+    "transposed, single, endian",
+    [
+        (True, False, "<"),
+        (False, False, "<"),
+        (True, True, "<"),
+        (True, False, ">"),
+    ],
+)
+def test_result_file(
+    tmp_path: Path, transposed: bool, single: bool, endian: Endian
+) -> None:
+    path = write_result(
+        tmp_path / "model_res.mat",
+        transposed=transposed,
+        single=single,
+        endian=endian,
+    )
+    with ResultFile.open(path) as result:
+        assert list(result) == NAMES
+        assert len(result) == len(NAMES)
+        assert "x" in result
+        assert "z" not in result
+        assert result.variables["y"] == Variable(
+            name="y",
+            description="alias of -x",
+            block=2,
+            column=1,
+            negated=True,
+        )
+        assert result.variables["time"].block == 2
+
+        assert result.time.tolist() == TIME
+        assert result["time"].tolist() == TIME
+        assert result["x"].tolist() == [1.0, 2.0, 3.0]
+        assert result["der(x)"].tolist() == [4.0, 5.0, 6.0]
+        assert result["y"].tolist() == [-1.0, -2.0, -3.0]
+        assert result["k"].tolist() == [2.0, 2.0]
+
+        x = result["x"]
+        assert not x.flags.writeable
+        assert not x.flags.owndata
+        del x
+
+
+def test_result_file_invalid(tmp_path: Path) -> None:
+    path = tmp_path / "invalid.mat"
+    path.write_bytes(b"not a result file")
+    with pytest.raises(OMCRuntimeError):
+        ResultFile.open(path)
+
+    path = tmp_path / "empty.mat"
+    with path.open("wb") as f:
+        _write_matrix(f, "Aclass", _text(["Atrajectory"]), text=True)
+    with pytest.raises(OMCRuntimeError):
+        ResultFile.open(path)
+
+
+def _simulation_result(path: Path) -> SimulationResult:
+    return SimulationResult(
+        resultFile=f"{path}",
+        simulationOptions="",
+        messages="",
+        timeFrontend=0.0,
+        timeBackend=0.0,
+        timeSimCode=0.0,
+        timeTemplates=0.0,
+        timeCompile=0.0,
+        timeSimulation=0.0,
+        timeTotal=0.0,
+    )
+
+
+def test_result_file_from_simulation_result(tmp_path: Path) -> None:
+    path = write_result(tmp_path / "model_res.mat")
+    with ResultFile.open(_simulation_result(path)) as result:
+        assert list(result) == NAMES
+
+
+def write_csv(path: Path, rows: int) -> Path:
+    with path.open("w") as f:
+        f.write(",".join(f'"{name}"' for name in NAMES[:4]) + ",\n")
+        for i in range(rows):
+            f.write(f"{i / 2},{i},{i + 1},{-i},\n")
+    return path
+
+
+@pytest.mark.parametrize(
+    "variables, variableFilter, selected",
+    [
+        (None, None, ("time", "x", "der(x)", "y")),
+        (["y", "time"], None, ("y", "time")),
+        (None, r"der\(.*\)|time", ("time", "der(x)")),
+        (["y"], "x", ("y", "x")),
+        (None, "z", ()),
+    ],
+)
+def test_csv_result(
+    tmp_path: Path,
+    variables: list[str] | None,
+    variableFilter: str | None,
+    selected: tuple[str, ...],
+) -> None:
+    result = CSVResult.open(
+        _simulation_result(write_csv(tmp_path / "model_res.csv", rows=10))
+    )
+    assert result.names == ("time", "x", "der(x)", "y")
+    assert result.select(variables, variableFilter=variableFilter) == selected
+
+    chunks = list(
+        result.iter_chunks(
+            variables, variableFilter=variableFilter, chunksize=4
+        )
+    )
+    assert [chunk.shape for chunk in chunks] == [
+        (4, len(selected)),
+        (4, len(selected)),
+        (2, len(selected)),
+    ]
+    expected = {
+        "time": [i / 2 for i in range(10)],
+        "x": [float(i) for i in range(10)],
+        "der(x)": [float(i + 1) for i in range(10)],
+        "y": [float(-i) for i in range(10)],
+    }
+    columns = np.concatenate(chunks).T.tolist()
+    assert dict(zip(selected, columns)) == {
+        name: expected[name] for name in selected
+    }
+
+
+def test_csv_result_invalid(tmp_path: Path) -> None:
+    path = write_csv(tmp_path / "model_res.csv", rows=1)
+    with pytest.raises(KeyError):
+        CSVResult.open(path).select(["z"])
+
+    path.write_text("")
+    with pytest.raises(OMCRuntimeError):
+        CSVResult.open(path)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from omc4py import trace
+from omc4py.trace import REPLY, REQUEST, capture, preview, read_capture
+from tests import Server, open_interactive, serve
+
+logger = logging.getLogger("omc4py.interactive")
+
+
+@pytest.fixture
+def omc() -> Generator[Server, None, None]:
+    with serve(batch=1) as server:
+        yield server
+
+
+def test_preview(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(trace, "PREVIEW", 4)
+    assert preview("f()") == "f()"
+    assert preview("list()") == "list... (6 characters)"
+
+
+def test_disabled() -> None:
+    logger.setLevel(logging.INFO)
+    try:
+        assert not trace.enabled(logger)
+    finally:
+        logger.setLevel(logging.NOTSET)
+
+
+def test_debug_log(
+    omc: Server,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(trace, "PREVIEW", 8)
+    with open_interactive(omc) as interactive, caplog.at_level(
+        logging.DEBUG, logger.name
+    ):
+        interactive.evaluate("getComponents(Modelica.Blocks)")
+        pid = interactive._resource.process.pid
+
+    assert f"(pid={pid}) >>> getCompo... (30 characters)" in caplog.messages
+    assert f"(pid={pid}) <<< GETCOMPO... (30 characters)" in caplog.messages
+
+
+@pytest.mark.asyncio
+async def test_capture(omc: Server, tmp_path: Path) -> None:
+    path = tmp_path / "omc.capture"
+    with open_interactive(omc) as interactive:
+        pid = interactive._resource.process.pid
+        interactive.evaluate("f()")
+        with capture(path):
+            interactive.evaluate("g()")
+            await interactive.asynchronous.evaluate('h("é")')
+        interactive.evaluate("i()")
+
+    assert [
+        (message.direction, message.pid, message.payload)
+        for message in read_capture(path)
+    ] == [
+        (REQUEST, pid, "g()"),
+        (REPLY, pid, "G()"),
+        (REQUEST, pid, 'h("é")'),
+        (REPLY, pid, 'H("é")'),  # upper-cased as bytes
+    ]
+
+
+def test_capture_cut(tmp_path: Path) -> None:
+    path = tmp_path / "omc.capture"
+    with capture(path) as file:
+        file.write(REQUEST, 1, b"f()")
+        file.write(REPLY, 1, b"true")
+    path.write_bytes(path.read_bytes()[:-1])  # as if crashed meanwhile
+    assert [message.payload for message in read_capture(path)] == ["f()"]
+
+    path.write_bytes(b"garbage")
+    with pytest.raises(ValueError, match="not a capture"):
+        list(read_capture(path))
@@ -1,5 +1,5 @@
 from contextlib import AbstractContextManager as _AbstractContextManager
-from typing import Any
+from typing import Any, Sequence
 from typing import Literal as _Literal
 
 PAIR: _Literal[0]
@@ -12,20 +12,40 @@ ROUTER: _Literal[6]
 PULL: _Literal[7]
 PUSH: _Literal[8]
 
-class Context:
+IO_THREADS: _Literal[1]
+
+class Context(_AbstractContextManager["Context"]):
     def __init__(self, io_threads: int = ...) -> None: ...
+    @property
+    def underlying(self) -> int: ...
+    @property
+    def closed(self) -> bool: ...
+    def get(self, option: int) -> int: ...
     def socket(
         self,
         socket_type: int,
     ) -> Socket: ...
+    def term(self) -> None: ...
+    def __exit__(self, *exc_info: Any) -> None: ...
 
 class Socket(_AbstractContextManager["Socket"]):
+    @property
+    def context(self) -> Context: ...
+    def bind_to_random_port(self, addr: str) -> int: ...
     def connect(self, addr: str) -> _SocketContext: ...
+    def close(self, linger: int | None = ...) -> None: ...
+    def poll(self, timeout: int | None = ..., flags: int = ...) -> int: ...
+    def recv(self, flags: int = ...) -> bytes: ...
+    def recv_multipart(self, flags: int = ...) -> list[bytes]: ...
     def recv_string(
         self,
         flags: int | None = ...,
         encoding: str = ...,
     ) -> str: ...
+    def send(self, data: bytes, flags: int = ...) -> None: ...
+    def send_multipart(
+        self, msg_parts: Sequence[bytes], flags: int = ...
+    ) -> None: ...
     def send_string(
         self,
         u: str,
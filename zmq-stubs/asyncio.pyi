@@ -1,10 +1,12 @@
 from contextlib import AbstractContextManager as _AbstractContextManager
-from typing import Any
+from typing import Any, Sequence
 
 import zmq as _zmq
 
 class Context:
     def __init__(self, io_threads: int = ...) -> None: ...
+    @classmethod
+    def shadow(cls, address: int) -> Context: ...
     def socket(
         self,
         socket_type: int,
@@ -12,6 +14,14 @@ class Context:
 
 class Socket(_AbstractContextManager["Socket"]):
     def connect(self, addr: str) -> _zmq._SocketContext: ...
+    def close(self, linger: int | None = ...) -> None: ...
+    async def poll(
+        self, timeout: int | None = ..., flags: int = ...
+    ) -> int: ...
+    async def recv_multipart(self, flags: int = ...) -> list[bytes]: ...
+    async def send_multipart(
+        self, msg_parts: Sequence[bytes], flags: int = ...
+    ) -> None: ...
     async def recv_string(
         self,
         flags: int | None = ...,